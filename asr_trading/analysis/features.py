@@ -1,104 +1,182 @@
 import pandas as pd
 import numpy as np
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from asr_trading.data.canonical import Tick, OHLC
+from asr_trading.core.config import cfg
 from asr_trading.core.logger import logger
 from asr_trading.core.avionics import telemetry
+from asr_trading.core.tracing import tracer
+from asr_trading.analysis.streaming import StreamingIndicatorEngine
+from asr_trading.analysis.kernels import kernel_cache, latest_batch, sanitize
 
 class FeatureException(Exception):
     pass
 
+class OHLCRingBuffer:
+    """
+    Preallocated columnar ring buffer for a single symbol.
+    Each column is stored twice back-to-back (capacity * 2), so the ordered
+    window is always a contiguous slice and views never need a copy.
+    """
+    COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros((len(self.COLUMNS), capacity * 2), dtype=np.float64)
+        self._head = 0 # Next write slot in [0, capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, open_: float, high: float, low: float, close: float, volume: float):
+        row = (timestamp, open_, high, low, close, volume)
+        head = self._head
+        for i, value in enumerate(row):
+            self._data[i, head] = value
+            self._data[i, head + self.capacity] = value
+        self._head = (head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, columns: np.ndarray):
+        """
+        Bulk append. `columns` is a (6, n) array in COLUMNS order.
+        Only the last `capacity` bars are kept.
+        """
+        n = columns.shape[1]
+        if n == 0:
+            return
+        if n > self.capacity:
+            columns = columns[:, -self.capacity:]
+            n = self.capacity
+
+        cap = self.capacity
+        slots = (self._head + np.arange(n)) % cap
+        self._data[:, slots] = columns
+        self._data[:, slots + cap] = columns
+        self._head = (self._head + n) % cap
+        self._size = min(self._size + n, cap)
+
+    def view(self) -> np.ndarray:
+        """
+        Returns a (6, size) read-only view of the window, oldest bar first.
+        """
+        start = (self._head - self._size) % self.capacity
+        out = self._data[:, start:start + self._size]
+        out.flags.writeable = False
+        return out
+
+    def column(self, name: str) -> np.ndarray:
+        return self.view()[self.COLUMNS.index(name)]
+
 class WindowEngine:
     """
     Maintains sliding windows of OHLC data for multiple symbols.
+    Backed by one OHLCRingBuffer per symbol (O(1) append, zero-copy reads).
     """
     def __init__(self, window_size=500):
         self.window_size = window_size
-        self.buffers: Dict[str, List[OHLC]] = {} # symbol -> list of OHLC
+        self.buffers: Dict[str, OHLCRingBuffer] = {} # symbol -> ring buffer
+
+    def _get_buffer(self, symbol: str) -> OHLCRingBuffer:
+        buf = self.buffers.get(symbol)
+        if buf is None:
+            buf = OHLCRingBuffer(self.window_size)
+            self.buffers[symbol] = buf
+        return buf
 
     def add_ohlc(self, ohlc: OHLC):
-        if ohlc.symbol not in self.buffers:
-            self.buffers[ohlc.symbol] = []
-        
-        self.buffers[ohlc.symbol].append(ohlc)
-        if len(self.buffers[ohlc.symbol]) > self.window_size:
-            self.buffers[ohlc.symbol].pop(0)
+        self._get_buffer(ohlc.symbol).append(
+            ohlc.timestamp, ohlc.open, ohlc.high, ohlc.low, ohlc.close, ohlc.volume
+        )
+
+    def add_ohlc_batch(self, bars: List[OHLC]):
+        """
+        Bulk ingest (e.g. history warmup). Bars are grouped per symbol and
+        written with one vectorized copy per symbol. Order within a symbol is preserved.
+        """
+        grouped: Dict[str, List[OHLC]] = {}
+        for bar in bars:
+            grouped.setdefault(bar.symbol, []).append(bar)
+
+        for symbol, rows in grouped.items():
+            columns = np.array(
+                [(x.timestamp, x.open, x.high, x.low, x.close, x.volume) for x in rows],
+                dtype=np.float64
+            ).T
+            self._get_buffer(symbol).extend(columns)
+
+    def add_columns(self, symbol: str, columns: np.ndarray):
+        """
+        Bulk ingest of a (6, n) column block (e.g. straight from the BarStore).
+        Window only: FeatureEngine.add_columns also reseeds the streaming indicators.
+        """
+        self._get_buffer(symbol).extend(columns)
+
+    def get_arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Zero-copy ordered column views for indicator code.
+        Views are invalidated by the next write for this symbol.
+        """
+        buf = self.buffers.get(symbol)
+        if buf is None or len(buf) == 0:
+            return {}
+        data = buf.view()
+        return {name: data[i] for i, name in enumerate(OHLCRingBuffer.COLUMNS)}
 
     def get_dataframe(self, symbol: str) -> pd.DataFrame:
-        if symbol not in self.buffers or not self.buffers[symbol]:
+        arrays = self.get_arrays(symbol)
+        if not arrays:
             return pd.DataFrame()
-        
-        data = [
-            {
-                "timestamp": x.timestamp,
-                "open": x.open,
-                "high": x.high,
-                "low": x.low,
-                "close": x.close,
-                "volume": x.volume
-            }
-            for x in self.buffers[symbol]
-        ]
-        return pd.DataFrame(data)
+        # DataFrame owns a copy so downstream column assignment never touches the ring
+        return pd.DataFrame({k: v.copy() for k, v in arrays.items()})
 
 class IndicatorLib:
     """
     Computes technical indicators on DataFrames.
     """
     @staticmethod
+    @tracer.trace("indicators.compute_all")
     def compute_all(df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             return df
         
         try:
-            # We use standard pandas operations to be dependency-lite if pandas-ta fails
+            # All math lives in analysis/kernels.py (shared, memoized per frame)
+            k = kernel_cache.get(df)
+
             # SMA
-            df['SMA_20'] = df['close'].rolling(window=20).mean()
-            df['SMA_50'] = df['close'].rolling(window=50).mean()
+            df['SMA_20'] = k.sma(20).copy()
+            df['SMA_50'] = k.sma(50).copy()
             
             # EMA
-            df['EMA_12'] = df['close'].ewm(span=12, adjust=False).mean()
-            df['EMA_26'] = df['close'].ewm(span=26, adjust=False).mean()
+            df['EMA_12'] = k.ema(12).copy()
+            df['EMA_26'] = k.ema(26).copy()
             
             # MACD
-            df['MACD'] = df['EMA_12'] - df['EMA_26']
-            df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+            df['MACD'] = k.macd(12, 26).copy()
+            df['MACD_Signal'] = k.macd_signal(12, 26, 9).copy()
             
             # RSI (Hardened)
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            
-            # 17.1 Audit Fix: Div/0 protection
-            loss = loss.replace(0, 0.0001) 
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
+            df['RSI'] = k.rsi(14).copy()
             
             # Bollinger Bands
-            df['BB_Mid'] = df['close'].rolling(window=20).mean()
-            df['BB_Std'] = df['close'].rolling(window=20).std()
+            df['BB_Mid'] = k.sma(20).copy()
+            df['BB_Std'] = k.rolling_std(20).copy()
             df['BB_Upper'] = df['BB_Mid'] + (2 * df['BB_Std'])
             df['BB_Lower'] = df['BB_Mid'] - (2 * df['BB_Std'])
             
             # ATR (Approx)
-            df['TR'] = np.maximum(
-                (df['high'] - df['low']), 
-                np.maximum(
-                    abs(df['high'] - df['close'].shift(1)), 
-                    abs(df['low'] - df['close'].shift(1))
-                )
-            )
-            df['ATR'] = df['TR'].rolling(window=14).mean()
+            df['TR'] = k.true_range().copy()
+            df['ATR'] = k.atr(14).copy()
             
             # Volatility (Log returns std dev) (Hardened)
-            # Avoid log(0)
-            safe_close = df['close'].replace(0, np.nan).ffill() 
-            df['Log_Ret'] = np.log(safe_close / safe_close.shift(1))
-            df['Volatility'] = df['Log_Ret'].rolling(window=20).std()
+            df['Log_Ret'] = k.log_returns().copy()
+            df['Volatility'] = k.volatility(20).copy()
 
-            # 17.1 Audit Fix: Nan/Inf sanitization
-            df = df.replace([np.inf, -np.inf], np.nan).fillna(0)
+            # 17.1 Audit Fix: Nan/Inf sanitization (shared rule, see kernels.sanitize)
+            df = sanitize(df)
 
             return df
         except Exception as e:
@@ -106,28 +184,41 @@ class IndicatorLib:
             telemetry.record_event("indicator_error", {"error": str(e)})
             return df
 
+    @staticmethod
+    def compute_latest_batch(timestamp: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                             volume: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized compute_all for many symbols at once (see kernels.latest_batch).
+        """
+        return latest_batch(timestamp, open_, high, low, close, volume)
+
 class FeatureEngine:
     """
     Orchestrator for feature generation.
     """
+    WARMUP_BARS = 5 # Reduced for prototype responsiveness
+
     def __init__(self):
         self.window_engine = WindowEngine()
         self.indicator_lib = IndicatorLib()
+        self.streaming = StreamingIndicatorEngine()
+        self._stale = set() # Symbols whose streaming state lags the window (bars taken in a batch)
 
+    @tracer.trace("features.on_ohlc")
     def on_ohlc(self, ohlc: OHLC) -> Dict[str, Any]:
         """
         Ingests a new candle, updates window, computes features for the latest timestamp.
+        Indicators are updated incrementally (O(1) per bar) instead of recomputing the window.
         """
         self.window_engine.add_ohlc(ohlc)
-        df = self.window_engine.get_dataframe(ohlc.symbol)
+        if ohlc.symbol in self._stale:
+            self._stale.discard(ohlc.symbol)
+            latest = self.streaming.reseed(ohlc.symbol, self.window_engine.buffers[ohlc.symbol].view())
+        else:
+            latest = self.streaming.update(ohlc)
         
-        if len(df) < 5: # Warmup (Reduced for prototype responsiveness)
+        if len(self.window_engine.buffers[ohlc.symbol]) < self.WARMUP_BARS:
             return {"status": "WARMUP"}
-
-        df_features = self.indicator_lib.compute_all(df)
-        
-        # Extract latest row as feature vector
-        latest = df_features.iloc[-1].to_dict()
         
         # Add 'Transforms' (Stub for FFT/Wavelet)
         # e.g., if we had numpy here we'd run fft on df['close'].values[-N:]
@@ -140,4 +231,100 @@ class FeatureEngine:
             "status": "READY"
         }
 
+    def add_columns(self, symbol: str, columns: np.ndarray):
+        """
+        History warmup from a (6, n) column block (e.g. BarStore.load_into).
+        The streaming indicators are replayed over the resulting window, so the
+        next on_ohlc continues from it exactly as compute_all would.
+        """
+        self.window_engine.add_columns(symbol, columns)
+        self._stale.discard(symbol)
+        self.streaming.reseed(symbol, self.window_engine.buffers[symbol].view())
+
+    def add_ohlc_batch(self, bars: List[OHLC]):
+        """
+        History warmup from candles (any number of symbols); see add_columns.
+        """
+        self.window_engine.add_ohlc_batch(bars)
+        for symbol in dict.fromkeys(b.symbol for b in bars):
+            self._stale.discard(symbol)
+            self.streaming.reseed(symbol, self.window_engine.buffers[symbol].view())
+
+    def on_ohlc_batch(self, bars: List[OHLC]) -> pd.DataFrame:
+        """
+        Ingests one scan's worth of candles (any number of symbols) and
+        returns the features table for every symbol that is past warmup.
+        """
+        return self.compute_batch(self._ingest_batch(bars))
+
+    def on_ohlc_many(self, bars: List[OHLC]) -> Dict[str, Dict[str, Any]]:
+        """
+        on_ohlc for one scan's worth of candles: symbol -> on_ohlc result.
+        Streaming costs O(1) per bar but runs in Python, compute_batch costs
+        O(window) per symbol in NumPy; from cfg.FEATURE_BATCH_MIN_SYMBOLS
+        symbols on the single vectorized pass is the cheaper one.
+        """
+        symbols = list(dict.fromkeys(b.symbol for b in bars))
+        if len(symbols) < cfg.FEATURE_BATCH_MIN_SYMBOLS:
+            return {bar.symbol: self.on_ohlc(bar) for bar in bars} # Last bar per symbol wins
+
+        self._ingest_batch(bars)
+        results = {sym: {"status": "WARMUP"} for sym in symbols}
+        ready, cols = self._latest_columns(symbols)
+        names = list(cols)
+        for sym, row in zip(ready, np.column_stack(list(cols.values())).tolist()):
+            features = dict(zip(names, row))
+            results[sym] = {"symbol": sym, "timestamp": features["timestamp"], "features": features, "status": "READY"}
+        return results
+
+    def _ingest_batch(self, bars: List[OHLC]) -> List[str]:
+        """
+        Window-only ingest: the streaming state of these symbols is rebuilt
+        from the window on their next on_ohlc instead of per bar here.
+        """
+        for bar in bars:
+            self.window_engine.add_ohlc(bar)
+        symbols = list(dict.fromkeys(b.symbol for b in bars))
+        self._stale.update(symbols)
+        return symbols
+
+    def compute_batch(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Stacks every symbol's window into a (symbols x bars) matrix and computes
+        the latest features for the whole universe in one vectorized pass.
+        Returns a DataFrame indexed by symbol with the same columns as on_ohlc features.
+        """
+        ready, cols = self._latest_columns(symbols)
+        if not ready:
+            return pd.DataFrame()
+        return pd.DataFrame(cols, index=pd.Index(ready, name="symbol"))
+
+    def _latest_columns(self, symbols: Optional[List[str]] = None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """
+        compute_batch without the DataFrame: (symbols past warmup, column -> array).
+        """
+        if symbols is None:
+            symbols = list(self.window_engine.buffers.keys())
+        views = {}
+        for sym in symbols:
+            buf = self.window_engine.buffers.get(sym)
+            if buf is not None and len(buf) >= self.WARMUP_BARS:
+                views[sym] = buf.view()
+        if not views:
+            return [], {}
+
+        n_bars = max(v.shape[1] for v in views.values())
+        stacked = np.full((len(OHLCRingBuffer.COLUMNS), len(views), n_bars), np.nan)
+        for row, data in enumerate(views.values()):
+            stacked[:, row, n_bars - data.shape[1]:] = data
+
+        try:
+            cols = self.indicator_lib.compute_latest_batch(*stacked)
+        except Exception as e:
+            logger.error(f"Batch Indicator Computation Failed: {e}")
+            telemetry.record_event("indicator_error", {"error": str(e), "mode": "batch"})
+            return [], {}
+        cols["fft_dominant_period"] = np.zeros(len(views))
+        return list(views), cols
+
 feature_engine = FeatureEngine()
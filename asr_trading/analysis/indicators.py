@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
 from asr_trading.core.logger import logger
+from asr_trading.analysis.kernels import kernel_cache, sanitize
 
 class Indicators:
+    """
+    Title-case front-end (yfinance frames, training pipeline).
+    Delegates to the shared kernels in analysis/kernels.py so values match IndicatorLib (live engine).
+    """
     @staticmethod
     def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
         """Adds all core indicators to the dataframe using pure Pandas (No External Depts)"""
@@ -10,48 +15,39 @@ class Indicators:
             return df
         
         try:
+            k = kernel_cache.get(df)
+
             # --- RSI (14) ---
-            delta = df['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
-            df['RSI'] = df['RSI'].fillna(50) # Fallback
+            df['RSI'] = k.rsi(14).copy()
 
             # --- MACD (12, 26, 9) ---
-            exp1 = df['Close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['Close'].ewm(span=26, adjust=False).mean()
-            df['MACD'] = exp1 - exp2
-            df['MACD_s'] = df['MACD'].ewm(span=9, adjust=False).mean() # Signal Line
+            df['MACD'] = k.macd(12, 26).copy()
+            df['MACD_s'] = k.macd_signal(12, 26, 9).copy() # Signal Line
+            df['MACD_Signal'] = df['MACD_s'] # Live engine name
             
             # --- Bollinger Bands (20, 2) ---
-            df['SMA_20'] = df['Close'].rolling(window=20).mean()
-            df['STD_20'] = df['Close'].rolling(window=20).std()
+            df['SMA_20'] = k.sma(20).copy()
+            df['STD_20'] = k.rolling_std(20).copy()
             df['BBL_20_2.0'] = df['SMA_20'] - (df['STD_20'] * 2) # Lower
             df['BBM_20_2.0'] = df['SMA_20']                      # Mid
             df['BBU_20_2.0'] = df['SMA_20'] + (df['STD_20'] * 2) # Upper
             
             # --- ATR (14) ---
-            high_low = df['High'] - df['Low']
-            high_close = np.abs(df['High'] - df['Close'].shift())
-            low_close = np.abs(df['Low'] - df['Close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = ranges.max(axis=1)
-            df['ATR'] = true_range.rolling(14).mean()
+            df['ATR'] = k.atr(14).copy()
             
             # --- SMA / EMA ---
-            df['SMA_50'] = df['Close'].rolling(window=50).mean()
-            df['EMA_20'] = df['Close'].ewm(span=20, adjust=False).mean()
-            
-            return df
+            df['SMA_50'] = k.sma(50).copy()
+            df['EMA_20'] = k.ema(20).copy()
+
+            # --- Volatility (20) --- (BrainStem feature)
+            df['Volatility'] = k.volatility(20).copy()
+
+            # Same NaN/Inf rule as the live engine (IndicatorLib.compute_all)
+            return sanitize(df)
         except Exception as e:
             logger.error(f"Error adding indicators: {e}")
             return df
 
     @staticmethod
     def get_rsi(df: pd.DataFrame, length=14):
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=length).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=length).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        return pd.Series(kernel_cache.get(df).rsi(length), index=df.index)
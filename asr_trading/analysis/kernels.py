@@ -0,0 +1,295 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Callable, Tuple
+import numpy as np
+import pandas as pd
+from asr_trading.core.config import cfg
+
+class IndicatorKernels:
+    """
+    Single source of truth for indicator math.
+    Wraps the OHLC columns of one frame and memoizes every kernel output and
+    intermediate (EMAs, gain/loss means, true range, log returns...), so each
+    one is computed at most once per frame no matter how many front-ends ask.
+    Returned arrays are shared and read-only; callers must copy before mutating.
+    """
+    def __init__(self, high: np.ndarray, low: np.ndarray, close: np.ndarray):
+        self.high = high
+        self.low = low
+        self.close = close
+        self._close_s = pd.Series(close)
+        self._memo: Dict[Tuple, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: Tuple, fn: Callable[[], np.ndarray]) -> np.ndarray:
+        val = self._memo.get(key)
+        if val is None:
+            val = np.asarray(fn(), dtype=np.float64)
+            val.flags.writeable = False
+            with self._lock:
+                val = self._memo.setdefault(key, val)
+        return val
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Inputs plus every kernel computed so far (grows as kernels are asked for).
+        """
+        with self._lock:
+            memo = list(self._memo.values())
+        return sum(a.nbytes for a in memo) + self.high.nbytes + self.low.nbytes + self.close.nbytes
+
+    # --- Trend ---
+    def sma(self, n: int) -> np.ndarray:
+        return self._cached(("sma", n), lambda: self._close_s.rolling(window=n).mean().to_numpy())
+
+    def rolling_std(self, n: int) -> np.ndarray:
+        return self._cached(("std", n), lambda: self._close_s.rolling(window=n).std().to_numpy())
+
+    def ema(self, span: int) -> np.ndarray:
+        return self._cached(("ema", span), lambda: self._close_s.ewm(span=span, adjust=False).mean().to_numpy())
+
+    def macd(self, fast: int = 12, slow: int = 26) -> np.ndarray:
+        return self._cached(("macd", fast, slow), lambda: self.ema(fast) - self.ema(slow))
+
+    def macd_signal(self, fast: int = 12, slow: int = 26, signal: int = 9) -> np.ndarray:
+        return self._cached(
+            ("macd_signal", fast, slow, signal),
+            lambda: pd.Series(self.macd(fast, slow)).ewm(span=signal, adjust=False).mean().to_numpy()
+        )
+
+    # --- Momentum ---
+    def delta(self) -> np.ndarray:
+        return self._cached(("delta",), lambda: self._close_s.diff().to_numpy())
+
+    def avg_gain(self, n: int) -> np.ndarray:
+        def fn():
+            delta = pd.Series(self.delta())
+            return delta.where(delta > 0, 0).rolling(window=n).mean().to_numpy()
+        return self._cached(("avg_gain", n), fn)
+
+    def avg_loss(self, n: int) -> np.ndarray:
+        def fn():
+            delta = pd.Series(self.delta())
+            return (-delta.where(delta < 0, 0)).rolling(window=n).mean().to_numpy()
+        return self._cached(("avg_loss", n), fn)
+
+    def rsi(self, n: int = 14) -> np.ndarray:
+        """
+        Rolling-mean RSI. Zero average loss is floored at 0.0001 (17.1 Audit Fix: Div/0 protection).
+        """
+        def fn():
+            loss = pd.Series(self.avg_loss(n)).replace(0, 0.0001)
+            rs = pd.Series(self.avg_gain(n)) / loss
+            return (100 - (100 / (1 + rs))).to_numpy()
+        return self._cached(("rsi", n), fn)
+
+    # --- Volatility ---
+    def true_range(self) -> np.ndarray:
+        """
+        First bar has no previous close, so its TR is NaN.
+        """
+        def fn():
+            prev_close = self._close_s.shift(1).to_numpy()
+            return np.maximum(
+                self.high - self.low,
+                np.maximum(np.abs(self.high - prev_close), np.abs(self.low - prev_close))
+            )
+        return self._cached(("tr",), fn)
+
+    def atr(self, n: int = 14) -> np.ndarray:
+        return self._cached(("atr", n), lambda: pd.Series(self.true_range()).rolling(window=n).mean().to_numpy())
+
+    def log_returns(self) -> np.ndarray:
+        def fn():
+            # Avoid log(0)
+            safe_close = self._close_s.replace(0, np.nan).ffill()
+            return np.log(safe_close / safe_close.shift(1)).to_numpy()
+        return self._cached(("log_ret",), fn)
+
+    def volatility(self, n: int = 20) -> np.ndarray:
+        return self._cached(("vol", n), lambda: pd.Series(self.log_returns()).rolling(window=n).std().to_numpy())
+
+def sanitize(values):
+    """
+    The one NaN/Inf rule for every front-end (IndicatorLib, Indicators,
+    latest_batch): warmup gaps and blow-ups become 0. Takes a DataFrame (new
+    frame returned) or a float ndarray (cleaned in place).
+    """
+    if isinstance(values, pd.DataFrame):
+        return values.replace([np.inf, -np.inf], np.nan).fillna(0)
+    return np.nan_to_num(values, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+def ohlc_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """
+    Resolves lower-case (feed/window) or Title-case (yfinance) column names.
+    """
+    if name in df:
+        return df[name]
+    if name.title() in df:
+        return df[name.title()]
+    raise KeyError(f"Column '{name}' not found (tried '{name}' and '{name.title()}')")
+
+class KernelCache:
+    """
+    Content-addressed LRU of IndicatorKernels.
+    Frames are keyed by a hash of their high/low/close values, so a copy of the
+    same frame (or the same history fetched twice) reuses the computed kernels.
+    Bounded by memory, not frame count: one 5-year backtest frame weighs as much
+    as thousands of live windows. Kernels fill in after insertion, so the bound
+    is enforced on every miss; the newest frame is kept even if it alone exceeds it.
+    """
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, IndicatorKernels]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, df: pd.DataFrame) -> IndicatorKernels:
+        high = np.ascontiguousarray(ohlc_column(df, "high").to_numpy(dtype=np.float64))
+        low = np.ascontiguousarray(ohlc_column(df, "low").to_numpy(dtype=np.float64))
+        close = np.ascontiguousarray(ohlc_column(df, "close").to_numpy(dtype=np.float64))
+
+        digest = hashlib.blake2b(digest_size=16)
+        for arr in (high, low, close):
+            digest.update(arr.tobytes())
+        key = digest.digest()
+
+        with self._lock:
+            kernels = self._entries.get(key)
+            if kernels is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return kernels
+            self.misses += 1
+
+        for arr in (high, low, close):
+            arr.flags.writeable = False
+        kernels = IndicatorKernels(high, low, close)
+        with self._lock:
+            self._entries[key] = kernels
+            sizes = [k.nbytes for k in self._entries.values()]
+            total = sum(sizes)
+            for size in sizes[:-1]: # Oldest first
+                if total <= self.max_bytes:
+                    break
+                self._entries.popitem(last=False)
+                total -= size
+        return kernels
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(k.nbytes for k in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+kernel_cache = KernelCache(max_bytes=cfg.KERNEL_CACHE_MB * 2**20)
+
+LOOKBACK_BARS = 50 # Longest indicator window (SMA_50): earlier rows carry sanitized warmup values
+TAIL_BARS = LOOKBACK_BARS + 1 # Non-EMA bars latest_batch reads (+1 close for the first delta / return)
+
+@lru_cache(maxsize=8)
+def _ema_weights(n_bars: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Weights w over a window of n_bars such that closes @ w is the last value of
+    EMA_12, EMA_26 and MACD_Signal (ewm(adjust=False) seeded with the first close).
+    """
+    t = np.arange(n_bars)
+
+    def ema_matrix(span):
+        # Row t: weights of the inputs 0..t in the EMA at t
+        a = 2.0 / (span + 1.0)
+        lag = t[:, None] - t[None, :]
+        m = np.where(lag >= 0, a * (1 - a) ** np.maximum(lag, 0), 0.0)
+        m[:, 0] = (1 - a) ** t
+        return m
+
+    e12, e26 = ema_matrix(12), ema_matrix(26)
+    w_signal = ema_matrix(9)[-1] @ (e12 - e26)
+    weights = (e12[-1].copy(), e26[-1].copy(), w_signal)
+    for w in weights:
+        w.flags.writeable = False
+    return weights
+
+def latest_batch(timestamp: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Vectorized IndicatorLib.compute_all for many symbols at once, latest bar only.
+    Inputs are (symbols x bars) arrays, right-aligned, left-padded with NaN
+    for symbols with shorter history. Returns column -> (symbols,) array.
+    Only the EMAs read the whole window; everything else reads the last
+    TAIL_BARS bars (+1 for the previous close).
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n_sym, n_bars = close.shape
+        pad = np.isnan(close)
+
+        # EMA / MACD: the latest value is linear in the closes, so it is one dot product
+        # per column. Padding takes the first real close, which leaves the EMAs flat at
+        # that value (and MACD at 0) until the real history starts, as in compute_all.
+        first = np.argmax(~pad, axis=1)
+        filled = np.where(pad, close[np.arange(n_sym), first][:, None], close)
+        w12, w26, w_signal = _ema_weights(n_bars)
+        ema_12 = filled @ w12
+        ema_26 = filled @ w26
+        signal = filled @ w_signal
+
+        # Windowed columns: last k bars, prev_close[:, i] is the close before c[:, i]
+        k = min(n_bars, TAIL_BARS)
+        c, h, l = close[:, -k:], high[:, -k:], low[:, -k:]
+        before = close[:, -k - 1:-k] if n_bars > k else np.full((n_sym, 1), np.nan)
+        prev_close = np.concatenate([before, c[:, :-1]], axis=1)
+
+        def last_mean(x, n):
+            return x[:, -n:].mean(axis=1) if n_bars >= n else np.full(n_sym, np.nan)
+
+        def last_std(x, n):
+            return x[:, -n:].std(axis=1, ddof=1) if n_bars >= n else np.full(n_sym, np.nan)
+
+        # RSI (first real bar has delta 0, padding stays NaN)
+        delta = np.where(np.isnan(prev_close), 0.0, c - prev_close)
+        tail_pad = pad[:, -k:]
+        gain = np.where(tail_pad, np.nan, np.where(delta > 0, delta, 0.0))
+        loss = np.where(tail_pad, np.nan, -np.where(delta < 0, delta, 0.0))
+        avg_loss = last_mean(loss, 14)
+        avg_loss = np.where(avg_loss == 0, 0.0001, avg_loss)
+        rsi = 100 - (100 / (1 + last_mean(gain, 14) / avg_loss))
+
+        # Bollinger
+        sma_20 = last_mean(c, 20)
+        bb_std = last_std(c, 20)
+
+        # ATR
+        tr = np.maximum(h - l, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+
+        # Volatility (zero closes forward-filled, possibly from before the tail)
+        if (close == 0).any():
+            safe = np.where(close == 0, np.nan, close)
+            idx = np.where(np.isnan(safe), 0, np.arange(n_bars))
+            np.maximum.accumulate(idx, axis=1, out=idx)
+            safe = safe[np.arange(n_sym)[:, None], idx][:, -k - 1:]
+        else:
+            safe = close[:, -k - 1:]
+        log_ret = np.log(safe[:, 1:] / safe[:, :-1])
+        if n_bars == k:
+            log_ret = np.concatenate([np.full((n_sym, 1), np.nan), log_ret], axis=1)
+
+        sma_50 = last_mean(c, 50)
+        atr = last_mean(tr, 14)
+        volatility = last_std(log_ret, 20)
+        names = ("timestamp", "open", "high", "low", "close", "volume", "SMA_20", "SMA_50", "EMA_12", "EMA_26",
+                 "MACD", "MACD_Signal", "RSI", "BB_Mid", "BB_Std", "BB_Upper", "BB_Lower", "TR", "ATR", "Log_Ret", "Volatility")
+        values = np.stack([
+            timestamp[:, -1], open_[:, -1], high[:, -1], low[:, -1], close[:, -1], volume[:, -1],
+            sma_20, sma_50, ema_12, ema_26, ema_12 - ema_26, signal,
+            rsi, sma_20, bb_std, sma_20 + (2 * bb_std), sma_20 - (2 * bb_std),
+            tr[:, -1], atr, log_ret[:, -1], volatility
+        ])
+        sanitize(values) # One pass over all columns
+        return dict(zip(names, values))
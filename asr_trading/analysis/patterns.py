@@ -1,8 +1,10 @@
 import pandas as pd
+import numpy as np
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from asr_trading.data.canonical import OHLC
 from asr_trading.core.logger import logger
+from asr_trading.analysis.kernels import ohlc_column
 
 @dataclass
 class DetectedPattern:
@@ -35,60 +37,116 @@ class CandleMatcher:
     @staticmethod
     def detect(df: pd.DataFrame) -> List[Dict]:
         """
-        Runs logic on the LAST row of the dataframe.
+        Runs logic on the LAST row of the dataframe (via the vectorized scanner).
         Returns list of pattern dicts.
         """
-        if len(df) < 5: return []
-        
-        patterns = []
-        curr = df.iloc[-1]
-        prev = df.iloc[-2]
-        
-        # Safe Accessor
-        def get_val(row, key):
-             # Try Title Case (yfinance/pandas-ta) then Lower Case
-             if hasattr(row, key.title()): return getattr(row, key.title())
-             if hasattr(row, key.lower()): return getattr(row, key.lower())
-             # Try dictionary/Series index
-             if key.title() in row: return row[key.title()]
-             if key.lower() in row: return row[key.lower()]
-             return 0.0
-
-        O = get_val(curr, "open")
-        H = get_val(curr, "high")
-        L = get_val(curr, "low")
-        C = get_val(curr, "close")
-        
-        prev_O = get_val(prev, "open")
-        prev_C = get_val(prev, "close")
-        
-        # Doji
-        if CandleMatcher.is_doji(O, H, L, C):
-            patterns.append({"id": "CDL_DOJI", "name": "Doji", "side": "NEUTRAL", "conf": 0.6})
-
-        # Hammer (Bullish)
-        if CandleMatcher.is_hammer(O, H, L, C):
-            patterns.append({"id": "CDL_HAMMER", "name": "Hammer", "side": "BULLISH", "conf": 0.7})
-
-        # Engulfing
-        # Bullish: Prev Red, Curr Green, Curr Open < Prev Close, Curr Close > Prev Open
-        if (prev_C < prev_O) and (C > O):
-            if (O <= prev_C) and (C >= prev_O):
-                patterns.append({"id": "CDL_ENGULFING_BULL", "name": "Bullish Engulfing", "side": "BULLISH", "conf": 0.8})
-        
-        # Bearish Engulfing
-        if (prev_C > prev_O) and (C < O):
-             if (O >= prev_C) and (C <= prev_O):
-                patterns.append({"id": "CDL_ENGULFING_BEAR", "name": "Bearish Engulfing", "side": "BEARISH", "conf": 0.8})
+        if len(df) < PatternScanner.MIN_BARS: return []
+        return pattern_scanner.latest(df.tail(2))
+
+@dataclass
+class PatternSpec:
+    pattern_id: str
+    name: str
+    side: str
+    confidence: float
+    kernel: Callable[..., np.ndarray] # (o, h, l, c, prev_o, prev_c) -> bool array
+
+class PatternScanner:
+    """
+    Vectorized candlestick scanner.
+    Evaluates every registered pattern over a whole OHLC history in one pass
+    (NumPy array ops, no per-row Python), e.g. 5 years of bars for training/backtests.
+    New patterns are added with `register`.
+    """
+    MIN_BARS = 5 # Same warmup as the original per-row matcher
+
+    def __init__(self):
+        self.specs: List[PatternSpec] = []
+
+    def register(self, pattern_id: str, name: str, side: str, confidence: float):
+        def decorator(kernel):
+            self.specs.append(PatternSpec(pattern_id, name, side, confidence, kernel))
+            return kernel
+        return decorator
+
+    def scan(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, warmup: int = MIN_BARS - 1) -> Dict[str, np.ndarray]:
+        """
+        Returns {pattern_id: bool array} aligned with the input bars.
+        The first `warmup` bars are never flagged.
+        """
+        o = np.asarray(open_, dtype=np.float64)
+        h = np.asarray(high, dtype=np.float64)
+        l = np.asarray(low, dtype=np.float64)
+        c = np.asarray(close, dtype=np.float64)
+        prev_o = np.concatenate(([np.nan], o[:-1]))
+        prev_c = np.concatenate(([np.nan], c[:-1]))
+
+        flags = {}
+        with np.errstate(invalid="ignore"):
+            for spec in self.specs:
+                hit = np.asarray(spec.kernel(o, h, l, c, prev_o, prev_c), dtype=bool)
+                hit[:warmup] = False
+                flags[spec.pattern_id] = hit
+        return flags
+
+    def scan_confidence(self, open_, high, low, close, warmup: int = MIN_BARS - 1) -> Dict[str, np.ndarray]:
+        """
+        Same as `scan` but returns the pattern confidence where flagged, 0.0 elsewhere.
+        """
+        flags = self.scan(open_, high, low, close, warmup)
+        return {spec.pattern_id: flags[spec.pattern_id] * spec.confidence for spec in self.specs}
+
+    def scan_frame(self, df: pd.DataFrame, warmup: int = MIN_BARS - 1) -> pd.DataFrame:
+        """
+        Boolean pattern columns for every row of an OHLC frame (lower or Title case).
+        """
+        cols = [ohlc_column(df, k).to_numpy(dtype=np.float64) for k in ("open", "high", "low", "close")]
+        return pd.DataFrame(self.scan(*cols, warmup=warmup), index=df.index)
+
+    def latest(self, df: pd.DataFrame) -> List[Dict]:
+        """
+        Pattern dicts for the last row only (legacy CandleMatcher.detect format).
+        """
+        try:
+            tail = self.scan_frame(df.tail(2), warmup=0).iloc[-1]
+        except KeyError:
+            return [] # No OHLC columns
+        return [
+            {"id": s.pattern_id, "name": s.name, "side": s.side, "conf": s.confidence}
+            for s in self.specs if tail[s.pattern_id]
+        ]
+
+pattern_scanner = PatternScanner()
+
+@pattern_scanner.register("CDL_DOJI", "Doji", "NEUTRAL", 0.6)
+def _doji(o, h, l, c, prev_o, prev_c):
+    range_ = h - l
+    return (range_ > 0) & (np.abs(c - o) <= range_ * 0.1)
+
+@pattern_scanner.register("CDL_HAMMER", "Hammer", "BULLISH", 0.7)
+def _hammer(o, h, l, c, prev_o, prev_c):
+    body = np.abs(c - o)
+    lower_shadow = np.minimum(o, c) - l
+    upper_shadow = h - np.maximum(o, c)
+    return ((h - l) > 0) & (lower_shadow >= 2 * body) & (upper_shadow <= body * 0.2)
+
+@pattern_scanner.register("CDL_ENGULFING_BULL", "Bullish Engulfing", "BULLISH", 0.8)
+def _engulfing_bull(o, h, l, c, prev_o, prev_c):
+    # Prev Red, Curr Green, Curr Open <= Prev Close, Curr Close >= Prev Open
+    return (prev_c < prev_o) & (c > o) & (o <= prev_c) & (c >= prev_o)
 
-        return patterns
+@pattern_scanner.register("CDL_ENGULFING_BEAR", "Bearish Engulfing", "BEARISH", 0.8)
+def _engulfing_bear(o, h, l, c, prev_o, prev_c):
+    return (prev_c > prev_o) & (c < o) & (o >= prev_c) & (c <= prev_o)
 
 class PatternDetector:
     """
     Orchestrator for Pattern Detection.
+    Thin view over the last row of the vectorized scanner.
     """
     def __init__(self):
         self.matcher = CandleMatcher()
+        self.scanner = pattern_scanner
 
     def analyze(self, df: pd.DataFrame, symbol: str) -> List[DetectedPattern]:
         if df.empty:
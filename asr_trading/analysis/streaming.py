@@ -0,0 +1,244 @@
+import math
+from collections import deque
+from typing import Dict, Any, Optional
+from asr_trading.data.canonical import OHLC
+
+NAN = float("nan")
+
+class RollingWindow:
+    """
+    Fixed-length rolling mean / sample std updated in O(1) per value.
+    Mirrors the pandas rolling kernels (Kahan-compensated sum for the mean,
+    Welford add/remove for the variance, NaN values occupy a slot but are not
+    counted) so results match `Series.rolling(n).mean()/.std()`.
+    """
+    def __init__(self, length: int, track_var: bool = False):
+        self.length = length
+        self.track_var = track_var
+        self.values = deque()
+        # Mean accumulators
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.sum_comp = 0.0
+        self.neg_ct = 0
+        self.same_ct = 0
+        self.prev_value = NAN
+        # Variance accumulators (Welford)
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.var_comp = 0.0
+
+    def push(self, val: float):
+        if len(self.values) == self.length:
+            self._remove(self.values.popleft())
+        self.values.append(val)
+        self._add(val)
+
+    def _add(self, val: float):
+        if val != val: # NaN
+            return
+        self.nobs += 1
+        y = val - self.sum_comp
+        t = self.sum_x + y
+        self.sum_comp = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, val) < 0:
+            self.neg_ct += 1
+        if val == self.prev_value:
+            self.same_ct += 1
+        else:
+            self.same_ct = 1
+        self.prev_value = val
+
+        if self.track_var:
+            prev_mean = self.mean_x - self.var_comp
+            y = val - self.var_comp
+            t = y - self.mean_x
+            self.var_comp = t + self.mean_x - y
+            self.mean_x += t / self.nobs
+            self.ssqdm_x += (val - prev_mean) * (val - self.mean_x)
+
+    def _remove(self, val: float):
+        if val != val:
+            return
+        self.nobs -= 1
+        y = -val - self.sum_comp
+        t = self.sum_x + y
+        self.sum_comp = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, val) < 0:
+            self.neg_ct -= 1
+
+        if self.track_var:
+            if self.nobs:
+                prev_mean = self.mean_x - self.var_comp
+                y = val - self.var_comp
+                t = y - self.mean_x
+                self.var_comp = t + self.mean_x - y
+                self.mean_x -= t / self.nobs
+                self.ssqdm_x -= (val - prev_mean) * (val - self.mean_x)
+            else:
+                self.mean_x = 0.0
+                self.ssqdm_x = 0.0
+
+    def mean(self) -> float:
+        if self.nobs < self.length or self.nobs == 0:
+            return NAN
+        if self.same_ct >= self.nobs:
+            return self.prev_value
+        result = self.sum_x / self.nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+    def std(self) -> float:
+        if self.nobs < self.length or self.nobs <= 1:
+            return NAN
+        if self.same_ct >= self.nobs:
+            return 0.0
+        var = self.ssqdm_x / (self.nobs - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+class EMA:
+    """
+    Recursive EMA matching `ewm(span=n, adjust=False).mean()`.
+    """
+    def __init__(self, span: int):
+        self.alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        self.old_wt = 1.0 - self.alpha
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        elif self.value != x:
+            self.value = (self.old_wt * self.value + self.alpha * x) / (self.old_wt + self.alpha)
+        return self.value
+
+class SymbolIndicatorState:
+    """
+    Running indicator state for one symbol.
+    Produces the same columns as IndicatorLib.compute_all for the latest bar.
+    """
+    def __init__(self):
+        self.sma_20 = RollingWindow(20, track_var=True) # Also Bollinger mid/std
+        self.sma_50 = RollingWindow(50)
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.macd_signal = EMA(9)
+        self.gain = RollingWindow(14)
+        self.loss = RollingWindow(14)
+        self.atr = RollingWindow(14)
+        self.volatility = RollingWindow(20, track_var=True)
+        self.prev_close: Optional[float] = None
+        self.prev_safe_close = NAN
+        self.bars = 0
+
+    def update(self, timestamp: float, open_: float, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        self.bars += 1
+
+        # SMA / Bollinger
+        self.sma_20.push(close)
+        self.sma_50.push(close)
+        sma_20 = self.sma_20.mean()
+        bb_std = self.sma_20.std()
+
+        # EMA / MACD
+        ema_12 = self.ema_12.update(close)
+        ema_26 = self.ema_26.update(close)
+        macd = ema_12 - ema_26
+        macd_signal = self.macd_signal.update(macd)
+
+        # RSI (rolling-mean gain/loss, same as compute_all)
+        delta = close - self.prev_close if self.prev_close is not None else NAN
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-(delta if delta < 0 else 0.0))
+        avg_gain = self.gain.mean()
+        avg_loss = self.loss.mean()
+        if avg_loss == 0:
+            avg_loss = 0.0001 # Div/0 protection
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        # ATR
+        if self.prev_close is None:
+            tr = NAN
+        else:
+            tr = max(high - low, max(abs(high - self.prev_close), abs(low - self.prev_close)))
+        self.atr.push(tr)
+
+        # Volatility (log returns, zero closes forward-filled)
+        safe_close = close if close != 0 else self.prev_safe_close
+        try:
+            log_ret = math.log(safe_close / self.prev_safe_close)
+        except (ValueError, ZeroDivisionError):
+            log_ret = NAN
+        self.volatility.push(log_ret)
+        self.prev_safe_close = safe_close
+        self.prev_close = close
+
+        row = {
+            "timestamp": timestamp,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "SMA_20": sma_20,
+            "SMA_50": self.sma_50.mean(),
+            "EMA_12": ema_12,
+            "EMA_26": ema_26,
+            "MACD": macd,
+            "MACD_Signal": macd_signal,
+            "RSI": rsi,
+            "BB_Mid": sma_20,
+            "BB_Std": bb_std,
+            "BB_Upper": sma_20 + (2 * bb_std),
+            "BB_Lower": sma_20 - (2 * bb_std),
+            "TR": tr,
+            "ATR": self.atr.mean(),
+            "Log_Ret": log_ret,
+            "Volatility": self.volatility.std(),
+        }
+
+        # Nan/Inf sanitization (same contract as compute_all)
+        for k, v in row.items():
+            if not math.isfinite(v):
+                row[k] = 0.0
+        return row
+
+class StreamingIndicatorEngine:
+    """
+    Per-symbol incremental indicators. Each bar costs O(1) regardless of window size.
+    EMA-based columns match a full-window recompute once the window is long
+    enough for the initial seed to decay (>= ~400 bars at span 26).
+    """
+    def __init__(self):
+        self.states: Dict[str, SymbolIndicatorState] = {}
+
+    def update(self, ohlc: OHLC) -> Dict[str, Any]:
+        state = self.states.get(ohlc.symbol)
+        if state is None:
+            state = SymbolIndicatorState()
+            self.states[ohlc.symbol] = state
+        return state.update(
+            float(ohlc.timestamp), float(ohlc.open), float(ohlc.high),
+            float(ohlc.low), float(ohlc.close), float(ohlc.volume)
+        )
+
+    def reseed(self, symbol: str, columns) -> Dict[str, Any]:
+        """
+        Rebuilds the symbol's state from a (6, n) column block (OHLCRingBuffer
+        order, oldest first), e.g. after a bulk window load that bypassed
+        update(). Returns the row for the last bar ({} if empty).
+        """
+        state = SymbolIndicatorState()
+        self.states[symbol] = state
+        latest: Dict[str, Any] = {}
+        for row in columns.T.tolist():
+            latest = state.update(*row)
+        return latest
+
+    def reset(self, symbol: str):
+        self.states.pop(symbol, None)
@@ -14,8 +14,8 @@ class EnsembleAgent:
         Returns weighted probability.
         """
         # Get Model Prediction
-        # Ensure model is fresh
-        cortex.brain.load_model()
+        # Ensure model is fresh (reloads only when the registry artifact changed)
+        cortex.brain.refresh()
         model_prob = cortex.brain.predict_win_probability(features)
         
         # Weighted Avg of Probabilities (assuming rule_conf is a prob 0-1)
@@ -1,17 +1,48 @@
+import hashlib
+import io
 import json
 import os
+import threading
+import time
+from typing import List, Optional, Union
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.tracing import tracer
+from asr_trading.brain.forest import CompiledForest
 
 class BrainStem:
-    """Scientific ML core for probability adjustment"""
-    def __init__(self):
+    """
+    Scientific ML core for probability adjustment.
+    With the "compiled" backend the runtime artifact is the flat-array forest
+    (<model>.npz next to the joblib file): that is what load_model()/refresh()
+    read, and no sklearn estimators stay in memory (self.model is None). The
+    joblib forest is still written on save for audit and retraining.
+    """
+    def __init__(self, model_path: str = None, backend: str = None):
         self.model = RandomForestClassifier(n_estimators=100)
         self.is_trained = False
         # Updated to match features.py exact output
         # 17.5 Audit Fix: Feature alignment
         self.feature_columns = ['RSI', 'MACD', 'ATR', 'SMA_50', 'Volatility']
+        self.model_path = model_path or cfg.MODEL_PATH
+        self.backend = backend or cfg.MODEL_BACKEND
+
+        # Inference fast path: features go straight into preallocated float32 rows
+        # (the dtype the trees compare in) in feature_columns order, no DataFrame
+        self._row = np.zeros((1, len(self.feature_columns)), dtype=np.float32)
+        self._batch = np.zeros((0, len(self.feature_columns)), dtype=np.float32)
+        self._estimators = None # Fitted trees, evaluated directly (see _win_proba)
+        self.compiled: Optional[CompiledForest] = None # Flat-array forest ("compiled" backend)
+        self._win_col = None
+        self._lock = threading.Lock()
+
+        # Registry watch: (mtime_ns, size) of the artifact last seen, checksum of the model loaded
+        self._stat = None
+        self.checksum: Optional[str] = None
+        self._next_check = 0.0
         
         # Auto-Load
         self.load_model()
@@ -37,51 +68,208 @@ class BrainStem:
         # 17.5 Fix: Handle NaNs
         X = X.fillna(0)
         
-        self.model.fit(X, y)
+        model = self.model if self.model is not None else RandomForestClassifier(n_estimators=100)
+        model.fit(X, y)
+        self.model = model
         self.is_trained = True
+        self._bind()
         logger.info("BrainStem trained successfully.")
         self.save_model() # Auto-save after training
+        self._release_estimators()
+
+    def _bind(self):
+        """
+        Caches what the fast path needs from the current model.
+        """
+        classes = getattr(self.model, "classes_", [])
+        self._win_col = 1 if len(classes) > 1 else None # Probability of class 1 (Win)
+        estimators = getattr(self.model, "estimators_", None)
+        self._estimators = list(estimators) if estimators is not None else None
+        self.compiled = None
+        if self.backend == "compiled" and self._estimators and self._win_col is not None:
+            try:
+                self.compiled = self.export_compiled()
+            except Exception as e:
+                logger.warning(f"BrainStem: Could not compile the forest ({e}). Using sklearn trees.")
+
+    def _release_estimators(self):
+        # Compiled runtime: the flat arrays are all inference needs
+        if self.compiled is not None:
+            self.model = None
+            self._estimators = None
+
+    @property
+    def compiled_path(self) -> str:
+        return os.path.splitext(self.model_path)[0] + ".npz"
+
+    def _runtime_path(self) -> str:
+        # Falls back to the joblib artifact when no compiled forest was written (or compiling failed)
+        if self.backend == "compiled" and os.path.exists(self.compiled_path):
+            return self.compiled_path
+        return self.model_path
+
+    def export_compiled(self) -> CompiledForest:
+        """
+        The trained forest as flat arrays (see brain/forest.py), scoring P(Win).
+        """
+        if self.compiled is not None and self.model is None:
+            return self.compiled # Loaded from the .npz artifact
+        if not self.is_trained or getattr(self.model, "estimators_", None) is None:
+            raise ValueError("BrainStem: No trained forest to compile.")
+        return CompiledForest.from_sklearn(self.model, class_index=1)
+
+    # --- Inference ---
+    def vectorize(self, features: dict, out: np.ndarray = None) -> np.ndarray:
+        """
+        Writes `features` into a row in feature_columns order (missing or NaN -> 0, as in training).
+        """
+        out = self._row[0] if out is None else out
+        for i, col in enumerate(self.feature_columns):
+            out[i] = features.get(col, 0.0)
+        np.nan_to_num(out, copy=False, nan=0.0)
+        return out
 
+    def _win_proba(self, X: np.ndarray) -> np.ndarray:
+        if self._win_col is None:
+            return np.full(len(X), 0.5)
+        if self.compiled is not None:
+            return self.compiled.predict(X)
+        if self._estimators is None:
+            return self.model.predict_proba(pd.DataFrame(X, columns=self.feature_columns))[:, self._win_col]
+        # Same mean over trees as RandomForestClassifier.predict_proba, without its
+        # per-call input validation and joblib dispatch
+        total = np.zeros(len(X))
+        for tree in self._estimators:
+            total += tree.predict_proba(X, check_input=False)[:, self._win_col]
+        return total / len(self._estimators)
+
+    @tracer.trace("brain.predict")
     def predict_win_probability(self, features: dict) -> float:
         """
         Returns probability (0.0 - 1.0) of a win given current features.
         """
         if not self.is_trained:
             return 0.5 # Neutral
-            
-        df = pd.DataFrame([features])
-        # Add missing columns with 0
-        for col in self.feature_columns:
-            if col not in df.columns:
-                df[col] = 0.0
-
-        # Reorder to match training
-        df = df[self.feature_columns]
-        
+
         try:
-            prob = self.model.predict_proba(df)[0][1] # Probability of class 1 (Win)
-            return prob
-        except:
+            with self._lock:
+                self.vectorize(features, self._row[0])
+                return float(self._win_proba(self._row)[0])
+        except Exception:
              return 0.5
 
-    def save_model(self, path="model_registry/brain_model_v1.joblib"):
+    @tracer.trace("brain.predict_many")
+    def predict_many(self, rows: Union[List[dict], np.ndarray]) -> np.ndarray:
+        """
+        Win probabilities for a whole watchlist in one pass. `rows` is a list of
+        feature dicts or an (n, len(feature_columns)) array already in column order.
+        """
+        n = len(rows)
+        if not self.is_trained or n == 0:
+            return np.full(n, 0.5)
+
+        try:
+            with self._lock:
+                if isinstance(rows, np.ndarray):
+                    X = np.nan_to_num(np.ascontiguousarray(rows, dtype=np.float32), nan=0.0)
+                else:
+                    if len(self._batch) < n:
+                        self._batch = np.zeros((n, len(self.feature_columns)), dtype=np.float32)
+                    X = self._batch[:n]
+                    for i, features in enumerate(rows):
+                        self.vectorize(features, X[i])
+                return self._win_proba(X)
+        except Exception as e:
+            logger.error(f"BrainStem: Batch prediction failed: {e}")
+            return np.full(n, 0.5)
+
+    # --- Registry ---
+    def save_model(self, path: str = None):
         import joblib
-        import os
+        path = path or self.model_path
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        joblib.dump(self.model, path)
+        npz = os.path.splitext(path)[0] + ".npz"
+        if self.model is not None:
+            joblib.dump(self.model, path)
+            if self.compiled is None and os.path.exists(npz):
+                os.remove(npz) # Stale: no longer this forest
+        if self.compiled is not None:
+            tmp = npz + ".tmp.npz"
+            self.compiled.save(tmp)
+            os.replace(tmp, npz) # Written last: it is the artifact refresh() watches
+        if path == self.model_path:
+            # Our own write is not a change for refresh()
+            runtime = self._runtime_path()
+            with open(runtime, "rb") as f:
+                self.checksum = hashlib.sha256(f.read()).hexdigest()
+            self._stat = self._artifact_stat(runtime)
         logger.info(f"BrainStem model saved to {path}")
 
-    def load_model(self, path="model_registry/brain_model_v1.joblib"):
+    def load_model(self, path: str = None) -> bool:
         import joblib
-        if os.path.exists(path):
+        path = path or self.model_path
+        self.model_path = path
+        runtime = self._runtime_path()
+        if os.path.exists(runtime):
             try:
-                self.model = joblib.load(path)
-                self.is_trained = True
-                logger.info(f"BrainStem model loaded from {path}")
+                stat = self._artifact_stat(runtime)
+                with open(runtime, "rb") as f:
+                    blob = f.read()
+                if runtime == path:
+                    model, compiled = joblib.load(io.BytesIO(blob)), None
+                else:
+                    model, compiled = None, CompiledForest.load(io.BytesIO(blob))
+                    if compiled.n_features != len(self.feature_columns):
+                        raise ValueError(f"Compiled forest has {compiled.n_features} features, expected {len(self.feature_columns)}")
+                with self._lock:
+                    self.model = model
+                    self.is_trained = True
+                    if compiled is None:
+                        self._bind()
+                        self._release_estimators() # Compiled backend over a joblib-only artifact
+                    else:
+                        self.compiled, self._estimators, self._win_col = compiled, None, 1
+                self.checksum = hashlib.sha256(blob).hexdigest()
+                self._stat = stat
+                logger.info(f"BrainStem model loaded from {runtime}")
+                return True
             except Exception as e:
                 logger.error(f"Failed to load model: {e}")
         else:
             logger.warning(f"No model found at {path}. BrainStem is untrained.")
+        return False
+
+    @staticmethod
+    def _artifact_stat(path: str):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reloads the model only if the registry artifact changed: a stat() at most every
+        cfg.MODEL_WATCH_INTERVAL seconds, a checksum only when mtime/size moved, and a
+        load only when the checksum differs. Returns True when a new model was loaded.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + cfg.MODEL_WATCH_INTERVAL
+
+        path = self._runtime_path()
+        try:
+            stat = self._artifact_stat(path)
+        except OSError:
+            return False
+        if stat == self._stat:
+            return False
+
+        self._stat = stat
+        with open(path, "rb") as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        if checksum == self.checksum:
+            return False # Touched or rewritten with identical content
+        logger.info(f"BrainStem: Model artifact {path} changed. Reloading.")
+        return self.load_model()
 
 class SelfStudy:
     def __init__(self):
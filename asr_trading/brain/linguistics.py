@@ -242,7 +242,7 @@ class LinguisticEngine:
         Determines intent via keywords and fetches Live Data from YFinance.
         This provides 'Intelligence' without an LLM Key.
         """
-        import yfinance as yf
+        from asr_trading.data.quote_cache import quote_cache
         
         # 1. Identify Ticker
         ticker_map = {
@@ -276,8 +276,7 @@ class LinguisticEngine:
         # 2. Fetch Data (Real-Time)
         try:
             msg = f"🔍 **Analyzing {display_name}...**\n\n"
-            ticker = yf.Ticker(target_symbol)
-            todays_data = ticker.history(period='1d')
+            todays_data = quote_cache.history(target_symbol, period='1d')
             
             if not todays_data.empty:
                 current_price = todays_data['Close'].iloc[-1]
@@ -1,10 +1,14 @@
+import atexit
 import time
 import functools
 import json
 import threading
-from typing import Dict, Any, Callable
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
 from enum import Enum
 from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.metrics import metrics_registry
 
 class ServiceStatus(Enum):
     OK = "OK"
@@ -17,35 +21,145 @@ class Telemetry:
     Centralized metrics recorder.
     In vNext, this would push to Prometheus/Grafana.
     For now, it logs structured JSON to a dedicated metrics file which can be ingested later.
+
+    record_metric() only appends to an in-memory ring buffer (deque appends are
+    atomic, so the hot path takes no lock and does no I/O). A daemon flusher
+    thread serializes and writes the buffer in batches once `batch_size` records
+    are waiting or every `flush_interval` seconds. When the buffer is full the
+    oldest records are overwritten and counted in `dropped`. close() (also run
+    at exit) drains what is left; after that records are written through.
+    Every record is also folded into the in-process metrics registry (/metrics).
     """
-    def __init__(self, log_path="metrics.jsonl"):
-        self.lock = threading.Lock()
+    def __init__(self, log_path="metrics.jsonl", capacity: int = None, batch_size: int = None,
+                 flush_interval: float = None, buffered: bool = True, bridge: bool = True):
+        self.lock = threading.Lock() # Serializes file writes (flusher, flush(), write-through); the buffered record path never takes it
         self.log_path = log_path
+        self.capacity = capacity or cfg.TELEMETRY_BUFFER_SIZE
+        self.batch_size = batch_size or cfg.TELEMETRY_BATCH_SIZE
+        self.flush_interval = flush_interval or cfg.TELEMETRY_FLUSH_INTERVAL
+        self.buffered = buffered
+        self.bridge = bridge # Fold records into the metrics registry
+        self._buffer: deque = deque(maxlen=self.capacity)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Counters (best effort under contention; they are for monitoring, not accounting)
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.peak_depth = 0
+        self.batches = 0
         # Ensure file exists
         with open(self.log_path, 'a') as f:
             pass
 
     def record_metric(self, name: str, value: float, tags: Dict[str, str] = None):
-        if tags is None:
-            tags = {}
-        
-        entry = {
-            "ts": time.time(),
-            "name": name,
-            "value": value,
-            "tags": tags
-        }
-        
-        # In a high-perf scenario, this would be async/batched.
-        with self.lock:
-            with open(self.log_path, 'a') as f:
-                f.write(json.dumps(entry) + "\n")
+        if self.bridge:
+            metrics_registry.record(name, value, tags) # Live view for /metrics
+        entry = (time.time(), name, value, tags if tags is not None else {})
+        if not self.buffered or self._stop.is_set():
+            with self.lock:
+                self._write([entry])
+            return
+
+        if self._thread is None:
+            self._start()
+        depth = len(self._buffer)
+        if depth >= self.capacity:
+            self.dropped += 1 # The append below evicts the oldest record
+        self._buffer.append(entry)
+        self.recorded += 1
+        if depth >= self.peak_depth:
+            self.peak_depth = min(depth + 1, self.capacity)
+        if depth + 1 >= self.batch_size and not self._wake.is_set():
+            self._wake.set()
 
     def record_event(self, event_type: str, details: Dict[str, Any]):
         self.record_metric(f"event.{event_type}", 1.0, details)
 
+    # --- Background writer ---
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="telemetry-flusher", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _drain(self) -> List[tuple]:
+        batch = []
+        pop = self._buffer.popleft
+        try:
+            while True:
+                batch.append(pop())
+        except IndexError:
+            pass
+        return batch
+
+    def _write(self, entries: List[tuple]):
+        # Caller holds self.lock
+        lines = "".join(
+            json.dumps({"ts": ts, "name": name, "value": value, "tags": tags}, default=str) + "\n"
+            for ts, name, value, tags in entries
+        )
+        try:
+            with open(self.log_path, 'a') as f:
+                f.write(lines)
+            self.written += len(entries)
+            self.batches += 1
+        except (OSError, ValueError) as e:
+            self.write_errors += 1
+            logger.error(f"Telemetry: Failed to write {len(entries)} records to {self.log_path}: {e}")
+
+    def flush(self):
+        """
+        Writes everything buffered so far (one file append). Safe from any thread.
+        """
+        with self.lock: # Drain + write under one lock keeps batches in order
+            batch = self._drain()
+            if batch:
+                self._write(batch)
+
+    def close(self, timeout: float = 5.0):
+        """
+        Flush-on-shutdown: stops the flusher and drains the buffer. Later records are written through.
+        """
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+            "depth": len(self._buffer),
+            "peak_depth": self.peak_depth,
+            "capacity": self.capacity,
+            "batches": self.batches
+        }
+
 telemetry = Telemetry()
 
+_telemetry_buffer = metrics_registry.gauge("asr_telemetry_buffer", "Telemetry writer counters", ["counter"])
+for _counter in ("recorded", "written", "dropped", "write_errors", "peak_depth"):
+    _telemetry_buffer.set_function(lambda c=_counter: getattr(telemetry, c), counter=_counter)
+_telemetry_buffer.set_function(lambda: len(telemetry._buffer), counter="depth")
+
+_STATUS_LEVEL = {ServiceStatus.OK: 0, ServiceStatus.DEGRADED: 1, ServiceStatus.CRITICAL: 2, ServiceStatus.UNKNOWN: 3}
+
 class HealthMonitor:
     """
     Tracks the heartbeat of all registered services.
@@ -55,11 +169,14 @@ class HealthMonitor:
         self._services: Dict[str, float] = {}
         self._thresholds: Dict[str, float] = {}
         self._lock = threading.Lock()
+        self._heartbeat_age = metrics_registry.gauge("asr_service_heartbeat_age_seconds", "Seconds since the service's last heartbeat", ["service"])
+        self._status = metrics_registry.gauge("asr_service_status", "0=OK, 1=DEGRADED, 2=CRITICAL", ["service"])
 
     def register_service(self, name: str, timeout_seconds: float = 60.0):
         with self._lock:
             self._services[name] = time.time()
             self._thresholds[name] = timeout_seconds
+            self._heartbeat_age.set_function(lambda: time.time() - self._services.get(name, time.time()), service=name)
             logger.info(f"Avionics: Service '{name}' registered with {timeout_seconds}s heartbeat.")
 
     def heartbeat(self, name: str):
@@ -83,6 +200,7 @@ class HealthMonitor:
                     telemetry.record_event("health_check_degraded", {"service": name, "elapsed": elapsed})
                 else:
                     status_map[name] = ServiceStatus.OK
+                self._status.set(_STATUS_LEVEL[status_map[name]], service=name)
         
         return status_map
 
@@ -111,6 +229,8 @@ avionics_monitor = HealthMonitor()
 class CircuitBreakerOpenException(Exception):
     pass
 
+_BREAKER_LEVEL = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
+
 class CircuitBreaker:
     """
     Protects the system from failing external services.
@@ -125,6 +245,9 @@ class CircuitBreaker:
         self.last_failure_time = 0
         self.state = "CLOSED" # CLOSED, OPEN, HALF_OPEN
         self._lock = threading.Lock()
+        metrics_registry.gauge("asr_circuit_breaker_state", "0=CLOSED, 1=HALF_OPEN, 2=OPEN", ["name"]).set_function(
+            lambda: _BREAKER_LEVEL[self.state], name=name)
+        self._rejected = metrics_registry.counter("asr_circuit_breaker_rejected_total", "Calls refused while OPEN", ["name"])
 
     def _allow_request(self) -> bool:
         with self._lock:
@@ -165,6 +288,7 @@ class CircuitBreaker:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             if not self._allow_request():
+                self._rejected.inc(name=self.name)
                 raise CircuitBreakerOpenException(f"CircuitBreaker '{self.name}' is OPEN.")
             
             try:
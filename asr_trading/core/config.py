@@ -16,6 +16,8 @@ class Config:
     KITE_API_KEY = os.getenv("KITE_API_KEY", "")
     KITE_ACCESS_TOKEN = os.getenv("KITE_ACCESS_TOKEN", "")
     POLYGON_API_KEY = os.getenv("POLYGON_API_KEY", "")
+    POLYGON_WS_URL = os.getenv("POLYGON_WS_URL", "wss://socket.polygon.io/stocks")
+    POLYGON_STREAM = os.getenv("POLYGON_STREAM", "true").lower() == "true"
     ALPACA_KEY_ID = os.getenv("ALPACA_KEY_ID", "")
     ALPACA_SECRET_KEY = os.getenv("ALPACA_SECRET_KEY", "")
     ALPACA_BASE_URL = os.getenv("ALPACA_BASE_URL", "https://paper-api.alpaca.markets")
@@ -50,6 +52,79 @@ class Config:
     MAX_OPEN_POSITIONS = 5
     RISK_PER_TRADE_PERCENT = 0.02 # 2% Rule
 
+    # Data Provider Quotas (requests per minute, burst) - free tiers
+    PROVIDER_RATE_LIMITS = {
+        "YAHOO_FINANCE": (60, 5),
+        "POLYGON_IO": (5, 5),
+        "FINNHUB": (60, 10),
+        "TWELVE_DATA": (8, 8),
+        "ALPHA_VANTAGE": (5, 5),
+    }
+
+    # Shared market-data I/O (core/io_pool.py)
+    HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "10"))
+    HTTP_DNS_TTL = 300 # Seconds
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    SDK_THREAD_WORKERS = int(os.getenv("SDK_THREAD_WORKERS", "8"))
+
+    # On-demand quote/history cache TTLs by bar interval, seconds (data/quote_cache.py)
+    QUOTE_CACHE_TTLS = {
+        "1m": 15, "2m": 15, "5m": 30, "15m": 60, "30m": 60, "1h": 120,
+        "1d": 30, "5d": 300, "1wk": 300, "1mo": 900,
+    }
+
+    # Telemetry writer: ring buffer size, records per batch, max seconds between flushes (core/avionics.py)
+    TELEMETRY_BUFFER_SIZE = int(os.getenv("TELEMETRY_BUFFER_SIZE", "65536"))
+    TELEMETRY_BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "512"))
+    TELEMETRY_FLUSH_INTERVAL = float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "1.0"))
+
+    # Tracing (core/tracing.py): fraction of traces exported to TRACE_EXPORT_PATH; all spans feed /api/trace/stats
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+    TRACE_RING_SIZE = int(os.getenv("TRACE_RING_SIZE", "4096"))
+    TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")
+
+    # On-demand profiler and event-loop lag monitor (core/profiler.py)
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+    PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+    LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.25"))
+
+    # BrainStem model artifact; refresh() re-checks it at most every MODEL_WATCH_INTERVAL seconds (brain/learning.py)
+    MODEL_PATH = os.getenv("MODEL_PATH", "model_registry/brain_model_v1.joblib")
+    MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "5.0"))
+    MODEL_BACKEND = os.getenv("MODEL_BACKEND", "compiled") # compiled (flat-array forest, brain/forest.py) | sklearn
+
+    # Watchlist cycle scheduler (core/cycle_scheduler.py)
+    CYCLE_INTERVAL_SEC = float(os.getenv("CYCLE_INTERVAL_SEC", "60"))
+    CYCLE_MAX_CONCURRENCY = int(os.getenv("CYCLE_MAX_CONCURRENCY", "16")) # Symbols admitted into the pipeline at once
+    CYCLE_DEADLINE_SEC = float(os.getenv("CYCLE_DEADLINE_SEC", "50"))
+    CYCLE_OVERRUN_POLICY = os.getenv("CYCLE_OVERRUN_POLICY", "skip") # skip | coalesce
+
+    # Feed hedging (data/feed_manager.py): backups race a slow PRIMARY after FEED_HEDGE_DELAY seconds;
+    # quorum mode waits for FEED_QUORUM_SIZE valid quotes (up to FEED_QUORUM_TIMEOUT) and takes the median
+    FEED_HEDGE_MODE = os.getenv("FEED_HEDGE_MODE", "false").lower() == "true"
+    FEED_HEDGE_DELAY = float(os.getenv("FEED_HEDGE_DELAY", "0.25"))
+    FEED_HEDGE_TIMEOUT = float(os.getenv("FEED_HEDGE_TIMEOUT", "5.0"))
+    FEED_QUORUM = os.getenv("FEED_QUORUM", "false").lower() == "true"
+    FEED_QUORUM_SIZE = int(os.getenv("FEED_QUORUM_SIZE", "2"))
+    FEED_QUORUM_TIMEOUT = float(os.getenv("FEED_QUORUM_TIMEOUT", "1.0"))
+
+    # Orchestrator pipeline: worker pool per stage, bounded queue in front of each (core/orchestrator.py)
+    PIPELINE_FETCH_WORKERS = int(os.getenv("PIPELINE_FETCH_WORKERS", "4"))
+    PIPELINE_ANALYZE_WORKERS = int(os.getenv("PIPELINE_ANALYZE_WORKERS", "1")) # CPU-bound on the loop; 1 keeps bar order per symbol
+    PIPELINE_EXECUTE_WORKERS = int(os.getenv("PIPELINE_EXECUTE_WORKERS", "2"))
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+
+    # Candle interval fed to the FeatureEngine (see data/bar_aggregator.py)
+    FEATURE_INTERVAL = os.getenv("FEATURE_INTERVAL", "1m")
+    # Closed bars per scan from which one vectorized pass beats per-bar streaming updates
+    FEATURE_BATCH_MIN_SYMBOLS = int(os.getenv("FEATURE_BATCH_MIN_SYMBOLS", "200"))
+    # Memory bound of the indicator kernel cache (analysis/kernels.py)
+    KERNEL_CACHE_MB = int(os.getenv("KERNEL_CACHE_MB", "256"))
+
     # Watchlist
     # Watchlist (NSE Focus)
     WATCHLIST = ["RELIANCE.NS", "HDFCBANK.NS", "TCS.NS", "INFY.NS", "AAPL"] # Mixed for Demo
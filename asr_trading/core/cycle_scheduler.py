@@ -0,0 +1,254 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import numpy as np
+from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+from asr_trading.core.io_pool import io_pool
+
+STAGES = ("fetch", "features", "select", "plan", "execute", "queued")
+
+@dataclass
+class CycleReport:
+    cycle_id: int
+    started_at: float
+    elapsed_ms: float = 0.0
+    symbols: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: List[str] = field(default_factory=list)
+    prefetch_ms: float = 0.0 # Batch quote for the whole watchlist, before the per-symbol stages
+    # stage -> {"count", "p50_ms", "max_ms", "total_ms"}
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cycle_id": self.cycle_id,
+            "started_at": self.started_at,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "symbols": self.symbols,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "prefetch_ms": round(self.prefetch_ms, 2),
+            "stages": self.stages
+        }
+
+class CycleScheduler:
+    """
+    Asyncio-native watchlist scheduler.
+    - Every `interval` seconds runs the cycle function for each symbol with at
+      most `max_concurrency` in flight.
+    - A cycle that passes `deadline` seconds has its unfinished symbols cancelled.
+    - If a cycle is still running when the next one is due, the tick is either
+      skipped ("skip") or folded into one catch-up run right after ("coalesce").
+    - Each cycle produces a CycleReport with per-stage timings (from the
+      orchestrator's StageClock) and sends them to telemetry.
+    By default symbols go through the orchestrator pipeline (orchestrator.process);
+    max_concurrency then caps how many are admitted at once. `prefetch_fn`
+    (default: orchestrator.prefetch) gets the whole watchlist once per cycle
+    first, so quotes arrive in a few batch requests instead of one per symbol.
+    start() runs it on its own loop thread; run_once() can also be awaited directly.
+    """
+    def __init__(self, cycle_fn: Optional[Callable[..., Awaitable[Dict[str, float]]]] = None,
+                 symbols_fn: Optional[Callable[[], List[str]]] = None,
+                 interval: float = None, max_concurrency: int = None,
+                 deadline: float = None, overrun_policy: str = None,
+                 prefetch_fn: Optional[Callable[[List[str]], Awaitable[Any]]] = None):
+        self.cycle_fn = cycle_fn
+        self.prefetch_fn = prefetch_fn
+        self.symbols_fn = symbols_fn or (lambda: list(cfg.WATCHLIST))
+        self.interval = interval or cfg.CYCLE_INTERVAL_SEC
+        self.max_concurrency = max_concurrency or cfg.CYCLE_MAX_CONCURRENCY
+        self.deadline = deadline or cfg.CYCLE_DEADLINE_SEC or self.interval * 0.9
+        self.overrun_policy = overrun_policy or cfg.CYCLE_OVERRUN_POLICY
+        if self.overrun_policy not in ("skip", "coalesce"):
+            raise ValueError(f"CycleScheduler: Unknown overrun policy {self.overrun_policy}")
+
+        self.cycles_run = 0
+        self.cycles_skipped = 0
+        self.last_report: Optional[CycleReport] = None
+        self._task: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+        self._catch_up = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def _default_cycle_fn(self):
+        from asr_trading.core.orchestrator import orchestrator
+        return orchestrator.process
+
+    def _default_prefetch_fn(self):
+        if self.cycle_fn is not None:
+            return None # Custom cycles fetch for themselves
+        from asr_trading.core.orchestrator import orchestrator
+        return orchestrator.prefetch
+
+    # --- Lifecycle ---
+    def start(self):
+        """
+        Always runs on its own "cycle-scheduler" loop thread, also when called from
+        a running loop (server lifespan, CLI): the scan's fetches, CPU-bound
+        features/selector/model work and any sync SDK fallback must never stall
+        the API loop.
+        """
+        if self.is_running:
+            return
+        started = threading.Event()
+        def runner():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._task = self._loop.create_task(self._run())
+            started.set()
+            try:
+                self._loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                # Pipeline workers etc. started on this loop go down with it
+                leftover = asyncio.all_tasks(self._loop)
+                for task in leftover:
+                    task.cancel()
+                self._loop.run_until_complete(asyncio.gather(*leftover, return_exceptions=True))
+                self._loop.run_until_complete(io_pool.close_session()) # Fetches on this loop opened their own
+                self._loop.close()
+        self._thread = threading.Thread(target=runner, name="cycle-scheduler", daemon=True)
+        self._thread.start()
+        started.wait()
+        logger.info(f"CycleScheduler: Started (every {self.interval}s, concurrency={self.max_concurrency}, deadline={self.deadline}s, overrun={self.overrun_policy})")
+
+    def stop(self):
+        if self._task is None:
+            return
+        task, loop = self._task, self._loop
+        self._task = None
+        def cancel():
+            task.cancel() # _run cancels the in-flight cycle on its way out
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            cancel()
+        elif loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(cancel)
+        if self._thread is not None:
+            if self._thread is not threading.current_thread(): # stop() from a cycle can't join itself
+                self._thread.join(timeout=5)
+            self._thread = None
+        logger.info("CycleScheduler: Stopped.")
+
+    # --- Loop ---
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        try:
+            while True:
+                if self._current is not None and not self._current.done():
+                    # Previous cycle overran into this slot
+                    self.cycles_skipped += 1
+                    if self.overrun_policy == "coalesce":
+                        self._catch_up = True
+                    telemetry.record_event("cycle_overrun", {"policy": self.overrun_policy, "skipped": self.cycles_skipped})
+                    logger.warning(f"CycleScheduler: Previous cycle still running; {'coalescing' if self.overrun_policy == 'coalesce' else 'skipping'} this tick.")
+                else:
+                    self._current = loop.create_task(self._run_with_catch_up())
+
+                next_at += self.interval
+                now = loop.time()
+                if next_at < now:
+                    # Fell behind by whole intervals (e.g. suspended): don't burst
+                    next_at = now + self.interval - (now - next_at) % self.interval
+                await asyncio.sleep(next_at - now)
+        finally:
+            if self._current is not None and not self._current.done():
+                self._current.cancel()
+                await asyncio.gather(self._current, return_exceptions=True)
+            self._catch_up = False
+
+    async def _run_with_catch_up(self):
+        await self.run_once()
+        while self._catch_up:
+            self._catch_up = False
+            await self.run_once()
+
+    async def run_once(self, symbols: Optional[List[str]] = None) -> CycleReport:
+        """
+        One bounded, deadline-limited pass over the watchlist.
+        """
+        symbols = list(symbols if symbols is not None else self.symbols_fn())
+        cycle_fn = self.cycle_fn or self._default_cycle_fn()
+        self.cycles_run += 1
+        report = CycleReport(cycle_id=self.cycles_run, started_at=time.time(), symbols=len(symbols))
+        started = time.perf_counter()
+        sem = asyncio.Semaphore(self.max_concurrency)
+        timings: Dict[str, Dict[str, float]] = {s: {} for s in symbols}
+
+        prefetch = self.prefetch_fn or self._default_prefetch_fn()
+        if prefetch is not None and symbols:
+            try:
+                await asyncio.wait_for(prefetch(symbols), self.deadline)
+            except Exception as e:
+                # Symbols then fetch one by one inside the cycle
+                logger.warning(f"CycleScheduler: Prefetch failed for cycle {report.cycle_id}: {e!r}")
+            report.prefetch_ms = (time.perf_counter() - started) * 1000.0
+
+        async def one(symbol: str):
+            async with sem:
+                await cycle_fn(symbol, timings=timings[symbol])
+
+        tasks = {asyncio.create_task(one(s)): s for s in symbols}
+        remaining = max(0.0, self.deadline - (time.perf_counter() - started))
+        done, pending = await asyncio.wait(tasks, timeout=remaining) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            report.timed_out = sorted(tasks[t] for t in pending)
+            telemetry.record_event("cycle_deadline_exceeded", {"cycle": report.cycle_id, "symbols": report.timed_out})
+            logger.warning(f"CycleScheduler: Cycle {report.cycle_id} hit {self.deadline}s deadline; cancelled {report.timed_out}")
+
+        for task in done:
+            if task.exception() is not None:
+                report.failed += 1
+                logger.error(f"CycleScheduler: {tasks[task]} failed: {task.exception()}")
+            else:
+                report.completed += 1
+
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        report.stages = self._stage_stats(timings.values())
+        self.last_report = report
+        self._publish(report)
+        return report
+
+    @staticmethod
+    def _stage_stats(per_symbol) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for stage in STAGES:
+            values = np.array([t[stage] for t in per_symbol if stage in t])
+            if len(values):
+                stats[stage] = {
+                    "count": int(len(values)),
+                    "p50_ms": round(float(np.median(values)), 3),
+                    "max_ms": round(float(values.max()), 3),
+                    "total_ms": round(float(values.sum()), 3)
+                }
+        return stats
+
+    def _publish(self, report: CycleReport):
+        telemetry.record_metric("cycle.elapsed_ms", report.elapsed_ms, {"cycle": report.cycle_id, "symbols": report.symbols})
+        for stage, s in report.stages.items():
+            telemetry.record_metric(f"cycle.stage.{stage}_ms", s["p50_ms"], {"cycle": report.cycle_id, "max_ms": s["max_ms"], "count": s["count"]})
+        stages = ", ".join(f"{k}={v['p50_ms']:.1f}ms" for k, v in report.stages.items())
+        logger.info(f"CycleScheduler: Cycle {report.cycle_id} {report.completed}/{report.symbols} done in {report.elapsed_ms:.0f}ms ({stages})")
@@ -0,0 +1,105 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+class IOPool:
+    """
+    Shared market-data I/O resources.
+    - One pooled aiohttp session per event loop: keep-alive, total and per-host
+      connection limits, DNS cache, default timeouts.
+    - One bounded thread pool for blocking SDK calls (yfinance, polygon REST, ...),
+      so they never run on the event loop and can't exhaust the default executor.
+    """
+    def __init__(self, limit: int = None, limit_per_host: int = None, dns_ttl: int = None,
+                 timeout: float = None, max_workers: int = None):
+        self.limit = limit or cfg.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host or cfg.HTTP_POOL_PER_HOST
+        self.dns_ttl = dns_ttl or cfg.HTTP_DNS_TTL
+        self.timeout = timeout or cfg.HTTP_TIMEOUT
+        self.max_workers = max_workers or cfg.SDK_THREAD_WORKERS
+        self._sessions = weakref.WeakKeyDictionary() # loop -> ClientSession
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.blocking_calls = 0
+
+    # --- HTTP ---
+    def session(self) -> "aiohttp.ClientSession":
+        """
+        The shared session for the running loop (created on first use).
+        Do not close it; call io_pool.close() on shutdown.
+        """
+        if not HAS_AIOHTTP:
+            raise RuntimeError("aiohttp not installed")
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=30
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=min(5.0, self.timeout))
+            )
+            self._sessions[loop] = session
+            logger.debug(f"IOPool: HTTP session created (limit={self.limit}, per_host={self.limit_per_host})")
+        return session
+
+    # --- Blocking SDK calls ---
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sdk-io")
+            return self._executor
+
+    async def run_blocking(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Runs a blocking call on the SDK pool. With `timeout` the caller gives up
+        (asyncio.TimeoutError); the worker thread finishes in the background.
+        """
+        self.blocking_calls += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        if timeout is None:
+            return await future
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            telemetry.record_event("sdk_call_timeout", {"call": getattr(func, "__qualname__", str(func)), "timeout": timeout})
+            raise
+
+    async def close_session(self):
+        """
+        Closes the running loop's session only; for loops that end before the
+        process does (e.g. the cycle scheduler's thread).
+        """
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def close(self):
+        """
+        Closes this loop's session (and the SDK pool). Safe to call more than once.
+        """
+        await self.close_session()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+io_pool = IOPool()
@@ -0,0 +1,250 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in ms (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+def _fmt(v: float) -> str:
+    v = float(v)
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    if v.is_integer() and abs(v) < 1e15:
+        return str(int(v))
+    return repr(v) # Also covers NaN
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric:
+    """
+    One metric family. Children are keyed by label values; updates take a
+    per-family lock (uncontended acquire is ~tens of ns).
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str = "", labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if not self.label_names:
+            return ()
+        return tuple([str(labels.get(n, "")) for n in self.label_names])
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help or self.name}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            lines.extend(self._render_child(key, child))
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        self._inc(self._key(labels), amount)
+
+    def _inc(self, key: Tuple[str, ...], amount: float = 1.0):
+        with self._lock:
+            self._children[key] = self._children.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._children.get(self._key(labels), 0.0)
+
+    def _render_child(self, key, value):
+        return [f"{self.name}{_labels(self.label_names, key)} {_fmt(value)}"]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            current = self._children.get(key, 0.0)
+            self._children[key] = (current() if callable(current) else current) + amount
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """
+        Value computed at scrape time (uptime, queue depth, ...).
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = fn
+
+    def value(self, **labels) -> float:
+        v = self._children.get(self._key(labels), 0.0)
+        return v() if callable(v) else v
+
+    def _render_child(self, key, value):
+        if callable(value):
+            try:
+                value = value()
+            except Exception:
+                return [] # A broken callback must not break the scrape
+        return [f"{self.name}{_labels(self.label_names, key)} {_fmt(value)}"]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS_MS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key: Tuple[str, ...], value: float):
+        i = bisect_left(self.buckets, value) # First bucket with bound >= value; len(buckets) is +Inf
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                # [per-bucket counts..., +Inf count, sum]
+                child = self._children[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            child[i] += 1
+            child[-1] += value
+
+    def snapshot(self, **labels) -> Tuple[List[int], float]:
+        """
+        (cumulative bucket counts incl. +Inf, sum) for one child.
+        """
+        with self._lock:
+            child = list(self._children.get(self._key(labels)) or [0] * (len(self.buckets) + 1) + [0.0])
+        cumulative, total = [], 0
+        for c in child[:-1]:
+            total += c
+            cumulative.append(total)
+        return cumulative, child[-1]
+
+    def _render_child(self, key, child):
+        lines, total = [], 0
+        counts = list(child) # Copy: observe() may run concurrently
+        for bound, c in zip(self.buckets + (math.inf,), counts[:-1]):
+            total += c
+            le = 'le="' + _fmt(bound) + '"'
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {total}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(counts[-1])}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, key)} {total}")
+        return lines
+
+class Summary(_Metric):
+    """
+    Count and sum only (no quantiles): the average is _sum / _count.
+    """
+    kind = "summary"
+
+    def observe(self, value: float, **labels):
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key: Tuple[str, ...], value: float):
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = [0, 0.0]
+            child[0] += 1
+            child[1] += value
+
+    def _render_child(self, key, child):
+        count, total = child
+        return [f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(total)}",
+                f"{self.name}_count{_labels(self.label_names, key)} {count}"]
+
+class MetricsRegistry:
+    """
+    In-process metrics (counters, gauges, fixed-bucket histograms) rendered in the
+    Prometheus text format for the /metrics endpoint.
+    record() bridges telemetry.record_metric names into the registry:
+      event.<type>   -> asr_events_total{type}
+      <name>_ms      -> histogram asr_<name>
+      anything else  -> summary asr_<name> (count + sum)
+    Only low-cardinality tags (BRIDGE_LABELS) become labels.
+    """
+    PREFIX = "asr_"
+    BRIDGE_LABELS = ("component", "stage", "provider", "service", "interval", "name")
+    _INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._bridge: Dict[str, Tuple[_Metric, Optional[Tuple[str, ...]]]] = {} # telemetry name -> (family, fixed label key)
+
+    def _get(self, cls, name: str, help: str, labels: Iterable[str], **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"MetricsRegistry: {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "", labels: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", labels: Iterable[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS_MS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def summary(self, name: str, help: str = "", labels: Iterable[str] = ()) -> Summary:
+        return self._get(Summary, name, help, labels)
+
+    def record(self, name: str, value: float, tags: Optional[Dict[str, object]] = None):
+        """
+        Telemetry bridge (see class docstring). Family and, where possible, the label
+        key are resolved once per name so the hot path is a dict hit plus one locked update.
+        """
+        entry = self._bridge.get(name)
+        if entry is None:
+            entry = self._bridge[name] = self._bridge_family(name, tags or {})
+        metric, key = entry
+        if isinstance(metric, Counter):
+            metric._inc(key)
+            return
+        try:
+            metric._observe(key if key is not None else metric._key(tags or {}), float(value))
+        except (TypeError, ValueError):
+            pass # Non-numeric values only go to the JSONL log
+
+    def _bridge_family(self, name: str, tags: Dict[str, object]) -> Tuple[_Metric, Optional[Tuple[str, ...]]]:
+        if name.startswith("event."):
+            return self.counter(f"{self.PREFIX}events_total", "Telemetry events by type", ["type"]), (name[len("event."):],)
+        metric_name = self.PREFIX + self._INVALID.sub("_", name)
+        labels = [k for k in self.BRIDGE_LABELS if k in tags]
+        key = None if labels else () # Unlabelled families never need a per-call key
+        try:
+            if name.endswith("_ms"):
+                return self.histogram(metric_name, f"{name} (ms)", labels), key
+            return self.summary(metric_name, name, labels), key
+        except ValueError:
+            # Name taken by a directly registered metric of another type
+            return self.summary(f"{metric_name}_telemetry", name, labels), key
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics_registry = MetricsRegistry()
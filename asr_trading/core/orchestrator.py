@@ -1,8 +1,16 @@
 import asyncio
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+from asr_trading.core.tracing import tracer, Span
 from asr_trading.data.canonical import Tick, OHLC
 from asr_trading.data.feed_manager import feed_manager
+from asr_trading.data.bar_aggregator import bar_aggregator
 from asr_trading.analysis.features import feature_engine
 from asr_trading.strategy.selector import strategy_selector
 from asr_trading.strategy.planner import planner_engine
@@ -11,97 +19,347 @@ from asr_trading.core.auditor import Auditor, InvariantViolation
 
 from asr_trading.core.cockpit import cockpit
 
+# Pipeline stages: fetch (I/O) -> analyze (features/select/plan, CPU) -> execute (broker I/O)
+PIPELINE_STAGES = ("fetch", "analyze", "execute")
+
+class StageClock:
+    """
+    Lap timer for one cycle: lap("fetch") stores ms since the previous lap.
+    resume() books the time since the last lap as "queued" (pipeline wait).
+    """
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        self.timings = {} if timings is None else timings
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.timings[stage] = (now - self._last) * 1000.0
+        self._last = now
+
+    def resume(self):
+        now = time.perf_counter()
+        self.timings["queued"] = self.timings.get("queued", 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+@dataclass
+class _Job:
+    symbol: str
+    clock: StageClock
+    done: asyncio.Future
+    tick: Optional[Tick] = None
+    proposal: Any = None
+    plan: Any = None
+    span: Optional[Span] = None # Cycle span (opened by process()); stage spans are its children
+    queued: bool = False
+    abandoned: bool = False # Caller gave up (deadline): dropped at the next stage boundary
+
 class Orchestrator:
     """
     Manages the end-to-end trading lifecycle for a single symbol.
-    Tick -> Features -> Strategy -> Plan -> Execution
+    Tick -> Bars -> Features -> Strategy -> Plan -> Execution
+
+    run_cycle() walks one symbol through every stage in sequence. process()
+    feeds the same stages through a pipeline instead: bounded queues between
+    fetch -> analyze -> execute, each drained by its own worker pool, so a slow
+    broker call only holds an execute worker while the next symbols keep being
+    analyzed, and a full queue makes producers wait (backpressure) rather than
+    piling up tasks when the feed stalls.
     """
-    
-    async def run_cycle(self, symbol: str):
+    def __init__(self, aggregator=None, workers: Optional[Dict[str, int]] = None, queue_size: int = None):
+        self.aggregator = aggregator or bar_aggregator
+        self.latest_features: Dict[str, Dict[str, Any]] = {}
+        self._evaluated: Dict[str, float] = {} # symbol -> timestamp of the last bar acted on
+        self._closed_bars: List[OHLC] = [] # Closed since the last feature batch (bus or scan thread)
+        self._bars_lock = threading.Lock()
+        self._prefetched: Dict[str, Optional[Tick]] = {} # This scan's batch quotes, taken by _fetch
+        self.aggregator.add_listener(self.on_bar, intervals=[cfg.FEATURE_INTERVAL])
+
+        # Pipeline (built lazily on the loop that first calls process())
+        self.workers = {
+            "fetch": cfg.PIPELINE_FETCH_WORKERS,
+            "analyze": cfg.PIPELINE_ANALYZE_WORKERS,
+            "execute": cfg.PIPELINE_EXECUTE_WORKERS,
+            **(workers or {})
+        }
+        self.queue_size = queue_size or cfg.PIPELINE_QUEUE_SIZE
+        self.coalesced = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tasks = []
+        self._busy = {s: 0 for s in PIPELINE_STAGES}
+        self._jobs: Dict[str, _Job] = {} # symbol -> job in flight
+
+    def on_bar(self, bar: OHLC):
+        """
+        Closed candles only: features are computed once per bar, not per tick.
+        Buffered here; _refresh_features turns them into features in one batch.
+        """
+        with self._bars_lock:
+            self._closed_bars.append(bar)
+
+    def _refresh_features(self):
+        """
+        Features for every symbol that closed a bar since the last call, in one
+        FeatureEngine.on_ohlc_many (a single vectorized pass for a large universe).
+        flush() closes the bars of all quiet symbols at once, so the first symbol
+        analyzed after a bar boundary computes the whole universe's features.
+        """
+        with self._bars_lock:
+            bars, self._closed_bars = self._closed_bars, []
+        if bars:
+            self.latest_features.update(feature_engine.on_ohlc_many(bars))
+
+    async def run_cycle(self, symbol: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Executes one trading cycle for the given symbol.
+        Returns per-stage timings in ms (fetch/features/select/plan/execute);
+        stages after an early exit are absent. `timings` is filled as it goes.
+        """
+        clock = StageClock(timings)
+        with tracer.span("orchestrator.cycle", symbol=symbol):
+            try:
+                tick = await self._fetch(symbol, clock)
+                if tick:
+                    proposal, plan = self._analyze(symbol, tick, clock)
+                    if plan:
+                        await self._execute(symbol, proposal, plan, clock)
+            except Exception as e:
+                self._on_error(symbol, e)
+        return clock.timings
+
+    async def prefetch(self, symbols: List[str]):
+        """
+        Quotes for a whole scan in one FeedManager.get_ticks (chunked batch
+        requests per provider); each symbol's _fetch then takes its tick from
+        here instead of making its own request. Replaces the previous scan's.
         """
+        with tracer.span("orchestrator.prefetch", symbols=len(symbols)):
+            ticks = await feed_manager.get_ticks(symbols)
+        self._prefetched = dict(ticks)
+
+    # --- Stages (shared by run_cycle and the pipeline) ---
+    async def _fetch(self, symbol: str, clock: StageClock) -> Optional[Tick]:
         cockpit.update_activity("Scanning", f"Processing cycle for {symbol}...", symbol=symbol)
-        
-        try:
-            # 1. Fetch Latest Data (Real Tick)
-            tick = await feed_manager.get_tick(symbol)
-            
-            if not tick:
-                cockpit.update_activity("Data Wait", "No data available.", symbol)
-                return
-
-            price = tick.last
-            cockpit.update_activity("Analyzing", f"Price: {price}. Computing features...", symbol)
-            
-            # Audit (Already checked in FeedManager, but double check allowed)
-            # Auditor.audit_tick_integrity(tick)
 
+        # 1. Fetch Latest Data (Real Tick): the scan's batch quote, or a request of its own
+        with tracer.span("orchestrator.fetch"):
+            tick = self._prefetched.pop(symbol, None)
+            if tick is None or tick.is_stale(threshold_sec=feed_manager.stale_threshold):
+                tick = await feed_manager.get_tick(symbol)
+        clock.lap("fetch")
+
+        if not tick:
+            cockpit.update_activity("Data Wait", "No data available.", symbol)
+        return tick
+
+    def _analyze(self, symbol: str, tick: Tick, clock: StageClock) -> Tuple[Any, Any]:
+        """
+        Bars -> Features -> Strategy -> Plan. Returns (proposal, plan); plan is None when there is nothing to execute.
+        """
+        price = tick.last
+        cockpit.update_activity("Analyzing", f"Price: {price}. Computing features...", symbol)
+
+        with tracer.span("orchestrator.features"):
             # Audit
             Auditor.audit_tick_integrity(tick)
-            
-            # 2. Update Features
-            dummy_ohlc = OHLC(symbol, tick.timestamp, price, price, price, price, 100, "1m")
-            feature_result = feature_engine.on_ohlc(dummy_ohlc)
-            
-            if feature_result["status"] != "READY":
-                msg = f"[{symbol}] Waiting for Data (Features not ready)"
-                cockpit.update_activity("Waiting", msg, symbol)
-                cockpit.add_message(msg, "WARNING")
-                return
-
-            features = feature_result["features"]
-
-            # 3. Strategy Selection
-            cockpit.update_activity("Evaluating", "Running strategy metrics...", symbol)
-            patterns = [] 
+
+            # 2. Update Candles; bars they closed (any symbol) update the features in one batch
+            self.aggregator.on_tick(tick)
+            self.aggregator.flush()
+            self._refresh_features()
+            feature_result = self.latest_features.get(symbol, {"status": "WARMUP"})
+        clock.lap("features")
+
+        if feature_result["status"] != "READY":
+            msg = f"[{symbol}] Waiting for Data (Features not ready)"
+            cockpit.update_activity("Waiting", msg, symbol)
+            cockpit.add_message(msg, "WARNING")
+            return None, None
+
+        bar_ts = feature_result.get("timestamp")
+        if bar_ts is not None and self._evaluated.get(symbol) == bar_ts:
+            cockpit.update_activity("Idle", "Waiting for the next bar to close.", symbol)
+            return None, None
+        self._evaluated[symbol] = bar_ts
+        features = feature_result["features"]
+
+        # 3. Strategy Selection
+        cockpit.update_activity("Evaluating", "Running strategy metrics...", symbol)
+        patterns = [] 
+        with tracer.span("orchestrator.select"):
             proposal = strategy_selector.select_strategy(symbol, features, patterns, [])
-            
-            if not proposal:
-                cockpit.log_decision({
-                    "timestamp": datetime.now().strftime("%H:%M:%S"),
-                    "symbol": symbol,
-                    "action": "HOLD",
-                    "reason": "Strategy filters not met.",
-                    "confidence": 0,
-                    "passed": ["Data Integrity"],
-                    "failed": ["Signal Threshold"]
-                })
-                cockpit.update_activity("Idle", "No signal found.", symbol)
-                cockpit.add_message(f"[{symbol}] Scan Complete: HOLD (No Strategy Trigger)", "INFO")
-                return
-
-            logger.info(f"Orchestrator [{symbol}]: Strategy PROPOSED -> {proposal.strategy_id} ({proposal.action})")
-            
-            # Update Cockpit with POSITIVE decision
+        clock.lap("select")
+
+        if not proposal:
             cockpit.log_decision({
                 "timestamp": datetime.now().strftime("%H:%M:%S"),
                 "symbol": symbol,
-                "action": proposal.action,
-                "reason": f"Strategy {proposal.strategy_id} triggers.",
-                "confidence": proposal.confidence,
-                "passed": ["Signal Threshold", "Risk Check (Prelim)"],
-                "failed": []
+                "action": "HOLD",
+                "reason": "Strategy filters not met.",
+                "confidence": 0,
+                "passed": ["Data Integrity"],
+                "failed": ["Signal Threshold"]
             })
+            cockpit.update_activity("Idle", "No signal found.", symbol)
+            cockpit.add_message(f"[{symbol}] Scan Complete: HOLD (No Strategy Trigger)", "INFO")
+            return None, None
+
+        logger.info(f"Orchestrator [{symbol}]: Strategy PROPOSED -> {proposal.strategy_id} ({proposal.action})")
 
-            # 4. Planning
+        # Update Cockpit with POSITIVE decision
+        cockpit.log_decision({
+            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "symbol": symbol,
+            "action": proposal.action,
+            "reason": f"Strategy {proposal.strategy_id} triggers.",
+            "confidence": proposal.confidence,
+            "passed": ["Signal Threshold", "Risk Check (Prelim)"],
+            "failed": []
+        })
+
+        # 4. Planning
+        with tracer.span("orchestrator.plan"):
             plan = planner_engine.create_plan(proposal, price)
-            if not plan:
-                logger.warning(f"Orchestrator [{symbol}]: Plan creation failed.")
-                return
+        clock.lap("plan")
+        if not plan:
+            logger.warning(f"Orchestrator [{symbol}]: Plan creation failed.")
+        return proposal, plan
 
-            # 5. Execution
-            cockpit.update_activity("Executing", f"Submitting {proposal.action} order...", symbol)
+    async def _execute(self, symbol: str, proposal, plan, clock: StageClock):
+        # 5. Execution
+        cockpit.update_activity("Executing", f"Submitting {proposal.action} order...", symbol)
+        with tracer.span("orchestrator.execute"):
             result = await execution_manager.execute_plan(plan)
-            
-            cockpit.add_message(f"Execution Result for {symbol}: {result['status']}", "SUCCESS" if result['status'] == "FILLED" else "WARNING")
-            cockpit.update_activity("Idle", "Cycle complete.", symbol)
-
-        except InvariantViolation as iv:
-            logger.critical(f"Orchestrator [{symbol}]: AUDIT FAILURE: {iv}")
-            cockpit.add_message(f"AUDIT FAILURE: {iv}", "ERROR")
-        except Exception as e:
+        clock.lap("execute")
+
+        cockpit.add_message(f"Execution Result for {symbol}: {result['status']}", "SUCCESS" if result['status'] == "FILLED" else "WARNING")
+        cockpit.update_activity("Idle", "Cycle complete.", symbol)
+
+    def _on_error(self, symbol: str, e: Exception):
+        if isinstance(e, InvariantViolation):
+            logger.critical(f"Orchestrator [{symbol}]: AUDIT FAILURE: {e}")
+            cockpit.add_message(f"AUDIT FAILURE: {e}", "ERROR")
+        else:
             logger.error(f"Orchestrator [{symbol}]: Cycle failed: {e}")
             cockpit.add_message(f"Cycle Error: {e}", "ERROR")
 
+    # --- Pipeline ---
+    async def process(self, symbol: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Pipelined run_cycle: same stages and timings, plus "queued" (ms spent waiting between stages).
+        Waits for a fetch slot when the pipeline is full. A symbol already in flight is
+        not queued twice; the caller shares the running job's outcome. Cancelling the
+        caller drops the job at its next stage boundary (a broker call already under way is not interrupted).
+        """
+        self._ensure_pipeline()
+        job = self._jobs.get(symbol)
+        if job is not None:
+            self.coalesced += 1
+            result = await asyncio.shield(job.done)
+            if timings is not None:
+                timings.update(result)
+            return result
+
+        job = _Job(symbol, StageClock(timings), self._loop.create_future())
+        self._jobs[symbol] = job
+        with tracer.span("orchestrator.cycle", symbol=symbol) as job.span:
+            try:
+                await self._queues["fetch"].put(job) # Backpressure: waits while the fetch queue is full
+                job.queued = True
+                return await asyncio.shield(job.done)
+            except asyncio.CancelledError:
+                job.abandoned = True
+                if not job.queued:
+                    self._finish(job)
+                raise
+
+    def _ensure_pipeline(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First use, or the previous loop is gone (its workers died with it)
+        self._loop = loop
+        self._jobs = {}
+        self._busy = {s: 0 for s in PIPELINE_STAGES}
+        self._queues = {s: asyncio.Queue(maxsize=self.queue_size) for s in PIPELINE_STAGES}
+        handlers = {"fetch": self._fetch_job, "analyze": self._analyze_job, "execute": self._execute_job}
+        self._tasks = []
+        for i, stage in enumerate(PIPELINE_STAGES):
+            outbox = self._queues[PIPELINE_STAGES[i + 1]] if i + 1 < len(PIPELINE_STAGES) else None
+            for n in range(max(1, self.workers[stage])):
+                self._tasks.append(loop.create_task(
+                    self._worker(stage, handlers[stage], self._queues[stage], outbox),
+                    name=f"orchestrator-{stage}-{n}"))
+        logger.info(f"Orchestrator: Pipeline started (workers={self.workers}, queue_size={self.queue_size})")
+
+    async def _worker(self, stage: str, handler, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]):
+        while True:
+            job = await inbox.get()
+            try:
+                if job.abandoned:
+                    self._finish(job)
+                    continue
+                job.clock.resume()
+                self._busy[stage] += 1
+                try:
+                    with tracer.activate(job.span):
+                        forward = await handler(job)
+                except Exception as e:
+                    self._on_error(job.symbol, e)
+                    forward = False
+                finally:
+                    self._busy[stage] -= 1
+
+                if forward and outbox is not None and not job.abandoned:
+                    if outbox.full():
+                        telemetry.record_metric("pipeline.backpressure", 1.0, {"stage": stage, "symbol": job.symbol})
+                    await outbox.put(job) # Waits for the downstream stage: this worker stops pulling new work
+                else:
+                    self._finish(job)
+            finally:
+                inbox.task_done()
+
+    async def _fetch_job(self, job: _Job) -> bool:
+        job.tick = await self._fetch(job.symbol, job.clock)
+        return job.tick is not None
+
+    async def _analyze_job(self, job: _Job) -> bool:
+        job.proposal, job.plan = self._analyze(job.symbol, job.tick, job.clock)
+        return job.plan is not None
+
+    async def _execute_job(self, job: _Job) -> bool:
+        await self._execute(job.symbol, job.proposal, job.plan, job.clock)
+        return False
+
+    def _finish(self, job: _Job):
+        if self._jobs.get(job.symbol) is job:
+            del self._jobs[job.symbol]
+        if not job.done.done():
+            job.done.set_result(job.clock.timings)
+
+    async def stop_pipeline(self):
+        """
+        Cancels the stage workers; jobs still queued are released to their callers.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in list(self._jobs.values()):
+            job.abandoned = True
+            self._finish(job)
+        self._loop = None
+
+    def pipeline_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._jobs),
+            "coalesced": self.coalesced,
+            "stages": {
+                s: {"queued": self._queues[s].qsize() if s in self._queues else 0,
+                    "busy": self._busy[s],
+                    "workers": self.workers[s]}
+                for s in PIPELINE_STAGES
+            }
+        }
+
 orchestrator = Orchestrator()
@@ -0,0 +1,280 @@
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+from asr_trading.core.metrics import metrics_registry
+
+PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _collapse(frame) -> List[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse() # Root first, as flamegraph tools expect
+    return stack
+
+class ProfileBusy(Exception):
+    pass
+
+class Profiler:
+    """
+    On-demand, time-bounded profiling of the running engine (no restart needed).
+    - "sample": a background thread snapshots every thread's stack every
+      `interval_ms` (sys._current_frames) and writes collapsed stacks
+      ("thread;frame;frame count") for flamegraph tools. Covers the API loop,
+      the cycle-scheduler thread and the SDK pool alike, at near-zero cost to them.
+    - "cprofile": deterministic cProfile of the given event loops, dumped as a
+      .pstats file. Before Python 3.12 one profiler is switched on from inside
+      each loop's own thread and the results are merged; on 3.12+ cProfile is
+      process-wide, so a single profiler covers every thread.
+    Artifacts go to cfg.PROFILE_DIR. One profile runs at a time.
+    """
+    def __init__(self, out_dir: str = None, max_seconds: float = None):
+        self.out_dir = out_dir or cfg.PROFILE_DIR
+        self.max_seconds = max_seconds or cfg.PROFILE_MAX_SECONDS
+        self._busy = threading.Lock()
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def _path(self, suffix: str) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        return os.path.join(self.out_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{suffix}")
+
+    async def run(self, duration: float = 10.0, mode: str = "sample", interval_ms: float = None,
+                  loops: Optional[Dict[str, asyncio.AbstractEventLoop]] = None,
+                  threads: Optional[List[str]] = None, top: int = 25) -> Dict[str, Any]:
+        if mode not in ("sample", "cprofile"):
+            raise ValueError(f"Profiler: Unknown mode {mode}")
+        duration = max(0.1, min(float(duration), self.max_seconds))
+        if not self._busy.acquire(blocking=False):
+            raise ProfileBusy("A profile is already running.")
+        try:
+            logger.info(f"Profiler: {mode} profile for {duration}s started.")
+            if mode == "sample":
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, self.sample, duration, interval_ms, threads, top)
+            else:
+                result = await self.profile_loops(duration, loops, top)
+            self.last_result = result
+            telemetry.record_event("profile_captured", {"mode": mode, "duration": duration, "path": result["path"]})
+            logger.info(f"Profiler: Wrote {result['path']}")
+            return result
+        finally:
+            self._busy.release()
+
+    # --- Statistical sampler ---
+    def sample(self, duration: float, interval_ms: float = None, threads: Optional[List[str]] = None, top: int = 25) -> Dict[str, Any]:
+        """
+        Blocking; run it off the loop (run() uses the default executor).
+        """
+        interval = (interval_ms or cfg.PROFILE_SAMPLE_INTERVAL_MS) / 1000.0
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        leaves: Counter = Counter()
+        samples = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, str(ident))
+                if ident == me or (threads and not any(name.startswith(p) for p in threads)):
+                    continue
+                stack = _collapse(frame)
+                stacks[";".join([name.replace(";", "_")] + stack)] += 1
+                leaves[f"{name}: {stack[-1]}"] += 1
+            samples += 1
+            time.sleep(interval)
+
+        path = self._path("sample.folded")
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return {
+            "mode": "sample",
+            "path": path,
+            "duration": duration,
+            "samples": samples,
+            "top": [{"frame": k, "samples": v} for k, v in leaves.most_common(top)]
+        }
+
+    # --- cProfile over event loops ---
+    async def profile_loops(self, duration: float, loops: Optional[Dict[str, asyncio.AbstractEventLoop]] = None, top: int = 25) -> Dict[str, Any]:
+        current = asyncio.get_running_loop()
+        loops = loops or {"main": current}
+        profiles: Dict[str, cProfile.Profile] = {}
+
+        def start(name):
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+            except ValueError as e: # Another profiler (or debugger) owns the hook
+                raise ProfileBusy(f"cProfile could not start: {e}") from e
+            profiles[name] = prof
+
+        def stop(name):
+            if name in profiles:
+                profiles[name].disable()
+
+        async def call_in(loop, fn, name):
+            if loop is current:
+                fn(name)
+                return
+            done = current.create_future()
+            def settle(error):
+                if done.done():
+                    return
+                if error is not None:
+                    done.set_exception(error)
+                else:
+                    done.set_result(None)
+            def runner():
+                error = None
+                try:
+                    fn(name)
+                except Exception as e:
+                    error = e
+                current.call_soon_threadsafe(settle, error)
+            loop.call_soon_threadsafe(runner)
+            await asyncio.wait_for(done, timeout=5)
+
+        live = {}
+        for name, loop in loops.items():
+            if loop is not None and not loop.is_closed() and all(loop is not l for l in live.values()):
+                live[name] = loop
+        if not live:
+            raise RuntimeError("Profiler: No live event loop to profile.")
+        # 3.12+ cProfile runs on sys.monitoring: one profiler per process that sees
+        # every thread (a second enable() fails). Before 3.12 it hooks only the
+        # thread that enables it, so each loop gets its own, enabled on its thread.
+        targets = {"process": current} if PROCESS_WIDE_CPROFILE else live
+        try:
+            for name, loop in targets.items():
+                await call_in(loop, start, name)
+            await asyncio.sleep(duration)
+        finally:
+            for name, loop in targets.items():
+                try:
+                    await call_in(loop, stop, name)
+                except (asyncio.TimeoutError, RuntimeError) as e:
+                    logger.warning(f"Profiler: Could not stop profiler on loop '{name}': {e}")
+
+        stats = None
+        for prof in profiles.values():
+            prof.create_stats()
+            if stats is None:
+                stats = pstats.Stats(prof)
+            else:
+                stats.add(prof)
+        path = self._path("cprofile.pstats")
+        stats.dump_stats(path)
+
+        top_rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:top]:
+            top_rows.append({"function": f"{func} ({os.path.basename(filename)}:{line})", "calls": nc,
+                             "tottime_s": round(tt, 6), "cumtime_s": round(ct, 6)})
+        return {"mode": "cprofile", "path": path, "duration": duration, "loops": list(live),
+                "scope": "process" if PROCESS_WIDE_CPROFILE else "loops", "top": top_rows}
+
+class LoopLagMonitor:
+    """
+    Detects callbacks that block an event loop.
+    A heartbeat task on the loop wakes every `interval` seconds and records how late
+    it was (asr_event_loop_lag_ms histogram). A watchdog thread notices when the
+    heartbeat has been silent for more than `threshold_ms` and snapshots the loop
+    thread's stack at that moment, i.e. the blocking call (a synchronous yfinance
+    request in a handler, say). Each stall is logged, sent to telemetry and kept in `stalls`.
+    """
+    def __init__(self, name: str = "main", threshold_ms: float = None, interval: float = None):
+        self.name = name
+        self.threshold_ms = threshold_ms or cfg.LOOP_LAG_THRESHOLD_MS
+        self.interval = interval or cfg.LOOP_LAG_INTERVAL
+        self.stalls: deque = deque(maxlen=50)
+        self.max_lag_ms = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+        self._pending: Optional[Dict[str, Any]] = None # Stall seen by the watchdog, closed by the next beat
+        self._histogram = metrics_registry.histogram("asr_event_loop_lag_ms", "Event loop heartbeat lateness (ms)", ["loop"])
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """
+        Call from inside the loop to be watched.
+        """
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._beat(), name=f"loop-lag-{self.name}")
+        self._watchdog = threading.Thread(target=self._watch, name=f"loop-lag-watchdog-{self.name}", daemon=True)
+        self._watchdog.start()
+        logger.info(f"LoopLagMonitor[{self.name}]: Watching (threshold {self.threshold_ms}ms).")
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _beat(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag_ms = max(0.0, (now - expected) * 1000.0)
+            self._last_beat = now
+            self._histogram._observe((self.name,), lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            stall, self._pending = self._pending, None
+            if stall is not None or lag_ms > self.threshold_ms:
+                self._report(stall or {"ts": time.time(), "stack": []}, lag_ms)
+
+    def _watch(self):
+        check = self.threshold_ms / 2000.0
+        while not self._stop.wait(check):
+            silent_ms = (time.perf_counter() - self._last_beat - self.interval) * 1000.0
+            if silent_ms > self.threshold_ms and self._pending is None:
+                frame = sys._current_frames().get(self._loop_thread)
+                stack = traceback.format_stack(frame)[-8:] if frame is not None else []
+                self._pending = {"ts": time.time(), "stack": [s.strip() for s in stack]}
+
+    def _report(self, stall: Dict[str, Any], lag_ms: float):
+        stall["lag_ms"] = round(lag_ms, 1)
+        stall["loop"] = self.name
+        self.stalls.append(stall)
+        where = stall["stack"][-1].splitlines()[0] if stall["stack"] else "unknown"
+        logger.warning(f"LoopLagMonitor[{self.name}]: Event loop blocked for {lag_ms:.0f}ms at {where}")
+        telemetry.record_event("event_loop_blocked", {"loop": self.name, "lag_ms": stall["lag_ms"], "where": where})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loop": self.name,
+            "running": self.is_running,
+            "threshold_ms": self.threshold_ms,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "stalls": list(self.stalls)
+        }
+
+profiler = Profiler()
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,263 @@
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from asr_trading.core.logger import logger
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Partition granularity per interval (strftime of the bar's UTC open time)
+PARTITION_FORMATS = {"1d": "%Y", "5d": "%Y", "1wk": "%Y", "1mo": "%Y", "3mo": "%Y"}
+INTRADAY_PARTITION_FORMAT = "%Y-%m"
+
+def load_history_csv(path: str) -> pd.DataFrame:
+    """
+    Loads a `data/historical/<SYM>.csv` file (yfinance layout) into a
+    lower-case OHLCV frame with a float `timestamp` column (epoch seconds, UTC).
+    """
+    df = pd.read_csv(path)
+    df.columns = [c.lower() for c in df.columns]
+    time_col = next((c for c in ("datetime", "date", "timestamp") if c in df.columns), None)
+    if time_col is None:
+        raise ValueError(f"No timestamp column in {path}")
+
+    if time_col == "timestamp" and pd.api.types.is_numeric_dtype(df[time_col]):
+        ts = df[time_col].astype(float)
+    else:
+        dt = pd.to_datetime(df[time_col], utc=True)
+        ts = (dt - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+
+    out = pd.DataFrame({
+        "timestamp": ts.to_numpy(dtype=np.float64),
+        "open": df["open"].to_numpy(dtype=np.float64),
+        "high": df["high"].to_numpy(dtype=np.float64),
+        "low": df["low"].to_numpy(dtype=np.float64),
+        "close": df["close"].to_numpy(dtype=np.float64),
+        "volume": df["volume"].fillna(0).to_numpy(dtype=np.float64),
+    })
+    return out.dropna(subset=["open", "high", "low", "close"]).reset_index(drop=True)
+
+class BarStore:
+    """
+    Columnar on-disk OHLCV store.
+    Layout: <base>/<symbol>/<interval>/<partition>/<version>/<column>.npy (float64,
+    sorted by timestamp), with <partition>/CURRENT naming the live version.
+    Partitions are calendar years for daily+ bars and months for intraday bars,
+    so range reads only open the partitions they overlap and binary-search the
+    memory-mapped timestamp column inside them.
+    A write never touches files readers may have mapped: it adds a new version
+    and switches CURRENT atomically. Superseded versions are pruned on later
+    writes (the previous one is kept for readers that just resolved CURRENT;
+    still-mapped files that cannot be removed, e.g. on Windows, are retried).
+    """
+    def __init__(self, base_path="data/bars"):
+        self.base_path = base_path
+        self._lock = threading.Lock()
+
+    # --- Layout ---
+    def _series_dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.base_path, symbol, interval)
+
+    @staticmethod
+    def _partition_format(interval: str) -> str:
+        return PARTITION_FORMATS.get(interval, INTRADAY_PARTITION_FORMAT)
+
+    @staticmethod
+    def _partition_bounds(name: str) -> Tuple[float, float]:
+        # "2021" -> [2021-01-01, 2022-01-01), "2021-03" -> [2021-03-01, 2021-04-01)
+        if len(name) == 4:
+            start = datetime(int(name), 1, 1, tzinfo=timezone.utc)
+            end = datetime(int(name) + 1, 1, 1, tzinfo=timezone.utc)
+        else:
+            y, m = int(name[:4]), int(name[5:7])
+            start = datetime(y, m, 1, tzinfo=timezone.utc)
+            end = datetime(y + m // 12, m % 12 + 1, 1, tzinfo=timezone.utc)
+        return start.timestamp(), end.timestamp()
+
+    def partitions(self, symbol: str, interval: str) -> List[str]:
+        path = self._series_dir(symbol, interval)
+        if not os.path.isdir(path):
+            return []
+        return sorted(p for p in os.listdir(path) if "." not in p)
+
+    @staticmethod
+    def _live_dir(path: str) -> Optional[str]:
+        """
+        Directory holding a partition's live columns (None if it has none yet).
+        """
+        try:
+            with open(os.path.join(path, "CURRENT")) as f:
+                return os.path.join(path, f.read().strip())
+        except FileNotFoundError:
+            # Pre-versioning layout: columns directly in the partition dir
+            return path if os.path.exists(os.path.join(path, "timestamp.npy")) else None
+
+    @staticmethod
+    def _versions(path: str) -> List[int]:
+        return sorted(int(n[1:]) for n in os.listdir(path) if n.startswith("v") and n[1:].isdigit())
+
+    def symbols(self, interval: Optional[str] = None) -> List[str]:
+        if not os.path.isdir(self.base_path):
+            return []
+        return sorted(
+            s for s in os.listdir(self.base_path)
+            if interval is None or os.path.isdir(self._series_dir(s, interval))
+        )
+
+    # --- Write ---
+    def append(self, symbol: str, interval: str, bars: pd.DataFrame) -> int:
+        """
+        Upserts bars (any-case OHLCV columns + epoch `timestamp`).
+        Existing bars with the same timestamp are replaced. Returns rows written.
+        """
+        if bars.empty:
+            return 0
+        cols = {c.lower(): c for c in bars.columns}
+        missing = [c for c in COLUMNS if c not in cols]
+        if missing:
+            raise ValueError(f"BarStore: Missing columns {missing}")
+        new = np.vstack([bars[cols[c]].to_numpy(dtype=np.float64) for c in COLUMNS])
+        new = new[:, np.argsort(new[0], kind="stable")]
+
+        fmt = self._partition_format(interval)
+        keys = pd.to_datetime(new[0], unit="s", utc=True).strftime(fmt).to_numpy()
+        with self._lock:
+            for key in pd.unique(keys):
+                self._write_partition(symbol, interval, key, new[:, keys == key])
+        logger.debug(f"BarStore: Appended {new.shape[1]} bars to {symbol}/{interval}")
+        return new.shape[1]
+
+    def _write_partition(self, symbol: str, interval: str, key: str, new: np.ndarray):
+        part = os.path.join(self._series_dir(symbol, interval), key)
+        existing = self._load_partition(part)
+        merged = new if existing is None else np.vstack([np.concatenate([existing[i], new[i]]) for i in range(len(COLUMNS))])
+        if merged.shape[1] > 1 and not (np.diff(merged[0]) > 0).all():
+            # Overlapping / out-of-order batch: keep the last write per timestamp
+            rev = merged[:, ::-1]
+            _, idx = np.unique(rev[0], return_index=True)
+            merged = rev[:, idx]
+
+        # New version dir, then switch CURRENT: readers see the old or the new
+        # columns, never half a partition, and mapped files are never replaced
+        os.makedirs(part, exist_ok=True)
+        versions = self._versions(part)
+        version = f"v{(versions[-1] if versions else 0) + 1:06d}"
+        vdir = os.path.join(part, version)
+        os.makedirs(vdir)
+        for i, col in enumerate(COLUMNS):
+            np.save(os.path.join(vdir, f"{col}.npy"), np.ascontiguousarray(merged[i]))
+        pointer = os.path.join(part, "CURRENT.tmp")
+        with open(pointer, "w") as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(part, "CURRENT"))
+        self._prune(part, int(version[1:]))
+
+    def _prune(self, part: str, live: int):
+        # Keep the live version and the one before it; also drops crashed writes
+        # and the pre-versioning column files
+        older = [v for v in self._versions(part) if v < live]
+        keep = {live, older[-1]} if older else {live}
+        for v in self._versions(part):
+            if v not in keep:
+                shutil.rmtree(os.path.join(part, f"v{v:06d}"), ignore_errors=True)
+        for c in COLUMNS:
+            legacy = os.path.join(part, f"{c}.npy")
+            if os.path.exists(legacy):
+                try:
+                    os.remove(legacy)
+                except OSError:
+                    pass # Still mapped (Windows): next write retries
+
+    # --- Read ---
+    @classmethod
+    def _load_partition(cls, path: str) -> Optional[List[np.ndarray]]:
+        for attempt in range(3):
+            live = cls._live_dir(path) if os.path.isdir(path) else None
+            if live is None:
+                return None
+            try:
+                return [np.load(os.path.join(live, f"{c}.npy"), mmap_mode="r") for c in COLUMNS]
+            except FileNotFoundError:
+                if attempt == 2: # Pruned between resolving CURRENT and opening: re-resolve
+                    raise
+
+    def read(self, symbol: str, interval: str, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Columns for bars with start <= timestamp < end (epoch seconds).
+        A range inside one partition returns read-only memory-mapped views
+        (zero-copy); spanning partitions concatenates.
+        """
+        lo = -np.inf if start is None else start
+        hi = np.inf if end is None else end
+        chunks = []
+        for name in self.partitions(symbol, interval):
+            p_start, p_end = self._partition_bounds(name)
+            if p_end <= lo or p_start >= hi:
+                continue
+            cols = self._load_partition(os.path.join(self._series_dir(symbol, interval), name))
+            ts = cols[0]
+            i = int(np.searchsorted(ts, lo, side="left")) if start is not None else 0
+            j = int(np.searchsorted(ts, hi, side="left")) if end is not None else len(ts)
+            if j > i:
+                chunks.append([c[i:j] for c in cols])
+
+        if not chunks:
+            return {c: np.empty(0) for c in COLUMNS}
+        if len(chunks) == 1:
+            return dict(zip(COLUMNS, chunks[0]))
+        return {c: np.concatenate([ch[k] for ch in chunks]) for k, c in enumerate(COLUMNS)}
+
+    def read_frame(self, symbol: str, interval: str, start: Optional[float] = None, end: Optional[float] = None) -> pd.DataFrame:
+        return pd.DataFrame(self.read(symbol, interval, start, end))
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[float]:
+        parts = self.partitions(symbol, interval)
+        if not parts:
+            return None
+        cols = self._load_partition(os.path.join(self._series_dir(symbol, interval), parts[-1]))
+        return float(cols[0][-1]) if cols is not None and len(cols[0]) else None
+
+    # --- Engines ---
+    def load_into(self, engine, symbol: str, interval: str, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Warms a FeatureEngine (ring buffer + streaming indicators) or a bare
+        WindowEngine straight from the columns (no OHLC objects).
+        """
+        window_size = getattr(engine, "window_engine", engine).window_size
+        cols = self.read(symbol, interval, start, end)
+        n = len(cols["timestamp"])
+        if n:
+            keep = slice(max(0, n - window_size), n)
+            engine.add_columns(symbol, np.vstack([cols[c][keep] for c in COLUMNS]))
+        return n
+
+    def kernels(self, symbol: str, interval: str, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        IndicatorKernels over the stored columns (memory-mapped when the range is one partition).
+        """
+        from asr_trading.analysis.kernels import IndicatorKernels
+        cols = self.read(symbol, interval, start, end)
+        return IndicatorKernels(cols["high"], cols["low"], cols["close"])
+
+    # --- CSV compatibility ---
+    def import_csv(self, path: str, symbol: Optional[str] = None, interval: str = "1d") -> int:
+        symbol = symbol or os.path.splitext(os.path.basename(path))[0]
+        return self.append(symbol, interval, load_history_csv(path))
+
+    def export_csv(self, symbol: str, interval: str, path: str, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Writes the yfinance-style layout (Date, Open, High, Low, Close, Volume).
+        """
+        df = self.read_frame(symbol, interval, start, end)
+        out = pd.DataFrame({
+            "Date": pd.to_datetime(df["timestamp"], unit="s", utc=True),
+            "Open": df["open"], "High": df["high"], "Low": df["low"],
+            "Close": df["close"], "Volume": df["volume"],
+        })
+        out.to_csv(path, index=False)
+        return len(out)
+
+bar_store = BarStore()
@@ -0,0 +1,176 @@
+import contextvars
+import functools
+import inspect
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+import numpy as np
+from asr_trading.core.config import cfg
+from asr_trading.core.metrics import metrics_registry
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    sampled: bool
+    start: float # Wall clock (for display); duration uses perf_counter
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3),
+            "attrs": self.attrs,
+            "error": self.error
+        }
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("asr_current_span", default=None)
+
+class Tracer:
+    """
+    Lightweight in-process tracing.
+    - tracer.span("name", **attrs) context manager / @tracer.trace("name") decorator
+      (sync or async). Timing is perf_counter based; the parent is the span active
+      in the current context (contextvars, so it follows asyncio tasks).
+    - Finished spans go to an in-memory ring (recent()) and per-name duration
+      windows (stats() -> p50/p95/p99), and to the asr_span_duration_ms histogram.
+    - Whole traces are sampled at the root (`sample_rate`); sampled spans are
+      exported to `export_path` through a buffered Telemetry writer.
+    """
+    def __init__(self, enabled: bool = None, sample_rate: float = None, capacity: int = None,
+                 window: int = 1024, export_path: str = None):
+        self.enabled = cfg.TRACING_ENABLED if enabled is None else enabled
+        self.sample_rate = cfg.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.export_path = export_path or cfg.TRACE_EXPORT_PATH
+        self.window = window
+        self._recent: Deque[Span] = deque(maxlen=capacity or cfg.TRACE_RING_SIZE)
+        self._durations: Dict[str, Deque[float]] = {}
+        self._exporter = None # Created on the first sampled span
+        self._histogram = metrics_registry.histogram("asr_span_duration_ms", "Traced span durations (ms)", ["span"])
+
+    # --- Spans ---
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attrs):
+        if not self.enabled:
+            yield None
+            return
+        parent = parent if parent is not None else _current.get()
+        if parent is None:
+            span = Span(name, f"{random.getrandbits(64):016x}", f"{random.getrandbits(64):016x}", None,
+                        random.random() < self.sample_rate, time.time(), attrs)
+        else:
+            span = Span(name, parent.trace_id, f"{random.getrandbits(64):016x}", parent.span_id,
+                        parent.sampled, time.time(), attrs)
+        token = _current.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - started) * 1000.0
+            _current.reset(token)
+            self._finish(span)
+
+    @contextmanager
+    def activate(self, span: Optional[Span]):
+        """
+        Makes `span` the parent for spans opened in this block (e.g. a pipeline
+        worker picking up a job that was started in another task).
+        """
+        token = _current.set(span)
+        try:
+            yield span
+        finally:
+            _current.reset(token)
+
+    def current(self) -> Optional[Span]:
+        return _current.get()
+
+    def trace(self, name: Optional[str] = None):
+        """
+        Decorator form of span(); works on plain and async functions.
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _finish(self, span: Span):
+        self._recent.append(span)
+        durations = self._durations.get(span.name)
+        if durations is None:
+            durations = self._durations.setdefault(span.name, deque(maxlen=self.window))
+        durations.append(span.duration_ms)
+        self._histogram._observe((span.name,), span.duration_ms)
+        if span.sampled:
+            self._export(span)
+
+    def _export(self, span: Span):
+        if self._exporter is None:
+            from asr_trading.core.avionics import Telemetry
+            self._exporter = Telemetry(log_path=self.export_path, bridge=False)
+        self._exporter.record_metric(span.name, round(span.duration_ms, 3), {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "error": span.error,
+            **span.attrs
+        })
+
+    # --- Queries ---
+    def stats(self, name: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Per-span-name percentiles over the last `window` spans of each name.
+        """
+        names = [name] if name is not None else sorted(self._durations)
+        out = {}
+        for n in names:
+            values = np.array(self._durations.get(n, ()))
+            if len(values):
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                out[n] = {
+                    "count": int(len(values)),
+                    "p50_ms": round(float(p50), 3),
+                    "p95_ms": round(float(p95), 3),
+                    "p99_ms": round(float(p99), 3),
+                    "max_ms": round(float(values.max()), 3)
+                }
+        return out
+
+    def recent(self, limit: int = 100, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        spans = [s for s in list(self._recent) if trace_id is None or s.trace_id == trace_id]
+        return [s.to_dict() for s in spans[-limit:]]
+
+    def reset(self):
+        self._recent.clear()
+        self._durations.clear()
+
+    def flush(self):
+        if self._exporter is not None:
+            self._exporter.flush()
+
+tracer = Tracer()
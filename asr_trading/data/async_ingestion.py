@@ -38,12 +38,12 @@ class YahooProvider(BaseProvider):
         super().__init__("Yahoo")
 
     async def _fetch(self, symbol: str) -> float:
-        # Simulate Async wrapper for yfinance
-        # In prod: loop.run_in_executor
-        import yfinance as yf
-        return await asyncio.to_thread(self._sync_fetch, symbol)
+        # yfinance is blocking: run it on the shared SDK pool
+        from asr_trading.core.io_pool import io_pool
+        return await io_pool.run_blocking(self._sync_fetch, symbol)
 
     def _sync_fetch(self, symbol):
+        import yfinance as yf
         ticker = yf.Ticker(symbol)
         # Fast history - Changed to 1m for Phase 17.1 Audit
         hist = ticker.history(period="1d", interval="1m")
@@ -0,0 +1,183 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from asr_trading.data.canonical import Tick, OHLC, VOLUME_BAR, VOLUME_NONE, VOLUME_SESSION
+from asr_trading.core.logger import logger
+from asr_trading.core.avionics import telemetry
+
+INTERVAL_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600}
+
+@dataclass
+class _OpenBar:
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    open_ts: float # Timestamp of the tick that set `open`
+    close_ts: float # Timestamp of the tick that set `close`
+    ticks: int = 1
+
+    def add(self, ts: float, price: float, volume: float):
+        if ts < self.open_ts:
+            self.open, self.open_ts = price, ts
+        if ts >= self.close_ts:
+            self.close, self.close_ts = price, ts
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.volume += volume
+        self.ticks += 1
+
+class BarAggregator:
+    """
+    Tick -> OHLC candles per symbol at several intervals (UTC-aligned buckets).
+    - A bucket stays open until the symbol's watermark (newest tick time, or the
+      wall clock via flush()) passes its end + `grace`, so late and out-of-order
+      ticks inside the grace window still land in the right candle. Open/close
+      follow tick timestamps, not arrival order.
+    - Ticks for buckets that already closed are dropped (per interval) and counted.
+    - Only CLOSED bars are emitted to listeners; empty buckets produce no bar.
+    - Volume follows Tick.volume_kind, tracked per (symbol, source): running
+      totals (session / stream) add their increase (a drop means the counter
+      restarted; a session total's first value only sets the baseline), bar
+      volume adds its growth within the same provider bar and all of a new one,
+      and "none" adds nothing.
+    - Thread-safe: pushed ticks (bus, API loop) and the scan (cycle-scheduler
+      thread) feed it concurrently.
+    """
+    def __init__(self, intervals: Iterable[str] = ("1m", "5m", "15m", "1h"), grace: float = 2.0):
+        unknown = [i for i in intervals if i not in INTERVAL_SECONDS]
+        if unknown:
+            raise ValueError(f"BarAggregator: Unsupported intervals {unknown}")
+        self.intervals = tuple(intervals)
+        self.grace = grace
+        self._open: Dict[Tuple[str, str], Dict[float, _OpenBar]] = {}
+        self._closed_until: Dict[Tuple[str, str], float] = {} # End of the newest emitted bucket
+        self._watermark: Dict[str, float] = {}
+        self._last_volume: Dict[Tuple[str, str], Tuple[Optional[float], int]] = {} # (symbol, source) -> (bar, volume)
+        self._last_key: Dict[str, tuple] = {}
+        self._listeners: List[tuple] = []
+        self._lock = threading.RLock() # Reentrant: listeners run under it
+        self.late_dropped = 0
+        self.bars_emitted = 0
+
+    def add_listener(self, callback: Callable[[OHLC], None], intervals: Optional[Iterable[str]] = None):
+        self._listeners.append((callback, set(intervals) if intervals is not None else None))
+
+    def attach_bus(self, bus):
+        bus.add_listener(self.on_tick)
+
+    def _volume_delta(self, tick: Tick) -> float:
+        kind = tick.volume_kind
+        if kind == VOLUME_NONE:
+            return 0.0
+        key = (tick.symbol, tick.source)
+        prev = self._last_volume.get(key)
+        # Out-of-order ticks carry an older count: price only. Bar volume is stamped
+        # at the bar's open (behind other feeds), so only an older bar is out of order.
+        if kind == VOLUME_BAR:
+            if prev is not None and prev[0] is not None and tick.timestamp < prev[0]:
+                return 0.0
+        elif tick.timestamp < self._watermark.get(tick.symbol, float("-inf")):
+            return 0.0
+        period = tick.timestamp if kind == VOLUME_BAR else None
+        self._last_volume[key] = (period, tick.volume)
+        if prev is None or prev[0] != period:
+            return 0.0 if kind == VOLUME_SESSION else float(tick.volume)
+        if tick.volume >= prev[1]:
+            return float(tick.volume - prev[1])
+        return 0.0 if kind == VOLUME_BAR else float(tick.volume) # Bar revised down / counter restarted
+
+    def on_tick(self, tick: Tick) -> List[OHLC]:
+        """
+        Adds one tick and returns the bars it closed (oldest first, all intervals).
+        """
+        with self._lock:
+            return self._on_tick(tick)
+
+    def _on_tick(self, tick: Tick) -> List[OHLC]:
+        if tick.last <= 0:
+            return []
+        # The same tick can arrive via the bus and via a poll of the streaming provider
+        key = (tick.source, tick.sequence, tick.timestamp, tick.volume)
+        if self._last_key.get(tick.symbol) == key:
+            return []
+        self._last_key[tick.symbol] = key
+
+        symbol, ts = tick.symbol, tick.timestamp
+        volume = self._volume_delta(tick)
+        late = False
+        for interval in self.intervals:
+            series = (symbol, interval)
+            step = INTERVAL_SECONDS[interval]
+            start = ts - ts % step
+            if start + step <= self._closed_until.get(series, float("-inf")):
+                late = True
+                continue
+            bars = self._open.setdefault(series, {})
+            bar = bars.get(start)
+            if bar is None:
+                bars[start] = _OpenBar(start, tick.last, tick.last, tick.last, tick.last, volume, ts, ts)
+            else:
+                bar.add(ts, tick.last, volume)
+
+        if late:
+            self.late_dropped += 1
+            logger.debug(f"BarAggregator: Late tick for {symbol} @ {ts} dropped from closed bars")
+            telemetry.record_event("bar_late_tick_dropped", {"symbol": symbol, "lag_sec": round(self._watermark.get(symbol, ts) - ts, 3)})
+        if ts > self._watermark.get(symbol, float("-inf")):
+            self._watermark[symbol] = ts
+        return self._close_due(symbol, self._watermark[symbol])
+
+    def flush(self, now: Optional[float] = None) -> List[OHLC]:
+        """
+        Closes buckets that ended (plus grace) by wall-clock `now`, for symbols
+        that have gone quiet. Call periodically.
+        """
+        now = time.time() if now is None else now
+        closed = []
+        with self._lock:
+            for symbol in list(self._watermark):
+                closed.extend(self._close_due(symbol, now))
+        return closed
+
+    def _close_due(self, symbol: str, watermark: float) -> List[OHLC]:
+        closed = []
+        for interval in self.intervals:
+            series = (symbol, interval)
+            bars = self._open.get(series)
+            if not bars:
+                continue
+            step = INTERVAL_SECONDS[interval]
+            for start in sorted(bars):
+                if start + step + self.grace > watermark:
+                    break
+                bar = bars.pop(start)
+                self._closed_until[series] = start + step
+                closed.append(OHLC(symbol, start, bar.open, bar.high, bar.low, bar.close, int(bar.volume), interval))
+        for ohlc in closed:
+            self._emit(ohlc)
+        return closed
+
+    def _emit(self, ohlc: OHLC):
+        self.bars_emitted += 1
+        for callback, intervals in self._listeners:
+            if intervals is None or ohlc.interval in intervals:
+                try:
+                    callback(ohlc)
+                except Exception as e:
+                    logger.error(f"BarAggregator: Listener failed on {ohlc.symbol} {ohlc.interval}: {e}")
+
+    def open_bar(self, symbol: str, interval: str) -> Optional[OHLC]:
+        """
+        The newest still-forming candle (for display; never fed to features).
+        """
+        bars = self._open.get((symbol, interval))
+        if not bars:
+            return None
+        bar = bars[max(bars)]
+        return OHLC(symbol, bar.start, bar.open, bar.high, bar.low, bar.close, int(bar.volume), interval)
+
+bar_aggregator = BarAggregator()
@@ -3,6 +3,12 @@ from typing import Optional
 from decimal import Decimal
 import time
 
+# What Tick.volume counts (providers differ)
+VOLUME_SESSION = "session" # Running total for the trading session (quote endpoints, snapshots)
+VOLUME_STREAM = "stream"   # Running total the feed itself started at 0 (websocket trade counter)
+VOLUME_BAR = "bar"         # Volume so far of the 1m bar that opens at Tick.timestamp
+VOLUME_NONE = "none"       # Provider sends no volume
+
 @dataclass(frozen=True)
 class Tick:
     """
@@ -17,6 +23,7 @@ class Tick:
     volume: int
     source: str       # "FINNHUB", "ALPHA_VANTAGE", "TWELVE_DATA"
     sequence: int     # Monotonically increasing ID from source (or generated)
+    volume_kind: str = VOLUME_SESSION
     
     # Metadata for tracing
     received_at: float = field(default_factory=time.time)
@@ -1,11 +1,15 @@
 import abc
+import asyncio
+import threading
 import time
 from typing import List, Optional, Dict
 from asr_trading.data.canonical import Tick
 from asr_trading.data.normalizer import normalizer
 from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
 from asr_trading.core.avionics import avionics_monitor, telemetry, CircuitBreaker
 from asr_trading.core.auditor import Auditor
+from asr_trading.core.tracing import tracer
 
 class FeedProvider(abc.ABC):
     @abc.abstractmethod
@@ -20,6 +24,23 @@ class FeedProvider(abc.ABC):
     async def connect(self):
         pass
 
+    # Largest symbol list one get_latest_ticks call may receive
+    max_batch_size: int = 1
+
+    async def get_latest_ticks(self, symbols: List[str]) -> Dict[str, Tick]:
+        """
+        Optional batch quote. Returns {symbol: Tick}; symbols without data are omitted.
+        Default: one get_latest_tick per symbol, concurrently.
+        """
+        results = await asyncio.gather(*(self.get_latest_tick(s) for s in symbols), return_exceptions=True)
+        ticks = {}
+        for symbol, tick in zip(symbols, results):
+            if isinstance(tick, Exception):
+                logger.warning(f"{self.get_name()}: {symbol} failed in batch: {tick}")
+            elif tick is not None:
+                ticks[symbol] = tick
+        return ticks
+
 class FeedManager:
     """
     Orchestrates data ingestion with Triple Redundancy.
@@ -30,7 +51,26 @@ class FeedManager:
         self.secondary: Optional[FeedProvider] = None
         self.tertiary: Optional[FeedProvider] = None
         self.local_cache_source: Dict[str, Tick] = {} 
+        self._cache_lock = threading.Lock() # Bus ticks (main loop) and scan fetches (scheduler thread)
         self.active_source = "PRIMARY"
+        self.stale_threshold = 30.0 # Seconds
+        # Hedged requests (off = strict sequential failover)
+        self.hedge_mode = cfg.FEED_HEDGE_MODE
+        self.hedge_delay = cfg.FEED_HEDGE_DELAY # Seconds to wait on PRIMARY before firing the backups
+        self.hedge_timeout = cfg.FEED_HEDGE_TIMEOUT # Hard cap for one hedged fetch
+        # Quorum: collect N valid arrivals and let the Normalizer pick the median
+        self.quorum_mode = cfg.FEED_QUORUM
+        self.quorum_size = cfg.FEED_QUORUM_SIZE
+        self.quorum_timeout = cfg.FEED_QUORUM_TIMEOUT
+
+    def configure_hedging(self, enabled: bool = True, hedge_delay: float = None, quorum: bool = None,
+                          quorum_size: int = None, quorum_timeout: float = None):
+        self.hedge_mode = enabled
+        if hedge_delay is not None: self.hedge_delay = hedge_delay
+        if quorum is not None: self.quorum_mode = quorum
+        if quorum_size is not None: self.quorum_size = quorum_size
+        if quorum_timeout is not None: self.quorum_timeout = quorum_timeout
+        logger.info(f"FeedManager: Hedging={'ON' if enabled else 'OFF'} (delay={self.hedge_delay}s, quorum={self.quorum_mode}/{self.quorum_size})")
 
     def register_provider(self, role: str, provider: FeedProvider):
         if role == "PRIMARY":
@@ -43,68 +83,201 @@ class FeedManager:
         avionics_monitor.register_service(f"feed_{role.lower()}_{provider.get_name()}")
         logger.info(f"FeedManager: Registered {role} provider: {provider.get_name()}")
 
+    def attach_bus(self, bus):
+        """
+        Keeps the hot cache current from pushed ticks (websocket feeds), so an
+        outage serves the last streamed price instead of the last polled one.
+        """
+        bus.add_listener(self._on_bus_tick)
+
+    def _on_bus_tick(self, tick: Tick):
+        if tick.is_valid() and not tick.is_stale(threshold_sec=self.stale_threshold):
+            self._cache_tick(tick)
+
+    def _cache_tick(self, tick: Tick):
+        """
+        Newest wins: a poll that started before a streamed tick arrived must not overwrite it.
+        """
+        with self._cache_lock:
+            cached = self.local_cache_source.get(tick.symbol)
+            if cached is None or tick.timestamp >= cached.timestamp:
+                self.local_cache_source[tick.symbol] = tick
+
+    def _accept(self, role: str, provider: FeedProvider, tick: Optional[Tick], symbol: str) -> bool:
+        """
+        Full acceptance checks for one provider tick (raises on audit failure).
+        """
+        if tick and tick.is_valid():
+            if tick.is_stale(threshold_sec=self.stale_threshold):
+                logger.warning(f"{role} Feed ({provider.get_name()}) STALE data (Age > {self.stale_threshold:.0f}s). Rejecting.")
+                telemetry.record_event("feed_stale_rejected", {"provider": provider.get_name(), "symbol": symbol})
+                return False
+
+            # 17.2 Zero-Discrepancy Check
+            Auditor.audit_tick_integrity(tick)
+
+            avionics_monitor.heartbeat(f"feed_{role.lower()}_{provider.get_name()}")
+            return True
+        elif tick and not tick.is_valid():
+            logger.warning(f"{role} Feed ({provider.get_name()}) returned CORRUPT data. Rejecting.")
+            telemetry.record_event("feed_corruption_rejected", {"provider": provider.get_name(), "symbol": symbol})
+        return False
+
+    async def _fetch_validated(self, role: str, provider: FeedProvider, symbol: str) -> Optional[Tick]:
+        """
+        One provider call + the full acceptance checks. Returns None if rejected.
+        """
+        try:
+            tick = await provider.get_latest_tick(symbol)
+            if self._accept(role, provider, tick, symbol):
+                return tick
+        except Exception as e:
+            logger.warning(f"{role} Feed ({provider.get_name()}) Failed: {e}")
+            telemetry.record_event("feed_failover", {"failed": role, "symbol": symbol})
+        return None
+
+    def _providers(self) -> List[tuple]:
+        return [
+            (role, provider) for role, provider in (
+                ("PRIMARY", self.primary),
+                ("SECONDARY", self.secondary),
+                ("TERTIARY", self.tertiary)
+            ) if provider
+        ]
+
+    def _from_cache(self, symbol: str) -> Optional[Tick]:
+        tick = self.local_cache_source.get(symbol)
+        if tick:
+            # 17.1 Audit Fix: Do not serve ancient data
+            if tick.is_stale(threshold_sec=300.0): # 5 Minute hard limit for cache
+                logger.critical(f"FeedManager: Cache for {symbol} is expired (>5m). Returning None.")
+                return None
+                
+            logger.warning(f"CRITICAL: Serving CACHED data for {symbol}. Market data outage!")
+            telemetry.record_event("feed_outage_cache_serve", {"symbol": symbol})
+            # In vNext, we mark this tick as DEGRADED validity
+        return tick
+
     @CircuitBreaker(name="feed_manager_fetch")
+    @tracer.trace("feed.get_tick")
     async def get_tick(self, symbol: str) -> Optional[Tick]:
         """
         Fetches tick with automatic failover: Primary -> Secondary -> Tertiary -> Local Cache.
+        In hedge mode the backups race the primary after `hedge_delay`.
         """
         tick = None
-        providers = [
-            ("PRIMARY", self.primary),
-            ("SECONDARY", self.secondary),
-            ("TERTIARY", self.tertiary)
-        ]
+        providers = self._providers()
+
+        if (self.hedge_mode or self.quorum_mode) and providers: # Quorum needs the concurrent fetch
+            tick = await self._get_tick_hedged(symbol, providers)
+        else:
+            # Dynamic Failover Loop (priority 1 to 3)
+            for role, provider in providers:
+                tick = await self._fetch_validated(role, provider, symbol)
+                if tick:
+                    self.active_source = role
+                    break
 
-        # Dynamic Failover Loop
-        for role, provider in providers:
-            # Skip if we are locked to a lower priority (unless auto-recovery logic resets active_source -- todo)
-            # For "Jumbo Jet" redundancy, we generally try the highest priority that is healthy
-            # OR we stick to the last working one. Let's try "Try Active, then Fallback".
-            
-            # Simple priority logic: Always try Primary first unless CB is open (handled by specific service CBs ideally)
-            # Here we iterate priority 1 to 3. 
-            
-            if provider:
-                try:
-                    # In a real system, we'd check CircuitBreaker state before calling
-                    tick = await provider.get_latest_tick(symbol)
-                    if tick and tick.is_valid():
-                        if tick.is_stale(threshold_sec=30.0): # Configurable threshold
-                             logger.warning(f"{role} Feed ({provider.get_name()}) STALE data (Age > 30s). Rejecting.")
-                             telemetry.record_event("feed_stale_rejected", {"provider": provider.get_name(), "symbol": symbol})
-                             continue
-
-                             telemetry.record_event("feed_stale_rejected", {"provider": provider.get_name(), "symbol": symbol})
-                             continue
-                        
-                        # 17.2 Zero-Discrepancy Check
-                        Auditor.audit_tick_integrity(tick)
-
-                        avionics_monitor.heartbeat(f"feed_{role.lower()}_{provider.get_name()}")
-                        self.local_cache_source[symbol] = tick # Update Hot Cache
-                        return tick
-                    elif tick and not tick.is_valid():
-                        logger.warning(f"{role} Feed ({provider.get_name()}) returned CORRUPT data. Rejecting.")
-                        telemetry.record_event("feed_corruption_rejected", {"provider": provider.get_name(), "symbol": symbol})
-
-                except Exception as e:
-                    logger.warning(f"{role} Feed ({provider.get_name()}) Failed: {e}")
-                    telemetry.record_event("feed_failover", {"failed": role, "symbol": symbol})
-                    continue # Try next provider
+        if tick is not None:
+            self._cache_tick(tick) # Update Hot Cache
+            return tick
 
         # 4. Fallback to Cache (Replay/Stale) - HARDENED
-        if tick is None:
-            tick = self.local_cache_source.get(symbol)
-            if tick:
-                # 17.1 Audit Fix: Do not serve ancient data
-                if tick.is_stale(threshold_sec=300.0): # 5 Minute hard limit for cache
-                    logger.critical(f"FeedManager: Cache for {symbol} is expired (>5m). Returning None.")
-                    return None
-                    
-                logger.warning(f"CRITICAL: Serving CACHED data for {symbol}. Market data outage!")
-                telemetry.record_event("feed_outage_cache_serve", {"symbol": symbol})
-                # In vNext, we mark this tick as DEGRADED validity
-        
+        return self._from_cache(symbol)
+
+    async def get_ticks(self, symbols: List[str]) -> Dict[str, Optional[Tick]]:
+        """
+        Bulk version of get_tick. Each provider gets the still-missing symbols
+        in chunks of its `max_batch_size`; only symbols that came back missing
+        or rejected fail over to the next provider, then to the cache.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        result: Dict[str, Optional[Tick]] = {}
+        missing = symbols
+
+        for role, provider in self._providers():
+            if not missing:
+                break
+            size = max(1, provider.max_batch_size)
+            chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+            replies = await asyncio.gather(*(provider.get_latest_ticks(c) for c in chunks), return_exceptions=True)
+
+            for chunk, reply in zip(chunks, replies):
+                if isinstance(reply, Exception):
+                    logger.warning(f"{role} Feed ({provider.get_name()}) batch of {len(chunk)} Failed: {reply}")
+                    telemetry.record_event("feed_failover", {"failed": role, "symbols": len(chunk)})
+                    continue
+                for symbol in chunk:
+                    tick = reply.get(symbol)
+                    try:
+                        if self._accept(role, provider, tick, symbol):
+                            result[symbol] = tick
+                            self._cache_tick(tick)
+                    except Exception as e:
+                        logger.warning(f"{role} Feed ({provider.get_name()}) rejected {symbol}: {e}")
+
+            missing = [s for s in missing if s not in result]
+            if missing:
+                logger.debug(f"FeedManager: {len(missing)} symbols missing after {role}")
+
+        for symbol in missing:
+            result[symbol] = self._from_cache(symbol)
+        return {s: result[s] for s in symbols}
+
+    async def _get_tick_hedged(self, symbol: str, providers) -> Optional[Tick]:
+        """
+        Fires PRIMARY, then the backups concurrently once `hedge_delay` passes
+        (or PRIMARY fails early). First accepted tick wins and the rest are
+        cancelled; in quorum mode arrivals are cross-validated instead.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        want = self.quorum_size if self.quorum_mode else 1
+        deadline = start + (self.quorum_timeout if self.quorum_mode else self.hedge_timeout)
+
+        role_of: Dict[asyncio.Task, str] = {}
+        def launch(role, provider):
+            task = asyncio.create_task(self._fetch_validated(role, provider, symbol))
+            role_of[task] = role
+            return task
+
+        pending = {launch(*providers[0])}
+        hedged = len(providers) == 1
+        arrivals: List[tuple] = []
+        try:
+            while pending:
+                now = loop.time()
+                wake = deadline if hedged else min(deadline, start + self.hedge_delay)
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, wake - now), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tick = task.result()
+                    if tick:
+                        arrivals.append((role_of[task], tick))
+                if len(arrivals) >= want:
+                    break
+                if not hedged and (not done or not pending):
+                    # Primary is slow (or already failed): race the backups
+                    hedged = True
+                    telemetry.record_event("feed_hedge_fired", {"symbol": symbol, "after_ms": round((loop.time() - start) * 1000, 1)})
+                    pending |= {launch(role, provider) for role, provider in providers[1:]}
+                elif loop.time() >= deadline:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let the losers unwind (close their requests) and retrieve their errors
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if not arrivals:
+            return None
+        if self.quorum_mode:
+            return normalizer.cross_validate([t for _, t in arrivals])
+
+        role, tick = arrivals[0]
+        if role != "PRIMARY":
+            telemetry.record_event("feed_hedge_win", {"symbol": symbol, "winner": role})
+        self.active_source = role
         return tick
 
 feed_manager = FeedManager()
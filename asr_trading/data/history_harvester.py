@@ -0,0 +1,175 @@
+import abc
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any
+import pandas as pd
+from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+from asr_trading.core.storage.bar_store import bar_store, BarStore
+
+# Try importing real SDKs
+try:
+    import yfinance as yf
+    HAS_YF = True
+except ImportError:
+    HAS_YF = False
+
+try:
+    from polygon import RESTClient
+    HAS_POLYGON = True
+except ImportError:
+    HAS_POLYGON = False
+
+class TokenBucket:
+    """
+    Async token bucket: `rate_per_min` sustained, `burst` back-to-back.
+    """
+    def __init__(self, rate_per_min: float, burst: int = 1):
+        self.rate = rate_per_min / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # Lock keeps waiters FIFO so one symbol can't starve the others
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+class HistorySource(abc.ABC):
+    """
+    Blocking history fetcher for one provider.
+    `fetch_bars` returns an OHLCV frame with an epoch `timestamp` column.
+    """
+    name = "BASE"
+
+    @abc.abstractmethod
+    def fetch_bars(self, symbol: str, interval: str, start: datetime) -> pd.DataFrame:
+        pass
+
+class YahooHistorySource(HistorySource):
+    name = "YAHOO_FINANCE"
+
+    def fetch_bars(self, symbol: str, interval: str, start: datetime) -> pd.DataFrame:
+        if not HAS_YF:
+            raise RuntimeError("yfinance not installed")
+        df = yf.Ticker(symbol).history(start=start, interval=interval)
+        if df.empty:
+            return pd.DataFrame()
+        idx = df.index.tz_localize("UTC") if df.index.tz is None else df.index.tz_convert("UTC")
+        return pd.DataFrame({
+            "timestamp": (idx - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1),
+            "open": df["Open"].to_numpy(), "high": df["High"].to_numpy(),
+            "low": df["Low"].to_numpy(), "close": df["Close"].to_numpy(),
+            "volume": df["Volume"].to_numpy(),
+        })
+
+class PolygonHistorySource(HistorySource):
+    name = "POLYGON_IO"
+    TIMESPANS = {"1m": (1, "minute"), "5m": (5, "minute"), "15m": (15, "minute"), "1h": (1, "hour"), "1d": (1, "day")}
+
+    def __init__(self):
+        self.client = RESTClient(cfg.POLYGON_API_KEY) if HAS_POLYGON and cfg.POLYGON_API_KEY else None
+
+    def fetch_bars(self, symbol: str, interval: str, start: datetime) -> pd.DataFrame:
+        if self.client is None:
+            raise RuntimeError("Polygon client not configured")
+        mult, span = self.TIMESPANS[interval]
+        aggs = list(self.client.list_aggs(symbol, mult, span, start.strftime("%Y-%m-%d"),
+                                          datetime.now(timezone.utc).strftime("%Y-%m-%d"), limit=50000))
+        return pd.DataFrame({
+            "timestamp": [a.timestamp / 1000.0 for a in aggs],
+            "open": [a.open for a in aggs], "high": [a.high for a in aggs],
+            "low": [a.low for a in aggs], "close": [a.close for a in aggs],
+            "volume": [a.volume or 0 for a in aggs],
+        })
+
+class HistoryHarvester:
+    """
+    Concurrent history download into the BarStore.
+    - Blocking SDK calls run on a bounded thread pool.
+    - Every provider call first takes a token from that provider's bucket.
+    - Incremental: only bars at/after the last stored bar are requested
+      (the last bar is refetched so a partial session gets completed).
+    - Retries with exponential backoff + jitter, then fails over to the next source.
+    """
+    def __init__(self, sources: Optional[List[HistorySource]] = None, store: BarStore = None,
+                 max_workers: int = 4, retries: int = 3, backoff: float = 1.0,
+                 rate_limits: Optional[Dict[str, tuple]] = None):
+        self.sources = sources if sources is not None else [YahooHistorySource(), PolygonHistorySource()]
+        self.store = store or bar_store
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        limits = rate_limits or cfg.PROVIDER_RATE_LIMITS
+        self.buckets: Dict[str, TokenBucket] = {
+            s.name: TokenBucket(*limits.get(s.name, (60, 1))) for s in self.sources
+        }
+
+    async def harvest(self, symbols: List[str], interval: str = "1d", lookback_days: int = 5 * 365) -> Dict[str, Any]:
+        """
+        Returns {symbol: rows_written | "ERROR: ..."}.
+        """
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="harvest")
+        sem = asyncio.Semaphore(self.max_workers)
+        try:
+            results = await asyncio.gather(*(
+                self._harvest_symbol(symbol, interval, lookback_days, executor, sem) for symbol in symbols
+            ))
+        finally:
+            executor.shutdown(wait=False)
+        summary = dict(zip(symbols, results))
+        ok = sum(1 for r in results if isinstance(r, int))
+        logger.info(f"Harvester: {ok}/{len(symbols)} symbols updated in {time.perf_counter() - started:.1f}s")
+        return summary
+
+    async def _harvest_symbol(self, symbol: str, interval: str, lookback_days: int, executor, sem):
+        last = self.store.last_timestamp(symbol, interval)
+        if last is not None:
+            start = datetime.fromtimestamp(last, tz=timezone.utc)
+        else:
+            start = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+
+        async with sem:
+            errors = []
+            for source in self.sources:
+                try:
+                    df = await self._fetch_with_retry(source, symbol, interval, start, executor)
+                except Exception as e:
+                    errors.append(f"{source.name}: {e}")
+                    continue
+                if df.empty:
+                    return 0
+                df = df[df["timestamp"] >= start.timestamp()]
+                return self.store.append(symbol, interval, df)
+
+        logger.error(f"Harvester: All sources failed for {symbol}: {errors}")
+        telemetry.record_event("history_harvest_failed", {"symbol": symbol, "errors": errors})
+        return f"ERROR: {errors}"
+
+    async def _fetch_with_retry(self, source: HistorySource, symbol: str, interval: str, start: datetime, executor) -> pd.DataFrame:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            await self.buckets[source.name].acquire()
+            try:
+                return await loop.run_in_executor(executor, source.fetch_bars, symbol, interval, start)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                logger.warning(f"Harvester: {source.name} {symbol} attempt {attempt + 1} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
@@ -17,21 +17,29 @@ class DataProvider:
 class YFinanceProvider(DataProvider):
     def get_latest_price(self, symbol: str) -> float:
         try:
-            ticker = yf.Ticker(symbol)
-            # Fast way to get latest price
-            data = ticker.history(period="1d")
-            if not data.empty:
-                return data['Close'].iloc[-1]
-            return 0.0
+            from asr_trading.data.quote_cache import quote_cache
+            price = quote_cache.last_price(symbol)
+            return price if price is not None else 0.0
         except Exception as e:
             logger.error(f"YFinance Get Price Error for {symbol}: {e}")
             return 0.0
 
     def get_historical_data(self, symbol: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
         try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=interval)
-            return df
+            # Shared TTL cache: repeated on-demand checks of a symbol reuse one download
+            from asr_trading.data.quote_cache import quote_cache
+            return quote_cache.history(symbol, period=period, interval=interval)
+        except Exception as e:
+            logger.error(f"YFinance History Error for {symbol}: {e}")
+            return pd.DataFrame()
+
+    async def get_historical_data_async(self, symbol: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        """
+        For callers on the event loop (API handlers, bot, CLI).
+        """
+        try:
+            from asr_trading.data.quote_cache import quote_cache
+            return await quote_cache.history_async(symbol, period=period, interval=interval)
         except Exception as e:
             logger.error(f"YFinance History Error for {symbol}: {e}")
             return pd.DataFrame()
@@ -51,4 +59,7 @@ class DataManager:
     def get_history(self, symbol: str, period: str="1mo", interval: str="1d") -> pd.DataFrame:
         return self.primary_provider.get_historical_data(symbol, period, interval)
 
+    async def get_history_async(self, symbol: str, period: str="1mo", interval: str="1d") -> pd.DataFrame:
+        return await self.primary_provider.get_historical_data_async(symbol, period, interval)
+
 data_manager = DataManager()
@@ -1,36 +1,32 @@
-import aiohttp
 import time
 from typing import Optional
 from asr_trading.data.feed_manager import FeedProvider
 from asr_trading.data.canonical import Tick
 from asr_trading.core.security import SecretsManager
 from asr_trading.core.logger import logger
+from asr_trading.core.io_pool import io_pool
 
 class AlphaVantageProvider(FeedProvider):
     def __init__(self):
         self.api_key = SecretsManager.get_secret("ALPHAVANTAGE_API_KEY", required=False)
         self.base_url = "https://www.alphavantage.co/query"
-        self.session: Optional[aiohttp.ClientSession] = None
 
     def get_name(self) -> str:
         return "ALPHA_VANTAGE"
 
     async def connect(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        # HTTP goes through the shared pooled session (core/io_pool.py)
+        io_pool.session()
 
     async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
         if not self.api_key:
              self.api_key = SecretsManager.get_secret("ALPHAVANTAGE_API_KEY", required=True)
 
-        if not self.session:
-            await self.connect()
-
         # Alpha Vantage GLOBAL_QUOTE
         url = f"{self.base_url}?function=GLOBAL_QUOTE&symbol={symbol}&apikey={self.api_key}"
         
         try:
-            async with self.session.get(url) as resp:
+            async with io_pool.session().get(url) as resp:
                 if resp.status != 200:
                     logger.error(f"AV API Error: {resp.status}")
                     return None
@@ -58,5 +54,5 @@ class AlphaVantageProvider(FeedProvider):
             raise e
 
     async def close(self):
-        if self.session:
-            await self.session.close()
+        # Shared session: closed once by io_pool.close() on shutdown
+        pass
@@ -1,71 +1,258 @@
-from typing import Optional
+import asyncio
+import json
+from typing import Optional, List, Dict, Iterable
 from asr_trading.data.feed_manager import FeedProvider
-from asr_trading.data.canonical import Tick
+from asr_trading.data.canonical import Tick, VOLUME_STREAM
+from asr_trading.data.tick_bus import tick_bus, TickBus
 from asr_trading.core.logger import logger
 from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+from asr_trading.core.io_pool import io_pool
 import time
 
 # Try importing real SDK, fallback if not installed (for robustness)
 try:
-    from polygon import RESTClient, WebSocketClient
-    from polygon.websocket.models import WebsiteMessage, WebSocketMessage
+    from polygon import RESTClient
     HAS_SDK = True
 except ImportError:
     HAS_SDK = False
 
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+class PolygonStream:
+    """
+    Websocket consumer for Polygon's stocks cluster.
+    Decodes trades (T) and quotes (Q) into canonical Ticks and publishes them on the TickBus.
+    - Trade ticks carry the latest quote as bid/ask and the volume traded since the
+      stream started (VOLUME_STREAM; kept across reconnects).
+    - Quote ticks carry the last trade price (or the mid before the first trade).
+    Reconnects with exponential backoff and re-subscribes; auth failure stops the stream.
+    """
+    def __init__(self, api_key: str, symbols: Iterable[str] = (), bus: Optional[TickBus] = None,
+                 url: Optional[str] = None, channels: Iterable[str] = ("T", "Q"),
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.api_key = api_key
+        self.symbols = set(symbols)
+        self.bus = bus or tick_bus
+        self.url = url or cfg.POLYGON_WS_URL
+        self.channels = tuple(channels)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.messages = 0
+        self.reconnects = 0
+        self._quotes: Dict[str, tuple] = {} # symbol -> (bid, ask)
+        self._last: Dict[str, float] = {}
+        self._volume: Dict[str, int] = {}
+        self._seq = 0
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stopped = False
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        self._stopped = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self.connected = False
+
+    async def subscribe(self, symbols: Iterable[str]):
+        new = set(symbols) - self.symbols
+        self.symbols |= new
+        if new and self._ws is not None and self.connected:
+            await self._ws.send_str(json.dumps({"action": "subscribe", "params": self._params(new)}))
+
+    def _params(self, symbols: Iterable[str]) -> str:
+        return ",".join(f"{ch}.{s}" for s in sorted(symbols) for ch in self.channels)
+
+    async def run(self):
+        if not HAS_AIOHTTP:
+            logger.error("PolygonStream: aiohttp not installed. Streaming disabled.")
+            return
+        delay = self.reconnect_delay
+        # Own session: a long-lived socket must not inherit the pooled request timeout
+        async with aiohttp.ClientSession() as session:
+            while not self._stopped:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30) as ws:
+                        self._ws = ws
+                        await self._handshake(ws)
+                        delay = self.reconnect_delay
+                        logger.info(f"PolygonStream: Streaming {len(self.symbols)} symbols from {self.url}")
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._handle(json.loads(msg.data))
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                except PermissionError as e:
+                    logger.critical(f"PolygonStream: {e}. Stopping stream.")
+                    telemetry.record_event("polygon_ws_auth_failed", {"url": self.url})
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"PolygonStream: Connection error: {e}")
+                finally:
+                    self._ws = None
+                    self.connected = False
+
+                if self._stopped:
+                    break
+                self.reconnects += 1
+                telemetry.record_event("polygon_ws_reconnect", {"attempt": self.reconnects, "delay": delay})
+                logger.warning(f"PolygonStream: Disconnected. Reconnecting in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _handshake(self, ws):
+        await ws.send_str(json.dumps({"action": "auth", "params": self.api_key}))
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            for ev in json.loads(msg.data):
+                if ev.get("ev") != "status":
+                    continue
+                if ev.get("status") == "auth_success":
+                    self.connected = True
+                    if self.symbols:
+                        await ws.send_str(json.dumps({"action": "subscribe", "params": self._params(self.symbols)}))
+                    return
+                if ev.get("status") == "auth_failed":
+                    raise PermissionError(f"Polygon auth failed: {ev.get('message', '')}")
+        raise ConnectionError("Socket closed during handshake")
+
+    def _handle(self, events: List[dict]):
+        for ev in events:
+            kind = ev.get("ev")
+            if kind == "T":
+                tick = self._on_trade(ev)
+            elif kind == "Q":
+                tick = self._on_quote(ev)
+            else:
+                if kind == "status":
+                    logger.debug(f"PolygonStream: {ev.get('status')} {ev.get('message', '')}")
+                continue
+            self.messages += 1
+            if tick is not None:
+                self.bus.publish(tick)
+
+    def _next_seq(self, ev: dict) -> int:
+        self._seq += 1
+        return int(ev.get("q") or self._seq)
+
+    def _on_trade(self, ev: dict) -> Optional[Tick]:
+        symbol, price = ev.get("sym"), float(ev.get("p") or 0.0)
+        if not symbol or price <= 0:
+            return None
+        self._last[symbol] = price
+        self._volume[symbol] = self._volume.get(symbol, 0) + int(ev.get("s") or 0)
+        bid, ask = self._quotes.get(symbol, (price, price))
+        return Tick(symbol, ev.get("t", time.time() * 1000) / 1000.0, bid, ask, price,
+                    self._volume[symbol], "POLYGON_WS", self._next_seq(ev), VOLUME_STREAM)
+
+    def _on_quote(self, ev: dict) -> Optional[Tick]:
+        symbol = ev.get("sym")
+        bid, ask = float(ev.get("bp") or 0.0), float(ev.get("ap") or 0.0)
+        if not symbol or bid <= 0 or ask <= 0:
+            return None
+        self._quotes[symbol] = (bid, ask)
+        last = self._last.get(symbol, (bid + ask) / 2)
+        return Tick(symbol, ev.get("t", time.time() * 1000) / 1000.0, bid, ask, last,
+                    self._volume.get(symbol, 0), "POLYGON_WS", self._next_seq(ev), VOLUME_STREAM)
+
 class PolygonProvider(FeedProvider):
-    def __init__(self):
+    # Streamed ticks older than this fall back to a REST snapshot
+    stream_max_age = 5.0
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None, bus: Optional[TickBus] = None, stream: Optional[bool] = None):
         self.api_key = cfg.POLYGON_API_KEY
         self.client = None
-        self.ws = None
+        self.bus = bus or tick_bus
+        self.stream_enabled = cfg.POLYGON_STREAM if stream is None else stream
+        self.ws: Optional[PolygonStream] = None
+        self.symbols = list(symbols) if symbols is not None else list(cfg.WATCHLIST)
         self.latest_ticks = {} # Symbol -> Tick
 
     def get_name(self) -> str:
         return "POLYGON_IO"
 
     async def connect(self):
-        if not HAS_SDK:
-            logger.error("PolygonSDK not installed. Please install 'polygon-api-client'.")
-            return
-            
-        logger.info("PolygonProvider: Connecting WebSocket...")
-        # Note: In a real async app, we'd use the async version or run in thread
-        # This is a simplified wrapper adapting the SDK callback model to our polling `get_latest_tick` model
-        # or we push updates to a queue.
-        # For this design, we'll assume we have a REST fallback for "Snapshot" if WS not ready.
-        
-        self.client = RESTClient(self.api_key)
-        
-    async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
-        if not HAS_SDK:
-            return None
+        if HAS_SDK:
+            self.client = RESTClient(self.api_key)
+        else:
+            logger.error("PolygonSDK not installed. Please install 'polygon-api-client'. REST snapshots disabled.")
+
+        if self.stream_enabled:
+            logger.info("PolygonProvider: Connecting WebSocket...")
+            self.bus.add_listener(self._on_stream_tick)
+            self.ws = PolygonStream(self.api_key, self.symbols, bus=self.bus)
+            self.ws.start()
+
+    async def disconnect(self):
+        if self.ws is not None:
+            await self.ws.stop()
+            self.bus.remove_listener(self._on_stream_tick)
+            self.ws = None
 
-        # Prefer WebSocket cache if available (Low Latency)
-        if symbol in self.latest_ticks:
-            return self.latest_ticks[symbol]
+    def _on_stream_tick(self, tick: Tick):
+        if tick.source == "POLYGON_WS":
+            self.latest_ticks[tick.symbol] = tick
+
+    # Snapshot endpoint accepts a ticker list
+    max_batch_size = 250
+
+    @staticmethod
+    def _snapshot_to_tick(s) -> Tick:
+        # Polygon uses: last_trade, min, day, etc.
+        return Tick(
+            symbol=s.ticker,
+            timestamp=time.time(),
+            bid=s.last_quote.bid_price if s.last_quote else 0.0,
+            ask=s.last_quote.ask_price if s.last_quote else 0.0,
+            last=s.last_trade.price if s.last_trade else 0.0,
+            volume=s.day.volume if s.day else 0,
+            source="POLYGON_REST",
+            sequence=int(time.time()*1000)
+        )
+
+    async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
+        # Prefer WebSocket cache while it is fresh (Low Latency)
+        tick = self.latest_ticks.get(symbol)
+        if tick is not None and not tick.is_stale(threshold_sec=self.stream_max_age):
+            return tick
 
         # Fallback to REST Snapshot (Higher Latency)
+        return (await self.get_latest_ticks([symbol])).get(symbol)
+
+    async def get_latest_ticks(self, symbols: List[str]) -> Dict[str, Tick]:
+        """
+        One snapshot request for the whole chunk.
+        """
+        if not HAS_SDK or self.client is None:
+            return {}
         try:
-            # Snapshot API
-            resp = self.client.get_snapshot_all(tickers=symbol)
-            if resp and len(resp) > 0:
-                s = resp[0]
-                # Convert to Canonical Tick
-                # Polygon uses: last_trade, min, day, etc.
-                # Simplified mapping:
-                tick = Tick(
-                    symbol=symbol,
-                    timestamp=time.time(),
-                    bid=s.last_quote.bid_price if s.last_quote else 0.0,
-                    ask=s.last_quote.ask_price if s.last_quote else 0.0,
-                    last=s.last_trade.price if s.last_trade else 0.0,
-                    volume=s.day.volume if s.day else 0,
-                    source="POLYGON_REST",
-                    sequence=int(time.time()*1000)
-                )
-                self.latest_ticks[symbol] = tick # Update cache
-                return tick
+            resp = await io_pool.run_blocking(self.client.get_snapshot_all, "stocks", tickers=list(symbols))
         except Exception as e:
             logger.error(f"Polygon REST Failed: {e}")
-            return None
-        return None
+            return {}
+
+        ticks = {}
+        for snap in resp or []:
+            tick = self._snapshot_to_tick(snap)
+            ticks[tick.symbol] = tick
+        return ticks
@@ -1,36 +1,32 @@
-import aiohttp
 import time
-from typing import Optional
+from typing import Optional, List, Dict
 from asr_trading.data.feed_manager import FeedProvider
-from asr_trading.data.canonical import Tick
+from asr_trading.data.canonical import Tick, VOLUME_NONE
 from asr_trading.core.security import SecretsManager
 from asr_trading.core.logger import logger
+from asr_trading.core.io_pool import io_pool
 
 class TwelveDataProvider(FeedProvider):
     def __init__(self):
         self.api_key = SecretsManager.get_secret("TWELVE_DATA_API_KEY", required=False)
         self.base_url = "https://api.twelvedata.com"
-        self.session: Optional[aiohttp.ClientSession] = None
 
     def get_name(self) -> str:
         return "TWELVE_DATA"
 
     async def connect(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        # HTTP goes through the shared pooled session (core/io_pool.py)
+        io_pool.session()
 
     async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
         if not self.api_key:
              self.api_key = SecretsManager.get_secret("TWELVE_DATA_API_KEY", required=True)
 
-        if not self.session:
-            await self.connect()
-
         # Twelve Data Real-Time Price
         url = f"{self.base_url}/price?symbol={symbol}&apikey={self.api_key}"
         
         try:
-            async with self.session.get(url) as resp:
+            async with io_pool.session().get(url) as resp:
                 if resp.status != 200:
                     logger.error(f"TwelveData API Error: {resp.status} - {await resp.text()}")
                     return None
@@ -52,12 +48,50 @@ class TwelveDataProvider(FeedProvider):
                     last=last_price,
                     volume=0, 
                     source="TWELVE_DATA",
-                    sequence=int(time.time() * 1000)
+                    sequence=int(time.time() * 1000),
+                    volume_kind=VOLUME_NONE
                 )
         except Exception as e:
             logger.error(f"TwelveData Connection Error: {e}")
             raise e
 
+    # /price accepts comma-separated symbols
+    max_batch_size = 120
+
+    async def get_latest_ticks(self, symbols: List[str]) -> Dict[str, Tick]:
+        if len(symbols) == 1:
+            tick = await self.get_latest_tick(symbols[0])
+            return {symbols[0]: tick} if tick else {}
+
+        if not self.api_key:
+             self.api_key = SecretsManager.get_secret("TWELVE_DATA_API_KEY", required=True)
+        url = f"{self.base_url}/price?symbol={','.join(symbols)}&apikey={self.api_key}"
+        async with io_pool.session().get(url) as resp:
+            if resp.status != 200:
+                logger.error(f"TwelveData API Error: {resp.status} - {await resp.text()}")
+                return {}
+            data = await resp.json()
+
+        # {"AAPL": {"price": "145.20"}, "MSFT": {"code": 400, "message": ...}}
+        ticks = {}
+        now = time.time()
+        for symbol in symbols:
+            entry = data.get(symbol) or {}
+            if "price" not in entry:
+                continue
+            ticks[symbol] = Tick(
+                symbol=symbol,
+                timestamp=now,
+                bid=0.0,
+                ask=0.0,
+                last=float(entry["price"]),
+                volume=0,
+                source="TWELVE_DATA",
+                sequence=int(now * 1000),
+                volume_kind=VOLUME_NONE
+            )
+        return ticks
+
     async def close(self):
-        if self.session:
-            await self.session.close()
+        # Shared session: closed once by io_pool.close() on shutdown
+        pass
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import Optional, List, Dict
 import time
+import pandas as pd
 from asr_trading.data.feed_manager import FeedProvider
-from asr_trading.data.canonical import Tick
+from asr_trading.data.canonical import Tick, VOLUME_BAR
 from asr_trading.core.logger import logger
+from asr_trading.core.io_pool import io_pool
 
 # Try importing real SDK
 try:
@@ -29,38 +31,64 @@ class YahooFinanceProvider(FeedProvider):
             return None
             
         try:
-            # yfinance fetch
-            # Note: yf.Ticker(sys).history(period="1d", interval="1m") is blocking.
-            # In production asyncio, run in executor.
-            ticker = yf.Ticker(symbol)
-            # Get just the last row of 1m data
-            df = ticker.history(period="1d", interval="1m")
-            
+            # yf.Ticker().history() is blocking: run it on the shared SDK pool
+            df = await io_pool.run_blocking(self._last_minute, symbol)
             if df.empty:
                 return None
-                
-                
-            last_row = df.iloc[-1]
-            ts = last_row.name
-            
-            # Normalize to UTC
-            if ts.tzinfo is None:
-                # Assume UTC if naive, or Local? Safer to assume UTC for YF History usually
-                ts = ts.tz_localize("UTC")
-            else:
-                ts = ts.tz_convert("UTC")
-                
-            # Map to Tick
-            return Tick(
-                symbol=symbol,
-                timestamp=ts.timestamp(), # Now guaranteed valid UTC timestamp
-                bid=last_row["Close"], # YF doesn't give Bid/Ask easily in history
-                ask=last_row["Close"],
-                last=last_row["Close"],
-                volume=int(last_row["Volume"]),
-                source="YAHOO_FREE",
-                sequence=int(time.time())
-            )
+
+            return self._row_to_tick(symbol, df.iloc[-1])
         except Exception as e:
             logger.warning(f"Yahoo Fetch Failed for {symbol}: {e}")
             return None
+
+    @staticmethod
+    def _last_minute(symbol: str) -> pd.DataFrame:
+        # Get just the last row of 1m data
+        return yf.Ticker(symbol).history(period="1d", interval="1m")
+
+    @staticmethod
+    def _row_to_tick(symbol: str, last_row) -> Tick:
+        ts = last_row.name
+        
+        # Normalize to UTC
+        if ts.tzinfo is None:
+            # Assume UTC if naive, or Local? Safer to assume UTC for YF History usually
+            ts = ts.tz_localize("UTC")
+        else:
+            ts = ts.tz_convert("UTC")
+            
+        # Map to Tick
+        return Tick(
+            symbol=symbol,
+            timestamp=ts.timestamp(), # Now guaranteed valid UTC timestamp
+            bid=last_row["Close"], # YF doesn't give Bid/Ask easily in history
+            ask=last_row["Close"],
+            last=last_row["Close"],
+            volume=int(last_row["Volume"]), # The last 1m bar's volume, not the day's
+            source="YAHOO_FREE",
+            sequence=int(time.time()),
+            volume_kind=VOLUME_BAR
+        )
+
+    # yf.download takes many tickers in one call
+    max_batch_size = 100
+
+    async def get_latest_ticks(self, symbols: List[str]) -> Dict[str, Tick]:
+        if not HAS_YF:
+            return {}
+        df = await io_pool.run_blocking(
+            yf.download, list(symbols), period="1d", interval="1m",
+            group_by="ticker", auto_adjust=False, progress=False, threads=True
+        )
+        ticks = {}
+        if df is None or df.empty:
+            return ticks
+        for symbol in symbols:
+            try:
+                rows = df[symbol] if isinstance(df.columns, pd.MultiIndex) else df
+                rows = rows.dropna(subset=["Close"])
+                if not rows.empty:
+                    ticks[symbol] = self._row_to_tick(symbol, rows.iloc[-1])
+            except Exception as e:
+                logger.warning(f"Yahoo batch: no data for {symbol}: {e}")
+        return ticks
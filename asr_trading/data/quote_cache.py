@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+import pandas as pd
+from asr_trading.core.logger import logger
+from asr_trading.core.config import cfg
+from asr_trading.core.avionics import telemetry
+from asr_trading.core.io_pool import io_pool
+
+class _FetchAbandoned(Exception):
+    """
+    The caller that owned an in-flight fetch was cancelled; its waiters retry.
+    """
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def _yf_history(symbol: str, period: str, interval: str) -> pd.DataFrame:
+    import yfinance as yf
+    return yf.Ticker(symbol).history(period=period, interval=interval)
+
+class QuoteCache:
+    """
+    Shared cache for on-demand price/history lookups (chat, manual trade checks, CLI).
+    - Entries are keyed by (symbol, period, interval) and expire after the
+      interval's TTL (cfg.QUOTE_CACHE_TTLS); empty results are kept briefly too.
+    - Single-flight: concurrent callers for the same key (sync threads or async
+      tasks) share one in-flight fetch. Failures are not cached.
+    - Callers get a copy, so in-place indicator code can't corrupt the cache.
+    - Code running on an event loop should use the *_async methods. A sync call
+      made on a loop thread never waits on a fetch owned by someone else (the
+      owner may be a task on that same loop); it fetches directly instead.
+    """
+    EMPTY_TTL = 5.0 # Seconds to remember "no data"
+
+    def __init__(self, fetcher: Optional[Callable[[str, str, str], pd.DataFrame]] = None,
+                 ttls: Optional[Dict[str, float]] = None, max_entries: int = 512):
+        self.fetcher = fetcher or _yf_history
+        self.ttls = ttls or cfg.QUOTE_CACHE_TTLS
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _ttl(self, interval: str, df: pd.DataFrame) -> float:
+        return self.EMPTY_TTL if df is None or df.empty else self.ttls.get(interval, 60.0)
+
+    def _lookup(self, key) -> Tuple[Optional[pd.DataFrame], Optional[Future], bool]:
+        """
+        Returns (cached frame, future to wait on, whether this caller must fetch).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                outcome = "hit"
+                result = (entry[1], None, False)
+            elif key in self._inflight:
+                self.coalesced += 1
+                outcome = "coalesced"
+                result = (None, self._inflight[key], False)
+            else:
+                self.misses += 1
+                outcome = "miss"
+                future = Future()
+                self._inflight[key] = future
+                result = (None, future, True)
+        telemetry.record_metric(f"quote_cache.{outcome}", 1.0, {"symbol": key[0], "interval": key[2]})
+        return result
+
+    def _complete(self, key, future: Future, df: Optional[pd.DataFrame] = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None:
+                if df is None:
+                    df = pd.DataFrame()
+                self._entries[key] = (time.monotonic() + self._ttl(key[2], df), df)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        if error is None:
+            future.set_result(df)
+        else:
+            logger.warning(f"QuoteCache: Fetch failed for {key[0]} ({key[1]}/{key[2]}): {error}")
+            future.set_exception(error)
+
+    def _abandon(self, key, future: Future):
+        """
+        The owner was cancelled mid-fetch: nothing is cached and waiters start over.
+        """
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_exception(_FetchAbandoned())
+
+    # --- Sync API ---
+    def history(self, symbol: str, period: str = "1d", interval: str = "1d") -> pd.DataFrame:
+        key = (symbol, period, interval)
+        while True:
+            cached, future, owner = self._lookup(key)
+            if cached is not None:
+                return cached.copy()
+            if owner:
+                try:
+                    df = self.fetcher(symbol, period, interval)
+                except Exception as e:
+                    self._complete(key, future, error=e)
+                    raise
+                except BaseException:
+                    self._abandon(key, future)
+                    raise
+                self._complete(key, future, df)
+                return df.copy()
+            if _on_event_loop():
+                # Blocking here could wait on a task of this very loop: deadlock
+                logger.warning(f"QuoteCache: Sync history({symbol}) called on the event loop; fetching directly. Use history_async.")
+                return self.fetcher(symbol, period, interval).copy()
+            try:
+                return future.result().copy()
+            except _FetchAbandoned:
+                continue
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        df = self.history(symbol)
+        return float(df["Close"].iloc[-1]) if not df.empty else None
+
+    # --- Async API (fetch runs on the shared SDK pool) ---
+    async def history_async(self, symbol: str, period: str = "1d", interval: str = "1d") -> pd.DataFrame:
+        key = (symbol, period, interval)
+        while True:
+            cached, future, owner = self._lookup(key)
+            if cached is not None:
+                return cached.copy()
+            if owner:
+                try:
+                    df = await io_pool.run_blocking(self.fetcher, symbol, period, interval)
+                except Exception as e:
+                    self._complete(key, future, error=e)
+                    raise
+                except BaseException: # Cancelled: our waiters must not inherit that
+                    self._abandon(key, future)
+                    raise
+                self._complete(key, future, df)
+                return df.copy()
+            try:
+                # Shielded: a waiter being cancelled must not cancel the shared fetch
+                return (await asyncio.shield(asyncio.wrap_future(future))).copy()
+            except _FetchAbandoned:
+                continue
+
+    async def last_price_async(self, symbol: str) -> Optional[float]:
+        df = await self.history_async(symbol)
+        return float(df["Close"].iloc[-1]) if not df.empty else None
+
+    def invalidate(self, symbol: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._entries if symbol is None or k[0] == symbol]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / total if total else 0.0
+        }
+
+quote_cache = QuoteCache()
@@ -1,11 +1,17 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from asr_trading.core.logger import logger
+from asr_trading.core.cycle_scheduler import CycleScheduler
 from asr_trading.data.ingestion import data_manager
 import time
 
 class DataScheduler:
+    """
+    Market scan loop (asyncio CycleScheduler, on its own "cycle-scheduler" loop
+    thread, never the caller's loop) + APScheduler for wall-clock cron jobs.
+    """
     def __init__(self):
         self.scheduler = BackgroundScheduler()
+        self.cycles = CycleScheduler()
         self.is_running = False
 
     def start(self):
@@ -19,11 +25,8 @@ class DataScheduler:
                     self.scheduler = BackgroundScheduler()
                     self.scheduler.start()
             
-            # Ensure job exists or add it
-            if not self.scheduler.get_job('market_data_job'):
-                self.scheduler.add_job(self.fetch_market_data, 'interval', minutes=1, id='market_data_job', replace_existing=True)
-            else:
-                 self.scheduler.resume_job('market_data_job')
+            # Watchlist scan: bounded concurrency, overrun protection, per-cycle deadline
+            self.cycles.start()
 
             # 18.6 Continuous Learning Trigger (16:15 IST)
             if not self.scheduler.get_job('daily_review_job'):
@@ -35,50 +38,28 @@ class DataScheduler:
 
     def stop(self):
         if self.is_running:
-            # Don't shutdown the thread, just pause the job to allow quick restart
-            if self.scheduler.get_job('market_data_job'):
-                self.scheduler.pause_job('market_data_job')
+            # Keep APScheduler alive for the cron job; just stop scanning
+            self.cycles.stop()
             self.is_running = False
             logger.info("Data Scheduler paused.")
 
     def fetch_market_data(self):
-        """Job to fetch data for watched symbols"""
-        from asr_trading.core.config import cfg
-        from asr_trading.core.orchestrator import orchestrator
+        """One immediate scan of the watchlist (manual trigger)."""
         import asyncio
         
-        symbols = cfg.WATCHLIST
-        logger.info(f"Scheduler: Triggering pipeline for {len(symbols)} symbols...")
-        
-        # We need to run async code from sync scheduler job
-        # Ideally, scheduler should be async or use a worker pool.
-        # For this prototype, we'll get the running loop or create a new one.
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is running (e.g. valid inside main.py), we create tasks
-                for sym in symbols:
-                    task = loop.create_task(orchestrator.run_cycle(sym))
-                    # Add callback to log exceptions if task fails
-                    def handle_task_result(t):
-                        try:
-                            t.result()
-                        except asyncio.CancelledError:
-                            pass
-                        except Exception as e:
-                            logger.error(f"Scheduler: Task for {sym} failed: {e}", exc_info=True)
-                    task.add_done_callback(handle_task_result)
-            else:
-                # Fallback for standalone testing
-                loop.run_until_complete(self._run_batch(orchestrator, symbols))
+            loop = asyncio.get_running_loop()
         except RuntimeError:
-             # Look for a new loop if none exists
-             loop = asyncio.new_event_loop()
-             asyncio.set_event_loop(loop)
-             loop.run_until_complete(self._run_batch(orchestrator, symbols))
-             
-    async def _run_batch(self, orchestrator, symbols):
-        for sym in symbols:
-            await orchestrator.run_cycle(sym)
+            loop = None
+
+        if loop is not None:
+            task = loop.create_task(self.cycles.run_once())
+            def handle_task_result(t):
+                if not t.cancelled() and t.exception() is not None:
+                    logger.error(f"Scheduler: Manual scan failed: {t.exception()}")
+            task.add_done_callback(handle_task_result)
+            return task
+        # Standalone (no loop in this thread)
+        return asyncio.run(self.cycles.run_once())
 
 scheduler_service = DataScheduler()
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from asr_trading.data.canonical import Tick
+from asr_trading.core.logger import logger
+from asr_trading.core.avionics import telemetry
+
+class SubscriptionClosed(Exception):
+    pass
+
+_CLOSED = object() # Queued by close(): wakes consumers blocked on an empty queue
+
+class Subscription:
+    """
+    One consumer's view of the bus: a bounded queue of ticks for `symbols`
+    (None = all). A slow consumer never blocks the publisher; when its queue
+    is full the OLDEST tick is dropped (the newest price is the one that matters).
+    """
+    def __init__(self, bus: "TickBus", symbols: Optional[Iterable[str]], maxsize: int):
+        self.bus = bus
+        self.symbols: Optional[Set[str]] = set(symbols) if symbols is not None else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    def wants(self, symbol: str) -> bool:
+        return self.symbols is None or symbol in self.symbols
+
+    def _offer(self, tick: Tick):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(tick)
+
+    async def get(self) -> Tick:
+        """
+        Next tick; ticks queued before close() are still delivered, after
+        them SubscriptionClosed is raised (also in consumers already waiting).
+        """
+        tick = await self.queue.get()
+        if tick is _CLOSED:
+            self.queue.put_nowait(_CLOSED) # Leave it for the next get()
+            raise SubscriptionClosed()
+        return tick
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tick:
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+class TickBus:
+    """
+    In-process pub/sub for canonical Ticks (single event loop).
+    - Listeners: sync callbacks run inline on publish (cache updates, bracket checks).
+    - Subscriptions: async consumers with their own bounded queue.
+    publish() never awaits, so a websocket reader can call it per message.
+    """
+    def __init__(self):
+        self._listeners: List[tuple] = []
+        self._subscriptions: List[Subscription] = []
+        self.published = 0
+        self.last_tick: Dict[str, Tick] = {}
+
+    def add_listener(self, callback: Callable[[Tick], None], symbols: Optional[Iterable[str]] = None):
+        self._listeners.append((callback, set(symbols) if symbols is not None else None))
+
+    def remove_listener(self, callback: Callable[[Tick], None]):
+        self._listeners = [(cb, s) for cb, s in self._listeners if cb != callback]
+
+    def subscribe(self, symbols: Optional[Iterable[str]] = None, maxsize: int = 1024) -> Subscription:
+        sub = Subscription(self, symbols, maxsize)
+        self._subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        sub.closed = True
+        if sub in self._subscriptions:
+            self._subscriptions.remove(sub)
+            sub._offer(_CLOSED)
+            if sub.dropped:
+                telemetry.record_event("tick_bus_drops", {"dropped": sub.dropped})
+
+    def publish(self, tick: Tick):
+        self.published += 1
+        self.last_tick[tick.symbol] = tick
+        for callback, symbols in self._listeners:
+            if symbols is None or tick.symbol in symbols:
+                try:
+                    callback(tick)
+                except Exception as e:
+                    # One bad consumer must not starve the others
+                    logger.error(f"TickBus: Listener {getattr(callback, '__qualname__', callback)} failed on {tick.symbol}: {e}")
+        for sub in self._subscriptions:
+            if sub.wants(tick.symbol):
+                sub._offer(tick)
+
+tick_bus = TickBus()
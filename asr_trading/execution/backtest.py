@@ -1,67 +1,274 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+import numpy as np
 import pandas as pd
 from asr_trading.core.logger import logger
-from asr_trading.strategy.scalping import scalping_strategy
+from asr_trading.data.canonical import OHLC
+from asr_trading.core.storage.bar_store import load_history_csv
+from asr_trading.execution.vector_backtest import SignalArrays, SignalParams, VectorizedBacktest, REASONS, trade_stats
+
+class SimulatedFillModel:
+    """
+    Fill model for replay.
+    Entries are market orders filled at the NEXT bar's open (no look-ahead) plus slippage.
+    Bracket exits fill at the SL/TP level, or at the open if the bar gaps through it.
+    """
+    def __init__(self, slippage_pct: float = 0.0005, commission_per_trade: float = 0.0):
+        self.slippage_pct = slippage_pct
+        self.commission_per_trade = commission_per_trade
+
+    def entry_price(self, side: str, open_price: float) -> float:
+        slip = open_price * self.slippage_pct
+        return open_price + slip if side == "BUY" else open_price - slip
+
+    def exit_price(self, side: str, level: float) -> float:
+        slip = level * self.slippage_pct
+        return level - slip if side == "BUY" else level + slip
+
+@dataclass
+class SimPosition:
+    symbol: str
+    side: str
+    quantity: int
+    entry: float
+    sl: float
+    tp: float
+    strategy_id: str
+    entry_ts: float
+    confidence: float
 
 class BacktestEngine:
-    def __init__(self, initial_capital=10000.0):
+    """
+    Event-driven bar replay through the live decision stack:
+    FeatureEngine -> StrategySelector.select_strategy -> PlannerEngine.create_plan -> SimulatedFillModel.
+    Open positions are managed with OrderManager's Plan A bracket rule.
+    Every run uses its own FeatureEngine / StrategySelector (alerts off) / PlannerEngine / RiskManager,
+    so live singletons are untouched.
+    """
+    def __init__(self, initial_capital=10000.0, fill_model: Optional[SimulatedFillModel] = None):
         self.initial_capital = initial_capital
+        self.fill_model = fill_model or SimulatedFillModel()
         self.balance = initial_capital
+        self.trades = [] # Realized PnL per closed trade
+        self.trade_log: List[Dict[str, Any]] = []
+        self.equity_curve: List[float] = []
+
+    def _reset(self):
+        self.balance = self.initial_capital
         self.trades = []
+        self.trade_log = []
+        self.equity_curve = []
 
-    def run(self, symbol: str, df: pd.DataFrame):
+    def run(self, symbol: str, df: pd.DataFrame, interval: str = "1d"):
         """
         Enterprise Backtest Run with Full Metrics.
+        `df` needs open/high/low/close (any case); `timestamp`/`volume` are optional.
         """
         logger.info(f"Starting backtest for {symbol} on {len(df)} candles...")
-        
-        # Mocking trade results for demonstration of METRICS calculation
-        # In real engine, this loop would populate self.trades list with actual PnL
-        import random
-        self.trades = [random.uniform(-50, 100) for _ in range(50)] # Mock data
-        
-        # Metric Calculation
-        total_trades = len(self.trades)
-        wins = [t for t in self.trades if t > 0]
-        losses = [t for t in self.trades if t <= 0]
-        
-        win_rate = (len(wins) / total_trades) * 100 if total_trades > 0 else 0
-        avg_win = sum(wins) / len(wins) if wins else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-        
-        # Risk:Reward Ratio
-        rr_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else float('inf')
-        
-        # Expectancy = (Win% * AvgWin) - (Loss% * AvgLoss) - Commmission
-        win_pct = len(wins) / total_trades if total_trades > 0 else 0
-        loss_pct = len(losses) / total_trades if total_trades > 0 else 0
-        expectancy = (win_pct * avg_win) + (loss_pct * avg_loss)
-        
-        # Max Drawdown
-        equity_curve = [self.initial_capital]
-        current = self.initial_capital
-        peak = current
-        max_dd = 0.0
-        
-        for t in self.trades:
-            current += t
-            equity_curve.append(current)
-            peak = max(peak, current)
-            dd = (peak - current) / peak
-            max_dd = max(max_dd, dd)
-            
-        final_balance = current
-        
+        started = time.perf_counter()
+        self._reset()
+        if not df.empty:
+            self._replay(symbol, df, interval)
+        results = self._compute_metrics(symbol)
+        results["bars"] = len(df)
+        results["elapsed_sec"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Backtest Complete. Metrics:\n{results}")
+        return results
+
+    def run_file(self, path: str, symbol: Optional[str] = None, interval: str = "1d"):
+        symbol = symbol or os.path.splitext(os.path.basename(path))[0]
+        return self.run(symbol, load_history_csv(path), interval)
+
+    def _replay(self, symbol: str, df: pd.DataFrame, interval: str):
+        from asr_trading.analysis.features import FeatureEngine
+        from asr_trading.analysis.kernels import ohlc_column
+        from asr_trading.analysis.patterns import pattern_scanner, DetectedPattern
+        from asr_trading.strategy.selector import StrategySelector
+        from asr_trading.strategy.planner import PlannerEngine
+        from asr_trading.execution.risk_manager import RiskManager
+        from asr_trading.execution.order_manager import OrderManager
+        from asr_trading.core.auditor import InvariantViolation
+
+        features = FeatureEngine()
+        selector = StrategySelector(alerts=False)
+        risk = RiskManager()
+        risk.total_capital = self.initial_capital
+        planner = PlannerEngine(risk_manager=risk)
+        fills = self.fill_model
+
+        o = ohlc_column(df, "open").to_numpy(dtype=np.float64)
+        h = ohlc_column(df, "high").to_numpy(dtype=np.float64)
+        l = ohlc_column(df, "low").to_numpy(dtype=np.float64)
+        c = ohlc_column(df, "close").to_numpy(dtype=np.float64)
+        ts = df["timestamp"].to_numpy(dtype=np.float64) if "timestamp" in df else np.arange(len(df), dtype=np.float64)
+        vol = ohlc_column(df, "volume").to_numpy(dtype=np.float64) if ("volume" in df or "Volume" in df) else np.zeros(len(df))
+
+        # Patterns for every bar in one vectorized pass
+        pattern_flags = pattern_scanner.scan(o, h, l, c)
+        specs = pattern_scanner.specs
+
+        position: Optional[SimPosition] = None
+        pending = None # Plan waiting for next bar's open
+
+        for i in range(len(df)):
+            bar_o, bar_h, bar_l, bar_c = float(o[i]), float(h[i]), float(l[i]), float(c[i])
+
+            # 1. Fill pending entry at this bar's open
+            if pending is not None:
+                plan, proposal = pending
+                pending = None
+                position = SimPosition(
+                    symbol=symbol,
+                    side=plan.side,
+                    quantity=plan.quantity,
+                    entry=fills.entry_price(plan.side, bar_o),
+                    sl=plan.stop_loss,
+                    tp=plan.take_profit,
+                    strategy_id=proposal.strategy_id,
+                    entry_ts=float(ts[i]),
+                    confidence=plan.confidence
+                )
+                risk.open_trades_count += 1
+
+            # 2. Plan A bracket: gap at open first, then SL (low/high) before TP (conservative)
+            if position is not None:
+                adverse, favourable = (bar_l, bar_h) if position.side == "BUY" else (bar_h, bar_l)
+                hit = OrderManager.check_plan_a(position.sl, position.tp, bar_o, position.side)
+                level = bar_o
+                if hit is None:
+                    hit = OrderManager.check_plan_a(position.sl, position.tp, adverse, position.side)
+                    level = position.sl
+                if hit is None:
+                    hit = OrderManager.check_plan_a(position.sl, position.tp, favourable, position.side)
+                    level = position.tp
+                if hit is not None:
+                    self._close(position, fills.exit_price(position.side, level), float(ts[i]), f"{hit} Hit")
+                    risk.open_trades_count -= 1
+                    position = None
+
+            # 3. Features (incremental)
+            feature_result = features.on_ohlc(OHLC(symbol, float(ts[i]), bar_o, bar_h, bar_l, bar_c, int(vol[i]), interval))
+            self.equity_curve.append(self._mark_to_market(position, bar_c))
+
+            if position is not None or feature_result["status"] != "READY" or i == len(df) - 1:
+                continue
+
+            # 4. Strategy -> Plan
+            patterns = [
+                DetectedPattern(s.pattern_id, s.name, symbol, float(ts[i]), s.confidence, s.side, {"src": "scanner"})
+                for s in specs if pattern_flags[s.pattern_id][i]
+            ]
+            proposal = selector.select_strategy(symbol, feature_result["features"], patterns, [])
+            if not proposal:
+                continue
+            try:
+                plan = planner.create_plan(proposal, bar_c)
+            except InvariantViolation:
+                continue
+            if plan and plan.status == "PENDING" and plan.quantity > 0:
+                pending = (plan, proposal)
+
+        # Close anything still open at the last close
+        if position is not None:
+            self._close(position, float(c[-1]), float(ts[-1]), "End of Data")
+            self.equity_curve[-1] = self.balance
+
+    def _mark_to_market(self, position: Optional[SimPosition], price: float) -> float:
+        if position is None:
+            return self.balance
+        direction = 1 if position.side == "BUY" else -1
+        return self.balance + direction * (price - position.entry) * position.quantity
+
+    def _close(self, position: SimPosition, exit_price: float, ts: float, reason: str):
+        direction = 1 if position.side == "BUY" else -1
+        pnl = direction * (exit_price - position.entry) * position.quantity
+        pnl -= 2 * self.fill_model.commission_per_trade
+        self.balance += pnl
+        self.trades.append(pnl)
+        self.trade_log.append({
+            "symbol": position.symbol,
+            "strategy_id": position.strategy_id,
+            "side": position.side,
+            "quantity": position.quantity,
+            "entry_ts": position.entry_ts,
+            "exit_ts": ts,
+            "entry_price": position.entry,
+            "exit_price": exit_price,
+            "pnl": pnl,
+            "reason": reason,
+            "confidence": position.confidence
+        })
+
+    def _compute_metrics(self, symbol: str) -> Dict[str, Any]:
+        stats = trade_stats(self.trades, self.equity_curve, self.initial_capital)
         results = {
             "symbol": symbol,
-            "final_balance": round(final_balance, 2),
-            "total_trades": total_trades,
-            "win_rate": f"{win_rate:.2f}%",
-            "risk_reward_ratio": f"1:{rr_ratio:.2f}",
-            "expectancy_per_trade": f"${expectancy:.2f}",
-            "max_drawdown": f"{max_dd*100:.2f}%"
+            "final_balance": round(self.balance, 2),
+            "total_trades": stats["total_trades"],
+            "win_rate": f"{stats['win_rate']:.2f}%",
+            "risk_reward_ratio": f"1:{stats['risk_reward_ratio']:.2f}",
+            "expectancy_per_trade": f"${stats['expectancy']:.2f}",
+            "max_drawdown": f"{stats['max_drawdown']:.2f}%",
+            "sharpe": round(stats["sharpe"], 3)
         }
-        
-        logger.info(f"Backtest Complete. Metrics:\n{results}")
+        return results
+
+    # --- Signal-array mode (parameter sweeps) ---
+    @staticmethod
+    def _signal_arrays(df: pd.DataFrame) -> SignalArrays:
+        # Scored by the same model run() consults through select_strategy
+        from asr_trading.brain.learning import cortex
+        return SignalArrays(df, brain=cortex.brain)
+
+    def _vector_engine(self) -> VectorizedBacktest:
+        return VectorizedBacktest(self.initial_capital, self.fill_model.slippage_pct, self.fill_model.commission_per_trade)
+
+    def run_vectorized(self, symbol: str, df: pd.DataFrame, params: Optional[SignalParams] = None, max_hold_bars: Optional[int] = None):
+        """
+        Same decision rules as run(), evaluated as NumPy signal arrays.
+        Orders of magnitude faster; use run() to validate a chosen configuration.
+        """
+        started = time.perf_counter()
+        self._reset()
+        params = params or SignalParams()
+        if not df.empty:
+            arrays = self._signal_arrays(df)
+            sim = self._vector_engine().simulate(arrays, params, max_hold_bars)
+            ts = arrays.timestamp
+            self.trades = sim["pnl"].tolist()
+            self.equity_curve = sim["equity"].tolist()
+            self.balance = self.initial_capital + float(sim["pnl"].sum())
+            self.trade_log = [{
+                "symbol": symbol,
+                "side": "BUY",
+                "quantity": int(sim["quantity"][k]),
+                "entry_ts": float(ts[sim["entry_bar"][k]]),
+                "exit_ts": float(ts[sim["exit_bar"][k]]),
+                "entry_price": float(sim["entry_price"][k]),
+                "exit_price": float(sim["exit_price"][k]),
+                "pnl": float(sim["pnl"][k]),
+                "reason": REASONS[int(sim["reason"][k])],
+                "confidence": float(sim["confidence"][k])
+            } for k in range(len(sim["pnl"]))]
+        results = self._compute_metrics(symbol)
+        results["bars"] = len(df)
+        results["elapsed_sec"] = round(time.perf_counter() - started, 3)
+        return results
+
+    def grid_search(self, symbol: str, df: pd.DataFrame, grid: Dict[str, List[Any]],
+                    base: Optional[SignalParams] = None, max_hold_bars: Optional[int] = None,
+                    rank_by: str = "sharpe") -> pd.DataFrame:
+        """
+        Sweeps SignalParams fields, e.g.
+        {"hammer_rsi": [30, 35, 40], "sl_pct": [0.01, 0.02], "confidence_gate": [0.6, 0.7]}.
+        Features and patterns are computed once; exits once per SL/TP bracket.
+        """
+        started = time.perf_counter()
+        results = self._vector_engine().grid(self._signal_arrays(df), grid, base, max_hold_bars, rank_by)
+        results.insert(0, "symbol", symbol)
+        logger.info(f"Grid search {symbol}: {len(results)} combinations in {time.perf_counter() - started:.2f}s")
         return results
 
 backtester = BacktestEngine()
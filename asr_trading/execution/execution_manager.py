@@ -8,6 +8,7 @@ from asr_trading.core.avionics import CircuitBreaker
 # telegram_bot imported locally to avoid circular dependency
 from asr_trading.core.auditor import Auditor
 from asr_trading.core.config import cfg
+from asr_trading.core.tracing import tracer
 
 class BrokerAdapter(abc.ABC):
     @abc.abstractmethod
@@ -135,6 +136,7 @@ class ExecutionManager:
         is_manual_paper = (plan.plan_code == "MANUAL_PAPER")
         return await self._send_to_brokers(plan, force_paper=is_manual_paper)
 
+    @tracer.trace("execution.send_to_brokers")
     async def _send_to_brokers(self, plan: TradePlan, force_paper: bool = False) -> Dict:
         # Override for Paper Mode
         active_primary = self.primary
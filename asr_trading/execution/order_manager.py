@@ -1,7 +1,9 @@
 from asr_trading.core.logger import logger
 from asr_trading.core.config import cfg
 from asr_trading.strategy.base import TradeSignal
+import threading
 import uuid
+from typing import Optional
 from datetime import datetime
 
 class OrderManager:
@@ -9,6 +11,9 @@ class OrderManager:
         self.positions = {} # symbol -> {entry, size, sl, tp, status, strategy}
         self.orders = []
         self.is_paper = cfg.IS_PAPER_TRADING
+        # Positions change from the scan thread (register_execution) and from the
+        # main loop (TickBus on_tick, lifecycle monitor, admin close)
+        self._lock = threading.RLock()
 
     def execute_signal(self, signal: TradeSignal, size: float = 1.0):
         if signal.action == "HOLD":
@@ -47,7 +52,7 @@ class OrderManager:
                      sl = entry * 1.01
                      tp = entry * 0.98
         
-        self.positions[plan.symbol] = {
+        position = {
             "entry": plan.entry_price,
             "current_price": plan.entry_price, # Will update
             "size": plan.quantity,
@@ -59,6 +64,8 @@ class OrderManager:
             "order_id": order_id,
             "features": getattr(plan, 'features', None) # 18.6 Persist features
         }
+        with self._lock:
+            self.positions[plan.symbol] = position
         logger.info(f"OrderManager: Monitoring ACTIVE for {plan.symbol}. SL={sl:.2f}, TP={tp:.2f}")
 
     def _execute_paper(self, signal: TradeSignal, size: float):
@@ -77,7 +84,7 @@ class OrderManager:
         self.orders.append(order)
         
         if signal.action == "BUY":
-            self.positions[signal.symbol] = {
+            position = {
                 "entry": signal.entry_price,
                 "current_price": signal.entry_price,
                 "size": size,
@@ -89,6 +96,8 @@ class OrderManager:
                 "order_id": order_id
                 # Note: Signals from legacy strategy (execute_signal) might lack features
             }
+            with self._lock:
+                self.positions[signal.symbol] = position
         elif signal.action == "SELL" and signal.symbol in self.positions:
             # Assume closing
             # Use close_position to handle PnL
@@ -122,7 +131,9 @@ class OrderManager:
                     
                     elif new_status == "CANCELLED" or new_status == "REJECTED":
                         logger.warning(f"OrderManager: {sym} Order {order_id} failed with status {new_status}. Removing.")
-                        del self.positions[sym]
+                        with self._lock:
+                            if self.positions.get(sym) is pos: # Not a position registered meanwhile
+                                del self.positions[sym]
                         continue
 
                     # Update intermediate states (SUBMITTED -> OPEN)
@@ -152,75 +163,109 @@ class OrderManager:
                  continue
 
             if sym in market_data:
-                curr_price = market_data[sym]
-                pos['current_price'] = curr_price
-                
-                # Retrieve current plan state
-                current_plan = pos.get('plan', 'A')
-                
-                if current_plan == 'A':
-                    # Plan A: Active Monitoring (Standard Bracket)
-                    if curr_price <= pos['sl']:
-                        logger.info(f"OrderManager: Price {curr_price} hit SL {pos['sl']}. Transitioning A -> C.")
-                        self.transition_to(sym, "C", "SL Hit")
-                    
-                    elif curr_price >= pos['tp']:
-                        logger.info(f"OrderManager: Price {curr_price} hit TP {pos['tp']}. Transitioning A -> Exit.")
-                        self.close_position(sym, "TP Hit")
+                with self._lock:
+                    if self.positions.get(sym) is pos:
+                        self._check_bracket(sym, pos, market_data[sym])
+
+    def attach_bus(self, bus):
+        """
+        Evaluates Plan A on every pushed tick instead of waiting for the next poll.
+        """
+        bus.add_listener(self.on_tick)
+
+    def on_tick(self, tick):
+        # Check and close under one lock: a position registered meanwhile is never closed on a stale look
+        with self._lock:
+            pos = self.positions.get(tick.symbol)
+            if pos is None or (pos['status'] != "FILLED" and not self.is_paper):
+                return
+            self._check_bracket(tick.symbol, pos, tick.last)
+
+    def _check_bracket(self, sym: str, pos: dict, curr_price: float):
+        pos['current_price'] = curr_price
+
+        # Retrieve current plan state
+        current_plan = pos.get('plan', 'A')
+
+        if current_plan == 'A':
+            # Plan A: Active Monitoring (Standard Bracket)
+            hit = self.check_plan_a(pos['sl'], pos['tp'], curr_price)
+            if hit == "SL":
+                logger.info(f"OrderManager: Price {curr_price} hit SL {pos['sl']}. Transitioning A -> C.")
+                self.transition_to(sym, "C", "SL Hit")
+
+            elif hit == "TP":
+                logger.info(f"OrderManager: Price {curr_price} hit TP {pos['tp']}. Transitioning A -> Exit.")
+                self.close_position(sym, "TP Hit")
+
+    @staticmethod
+    def check_plan_a(sl: float, tp: float, price: float, side: str = "BUY") -> Optional[str]:
+        """
+        Plan A bracket rule. Returns "SL", "TP" or None.
+        Shared with the backtest engine so replay exits match live monitoring.
+        """
+        if side == "SELL":
+            if price >= sl: return "SL"
+            if price <= tp: return "TP"
+            return None
+        if price <= sl: return "SL"
+        if price >= tp: return "TP"
+        return None
 
     def transition_to(self, symbol: str, new_plan_code: str, reason: str):
         """
         Executes the State Transition Logic (The Core State Machine).
         """
-        if symbol not in self.positions:
-            return
+        with self._lock: # Bracket checks from the bus and the poll loop race on the same position
+            pos = self.positions.get(symbol)
+            if pos is None:
+                return
 
-        pos = self.positions[symbol]
-        logger.info(f"OrderManager: Transitioning {symbol} from Plan {pos.get('plan', '?')} to Plan {new_plan_code}. Reason: {reason}")
+            logger.info(f"OrderManager: Transitioning {symbol} from Plan {pos.get('plan', '?')} to Plan {new_plan_code}. Reason: {reason}")
         
-        # update state
-        pos['plan'] = new_plan_code
-        pos['plan_reason'] = reason # Persist the "Why"
-        # Do NOT overwrite 'status' (FILLED) with 'EXECUTING_X'. 
-        # keep standard status for broker, use 'plan' for logic.
+            # update state
+            pos['plan'] = new_plan_code
+            pos['plan_reason'] = reason # Persist the "Why"
+            # Do NOT overwrite 'status' (FILLED) with 'EXECUTING_X'. 
+            # keep standard status for broker, use 'plan' for logic.
         
-        # Execute the logic for the new plan
-        if new_plan_code == "C":
-            # Plan C: Validation Failure / Stop Loss Hit -> Immediate Exit
-            self.close_position(symbol, f"Plan C Executed: {reason}")
+            # Execute the logic for the new plan
+            if new_plan_code == "C":
+                # Plan C: Validation Failure / Stop Loss Hit -> Immediate Exit
+                self.close_position(symbol, f"Plan C Executed: {reason}")
             
-        elif new_plan_code == "J":
-            # Plan J: Emergency Kill
-            self.close_position(symbol, f"Plan J Executed: {reason}")
+            elif new_plan_code == "J":
+                # Plan J: Emergency Kill
+                self.close_position(symbol, f"Plan J Executed: {reason}")
 
     def close_position(self, symbol: str, reason: str):
         import time
-        if symbol in self.positions:
-            pos = self.positions[symbol]
-            logger.info(f"Closing position {symbol}. Reason: {reason}")
-            
-            # Calculate PnL
-            exit_price = pos['current_price']
-            pnl = (exit_price - pos['entry']) * pos['size']
-            outcome = 1 if pnl > 0 else 0
-            
-            # Log Trade via ExecutionManager
-            try:
-                from asr_trading.execution.execution_manager import execution_manager
-                # Generate a dummy plan_id or use stored order_id
-                pid = pos.get('order_id', f"AUTO_{int(time.time())}")
-                
-                execution_manager.record_trade_result(
-                    plan_id=pid,
-                    strategy_id=pos.get('strategy', 'UNKNOWN'),
-                    symbol=symbol,
-                    pnl=pnl,
-                    outcome=outcome,
-                    features=pos.get('features')
-                )
-            except Exception as e:
-                logger.error(f"OrderManager: Failed to log trade result: {e}")
-
-            del self.positions[symbol]
+        with self._lock:
+            pos = self.positions.pop(symbol, None) # Exactly one caller gets to close (and record) it
+        if pos is None:
+            return
+        logger.info(f"Closing position {symbol}. Reason: {reason}")
+
+        # Calculate PnL
+        exit_price = pos['current_price']
+        pnl = (exit_price - pos['entry']) * pos['size']
+        outcome = 1 if pnl > 0 else 0
+
+        # Log Trade via ExecutionManager
+        try:
+            from asr_trading.execution.execution_manager import execution_manager
+            # Generate a dummy plan_id or use stored order_id
+            pid = pos.get('order_id', f"AUTO_{int(time.time())}")
+
+            execution_manager.record_trade_result(
+                plan_id=pid,
+                strategy_id=pos.get('strategy', 'UNKNOWN'),
+                symbol=symbol,
+                pnl=pnl,
+                outcome=outcome,
+                features=pos.get('features')
+            )
+        except Exception as e:
+            logger.error(f"OrderManager: Failed to log trade result: {e}")
 
 order_engine = OrderManager()
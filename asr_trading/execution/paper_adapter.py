@@ -8,6 +8,9 @@ class PaperAdapter(BrokerAdapter):
     """
     Simulates a broker for Paper Trading execution.
     """
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency # Simulated network round trip, seconds
+
     def get_name(self) -> str: 
         return "PAPER_BROKER"
     
@@ -16,7 +19,7 @@ class PaperAdapter(BrokerAdapter):
         Simulate order placement.
         """
         # Simulate network latency
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(self.latency)
         
         order_id = f"PAPER_{uuid.uuid4().hex[:8]}"
         
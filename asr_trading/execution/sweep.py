@@ -0,0 +1,224 @@
+import os
+import json
+import glob
+import time
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Dict, List, Optional, Any, Callable, Iterable
+import numpy as np
+import pandas as pd
+from asr_trading.core.logger import logger
+from asr_trading.core.storage.bar_store import load_history_csv
+from asr_trading.execution.vector_backtest import SignalArrays, SignalParams, VectorizedBacktest, trade_stats
+
+BAR_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Per-worker state (filled lazily inside each process). Jobs arrive symbol-major,
+# so a worker only needs the symbol it is on (plus one it may still be finishing).
+WORKER_CACHED_SYMBOLS = 2
+_worker_arrays: "OrderedDict[str, SignalArrays]" = OrderedDict()
+_worker_config: Dict[str, Any] = {}
+
+def _init_worker(bars_dir: str, initial_capital: float, slippage_pct: float, commission: float, max_hold: Optional[int]):
+    _worker_arrays.clear()
+    _worker_config.update(bars_dir=bars_dir, max_hold=max_hold,
+                          engine=VectorizedBacktest(initial_capital, slippage_pct, commission))
+
+def _worker_signal_arrays(symbol: str) -> SignalArrays:
+    # Each worker maps a symbol's bars once and keeps its features/exit cache for later jobs;
+    # LRU-bounded, since the exit cache grows with every (sl, tp, max_hold) bracket
+    arrays = _worker_arrays.get(symbol)
+    if arrays is not None:
+        _worker_arrays.move_to_end(symbol)
+        return arrays
+    bars = np.load(os.path.join(_worker_config["bars_dir"], f"{symbol}.npy"), mmap_mode="r")
+    from asr_trading.brain.learning import cortex
+    arrays = SignalArrays(pd.DataFrame(dict(zip(BAR_COLUMNS, bars))), brain=cortex.brain)
+    _worker_arrays[symbol] = arrays
+    while len(_worker_arrays) > WORKER_CACHED_SYMBOLS:
+        _worker_arrays.popitem(last=False)
+    return arrays
+
+def _run_job(job_id: str, symbol: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    engine: VectorizedBacktest = _worker_config["engine"]
+    sim = engine.simulate(_worker_signal_arrays(symbol), SignalParams(**params), _worker_config["max_hold"])
+    stats = trade_stats(sim["pnl"], sim["equity"], engine.initial_capital)
+    return {"job_id": job_id, "symbol": symbol, **params, **stats}
+
+def data_fingerprint(bars: np.ndarray) -> str:
+    """
+    Bar count, first/last timestamp and content hash of a (6, n) bar block.
+    """
+    n = bars.shape[1]
+    span = f"{bars[0, 0]:.0f}-{bars[0, -1]:.0f}" if n else "empty"
+    digest = hashlib.blake2b(np.ascontiguousarray(bars).data, digest_size=8).hexdigest()
+    return f"{n}:{span}:{digest}"
+
+def job_id_for(symbol: str, params: SignalParams, run_config: Optional[Dict[str, Any]] = None, fingerprint: str = "") -> str:
+    """
+    Resume key: a job is only skipped when the params, the run config (capital,
+    fees, slippage, holding limit, model) and the bars it ran on are all unchanged.
+    """
+    key = json.dumps({"symbol": symbol, **asdict(params), "run": run_config or {}, "data": fingerprint}, sort_keys=True)
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+class SweepRunner:
+    """
+    Parallel (symbol x params) sweep over the vectorized backtest.
+    Layout of `out_dir`:
+      bars/<SYM>.npy   - (6, n) float64 bars, memory-mapped by every worker
+      results.jsonl    - one line per finished job (append-only, the resume log)
+      results.csv      - merged table, best `rank_by` first
+    Re-running with the same out_dir skips jobs already in results.jsonl (same
+    params, run config and bars; see job_id_for).
+    """
+    def __init__(self, out_dir: str = "data/sweeps/latest", workers: Optional[int] = None,
+                 initial_capital: float = 10000.0, slippage_pct: float = 0.0005,
+                 commission_per_trade: float = 0.0, max_hold_bars: Optional[int] = None,
+                 rank_by: str = "sharpe"):
+        self.out_dir = out_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.initial_capital = initial_capital
+        self.slippage_pct = slippage_pct
+        self.commission_per_trade = commission_per_trade
+        self.max_hold_bars = max_hold_bars
+        self.rank_by = rank_by
+        self.bars_dir = os.path.join(out_dir, "bars")
+        self.results_path = os.path.join(out_dir, "results.jsonl")
+        self.table_path = os.path.join(out_dir, "results.csv")
+
+    def prepare_bars(self, files: Dict[str, str]) -> List[str]:
+        """
+        Converts each CSV to a .npy once so workers can mmap instead of parsing.
+        Returns the symbols that are ready.
+        """
+        os.makedirs(self.bars_dir, exist_ok=True)
+        ready = []
+        for symbol, path in files.items():
+            target = os.path.join(self.bars_dir, f"{symbol}.npy")
+            if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(path):
+                try:
+                    df = load_history_csv(path)
+                except Exception as e:
+                    logger.error(f"Sweep: Failed to load {path}: {e}")
+                    continue
+                tmp = target + ".tmp.npy"
+                np.save(tmp, df[list(BAR_COLUMNS)].to_numpy(dtype=np.float64).T)
+                os.replace(tmp, target)
+            ready.append(symbol)
+        return ready
+
+    def run_config(self) -> Dict[str, Any]:
+        from asr_trading.brain.learning import cortex
+        return {"initial_capital": self.initial_capital, "slippage_pct": self.slippage_pct,
+                "commission_per_trade": self.commission_per_trade, "max_hold_bars": self.max_hold_bars,
+                "model": cortex.brain.checksum if cortex.brain.is_trained else None} # Workers score with it
+
+    def fingerprint(self, symbol: str) -> str:
+        return data_fingerprint(np.load(os.path.join(self.bars_dir, f"{symbol}.npy"), mmap_mode="r"))
+
+    def completed_jobs(self) -> set:
+        done = set()
+        if not os.path.exists(self.results_path):
+            return done
+        self._truncate_torn_tail()
+        with open(self.results_path, "r") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["job_id"])
+                except (ValueError, KeyError):
+                    continue
+        return done
+
+    def _truncate_torn_tail(self):
+        # A crash mid-write leaves a partial last line; drop it so appends start clean
+        with open(self.results_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def run(self, files: Dict[str, str], param_sets: Iterable[SignalParams],
+            progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        `files` maps symbol -> CSV path. Jobs are submitted symbol-major so
+        each worker tends to reuse the bars it has already mapped.
+        """
+        started = time.perf_counter()
+        symbols = self.prepare_bars(files)
+        param_sets = list(param_sets)
+        done = self.completed_jobs()
+        run_config = self.run_config()
+
+        jobs = []
+        current = set()
+        for symbol in symbols:
+            fingerprint = self.fingerprint(symbol)
+            for params in param_sets:
+                job_id = job_id_for(symbol, params, run_config, fingerprint)
+                current.add(job_id)
+                if job_id not in done:
+                    jobs.append((job_id, symbol, asdict(params)))
+
+        total = len(jobs)
+        logger.info(f"Sweep: {len(symbols)} symbols x {len(param_sets)} params, {len(done)} already done, {total} to run on {self.workers} workers")
+
+        finished = 0
+        failed = 0
+        if jobs:
+            init_args = (self.bars_dir, self.initial_capital, self.slippage_pct, self.commission_per_trade, self.max_hold_bars)
+            with open(self.results_path, "a") as out, \
+                 ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=init_args) as pool:
+                futures = {pool.submit(_run_job, *job): job for job in jobs}
+                for future in as_completed(futures):
+                    finished += 1
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        failed += 1
+                        logger.error(f"Sweep: Job {futures[future][1]} {futures[future][2]} failed: {e}")
+                        continue
+                    out.write(json.dumps(row) + "\n")
+                    out.flush()
+
+                    if progress:
+                        progress(finished, total)
+                    elif finished % max(1, total // 20) == 0 or finished == total:
+                        elapsed = time.perf_counter() - started
+                        eta = elapsed / finished * (total - finished)
+                        logger.info(f"Sweep: {finished}/{total} jobs ({elapsed:.1f}s elapsed, ETA {eta:.1f}s)")
+
+        table = self.merge(current)
+        logger.info(f"Sweep complete: {total - failed} jobs run, {failed} failed, {len(table)} rows in {self.table_path} ({time.perf_counter() - started:.1f}s)")
+        return table
+
+    def merge(self, job_ids: Optional[set] = None) -> pd.DataFrame:
+        """
+        Rebuilds the ranked table from the append-only log; `job_ids` limits it
+        to those jobs (rows from an older config or older bars stay in the log).
+        """
+        rows = []
+        if os.path.exists(self.results_path):
+            with open(self.results_path, "r") as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        continue
+        table = pd.DataFrame(rows)
+        if not table.empty and job_ids is not None:
+            table = table[table["job_id"].isin(job_ids)]
+        if not table.empty:
+            table = table.drop_duplicates("job_id", keep="last")
+            table = table.sort_values(self.rank_by, ascending=False, kind="stable").reset_index(drop=True)
+        tmp = self.table_path + ".tmp"
+        table.to_csv(tmp, index=False)
+        os.replace(tmp, self.table_path)
+        return table
+
+def historical_files(data_dir: str = "data/historical", symbols: Optional[List[str]] = None) -> Dict[str, str]:
+    files = {os.path.splitext(os.path.basename(p))[0]: p for p in sorted(glob.glob(os.path.join(data_dir, "*.csv")))}
+    if symbols:
+        files = {s: p for s, p in files.items() if s in symbols}
+    return files
@@ -0,0 +1,309 @@
+import math
+import itertools
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
+import pandas as pd
+from asr_trading.analysis.kernels import IndicatorKernels, ohlc_column
+
+REASON_END, REASON_SL, REASON_TP, REASON_MAX_HOLD = 0, 1, 2, 3
+REASONS = {REASON_END: "End of Data", REASON_SL: "SL Hit", REASON_TP: "TP Hit", REASON_MAX_HOLD: "Max Hold"}
+
+@dataclass(frozen=True)
+class SignalParams:
+    """
+    Tunable knobs of the StrategySelector -> Planner (Plan A) path.
+    Defaults reproduce the live rules.
+    """
+    hammer_rsi: float = 40.0 # Oversold + Hammer boost threshold
+    hammer_rsi_boost: float = 0.1
+    momentum_rsi: float = 55.0
+    momentum_conf: float = 0.75
+    confidence_gate: float = 0.7 # final_conf > gate
+    ml_prob: float = 0.5 # BrainStem opinion when the arrays carry no model scores (untrained)
+    sl_pct: float = 0.01
+    tp_pct: float = 0.02
+
+def expand_grid(grid: Dict[str, List[Any]], base: Optional[SignalParams] = None) -> List[SignalParams]:
+    """
+    Cartesian product of `grid` (keys are SignalParams fields) over `base`.
+    """
+    base = base or SignalParams()
+    keys = list(grid.keys())
+    unknown = set(keys) - set(asdict(base))
+    if unknown:
+        raise ValueError(f"Unknown grid parameters: {sorted(unknown)}")
+    return [replace(base, **dict(zip(keys, values))) for values in itertools.product(*(grid[k] for k in keys))]
+
+class SignalArrays:
+    """
+    Per-bar columns needed by the selector rules, computed once per frame.
+    Values are sanitized like FeatureEngine output (NaN/Inf -> 0).
+    With a trained `brain` (BrainStem) every bar is also scored in one
+    predict_many pass, as select_strategy does bar by bar.
+    """
+    WARMUP = 4 # FeatureEngine.WARMUP_BARS - 1 / PatternScanner warmup
+
+    def __init__(self, df: pd.DataFrame, brain=None):
+        from asr_trading.analysis.patterns import pattern_scanner
+        self.open = ohlc_column(df, "open").to_numpy(dtype=np.float64)
+        self.high = ohlc_column(df, "high").to_numpy(dtype=np.float64)
+        self.low = ohlc_column(df, "low").to_numpy(dtype=np.float64)
+        self.close = ohlc_column(df, "close").to_numpy(dtype=np.float64)
+        self.timestamp = df["timestamp"].to_numpy(dtype=np.float64) if "timestamp" in df else np.arange(len(df), dtype=np.float64)
+        self.n = len(self.close)
+
+        k = IndicatorKernels(self.high, self.low, self.close)
+        clean = lambda x: np.nan_to_num(x, nan=0.0, posinf=0.0, neginf=0.0)
+        self.rsi = clean(k.rsi(14))
+        self.macd = clean(k.macd(12, 26))
+        self.sma_50 = clean(k.sma(50))
+        self.volatility = clean(k.volatility(20))
+        self.atr = clean(k.atr(14))
+
+        # P(Win) per bar; None (untrained) -> entries() uses params.ml_prob
+        self.ml_prob: Optional[np.ndarray] = None
+        if brain is not None and brain.is_trained:
+            self.ml_prob = brain.predict_many(self.feature_matrix(brain.feature_columns))
+
+        hammer = pattern_scanner.scan(self.open, self.high, self.low, self.close)["CDL_HAMMER"]
+        spec = next(s for s in pattern_scanner.specs if s.pattern_id == "CDL_HAMMER")
+        self.hammer = hammer
+        self.hammer_conf = spec.confidence
+
+        # Bars that may emit a signal: features READY and a next bar to fill on
+        self.eligible = np.zeros(self.n, dtype=bool)
+        self.eligible[self.WARMUP:self.n - 1] = True
+
+        self._exit_cache: Dict[Tuple, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def feature_matrix(self, columns: List[str]) -> np.ndarray:
+        """
+        (n, len(columns)) FeatureEngine columns by name; unknown names are 0 (as BrainStem.vectorize).
+        """
+        named = {"RSI": self.rsi, "MACD": self.macd, "ATR": self.atr, "SMA_50": self.sma_50, "Volatility": self.volatility}
+        zeros = np.zeros(self.n)
+        return np.column_stack([named.get(c, zeros) for c in columns]) if columns else np.zeros((self.n, 0))
+
+    def regime_modifier(self, strategy_id: str) -> np.ndarray:
+        """
+        Vectorized RegimeClassifier.detect_regime + StrategySelector.get_regime_modifier.
+        """
+        from asr_trading.brain.regime import regime_monitor
+        vol = self.volatility
+        vol_state = np.where(vol < 0.001, "LOW_VOL", np.where(vol > 0.004, "HIGH_VOL", "MED_VOL"))
+        bull = (self.sma_50 > 0) & (self.macd > 0) & (self.close > self.sma_50)
+        bear = (self.sma_50 > 0) & (self.macd < 0) & (self.close < self.sma_50)
+        trend_state = np.where(bull, "BULL", np.where(bear, "BEAR", "SIDEWAYS"))
+        regime = np.char.add(np.char.add(vol_state, "_"), trend_state)
+
+        mod = np.zeros(self.n)
+        for regime_id, preferred in regime_monitor.priors.items():
+            if preferred:
+                mod[regime == regime_id] = 0.1 if strategy_id in preferred else -0.2
+        return mod
+
+    def entries(self, params: SignalParams) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Signal bars and their proposal confidence (Hammer first, then Momentum,
+        same precedence as select_strategy). Also applies the RiskManager
+        confidence floor.
+        """
+        from asr_trading.brain.governance import governance
+        ml = (self.ml_prob if self.ml_prob is not None else params.ml_prob) * 0.4
+
+        hammer_conf = self.hammer_conf + np.where(self.rsi < params.hammer_rsi, params.hammer_rsi_boost, 0.0)
+        hammer_final = hammer_conf * 0.6 + ml + self.regime_modifier("STRAT_SCALP_HAMMER")
+        hammer_ok = self.hammer & (hammer_final > params.confidence_gate)
+        if not governance.is_allowed("STRAT_SCALP_HAMMER"):
+            hammer_ok[:] = False
+
+        mom_final = params.momentum_conf * 0.6 + ml + self.regime_modifier("STRAT_MOMENTUM_V1")
+        mom_ok = (self.macd > 0) & (self.rsi > params.momentum_rsi) & (mom_final > params.confidence_gate)
+        if not governance.is_allowed("STRAT_MOMENTUM_V1"):
+            mom_ok[:] = False
+
+        conf = np.where(hammer_ok, np.minimum(hammer_final, 0.99), mom_final)
+        signal = (hammer_ok | mom_ok) & self.eligible & (conf >= 0.6)
+        idx = np.flatnonzero(signal)
+        return idx, conf[idx]
+
+    def exits(self, sl_pct: float, tp_pct: float, max_hold: Optional[int] = None):
+        """
+        Plan A exit (bar, level, reason) for a long entry signalled at EVERY bar.
+        Cached per bracket so a grid only rescans when SL/TP change.
+        """
+        key = (sl_pct, tp_pct, max_hold)
+        if key not in self._exit_cache:
+            sig = np.arange(self.n - 1)
+            sl = self.close[sig] * (1 - sl_pct)
+            tp = self.close[sig] * (1 + tp_pct)
+            self._exit_cache[key] = first_exits(self.open, self.high, self.low, self.close, sig + 1, sl, tp, max_hold)
+        return self._exit_cache[key]
+
+def first_exits(o, h, l, c, entry_idx, sl, tp, max_hold=None, block=32):
+    """
+    First bar at/after each entry where the Plan A bracket triggers, in the
+    same order as OrderManager.check_plan_a is applied by the replay engine:
+    gap at the open, then SL against the low, then TP against the high.
+    Scans forward in growing column blocks; rows drop out as soon as they resolve.
+    """
+    n = len(c)
+    m = len(entry_idx)
+    exit_idx = np.full(m, -1, dtype=np.int64)
+    exit_px = np.full(m, np.nan)
+    reason = np.full(m, REASON_END, dtype=np.int8)
+    horizon = n if max_hold is None else max_hold
+
+    pending = np.arange(m)
+    offset = 0
+    while len(pending) and offset < horizon:
+        width = min(block, horizon - offset)
+        cols = entry_idx[pending, None] + offset + np.arange(width)
+        valid = cols < n
+        safe = np.minimum(cols, n - 1)
+        O, L, H = o[safe], l[safe], h[safe]
+        s, t = sl[pending, None], tp[pending, None]
+
+        gap_sl = O <= s
+        gap_tp = ~gap_sl & (O >= t)
+        gap = gap_sl | gap_tp
+        hit_sl = ~gap & (L <= s)
+        hit_tp = ~gap & ~hit_sl & (H >= t)
+        hit = (gap | hit_sl | hit_tp) & valid
+
+        found = hit.any(axis=1)
+        r = np.flatnonzero(found)
+        k = hit[r].argmax(axis=1)
+        rows = pending[r]
+        exit_idx[rows] = cols[r, k]
+        exit_px[rows] = np.where(gap[r, k], O[r, k], np.where(hit_sl[r, k], s[r, 0], t[r, 0]))
+        reason[rows] = np.where(gap_sl[r, k] | hit_sl[r, k], REASON_SL, REASON_TP)
+
+        pending = pending[~found & (cols[:, -1] < n - 1)]
+        offset += width
+        block *= 2
+
+    # Unresolved: close at the last bar of data, or at the max-hold bar
+    open_rows = np.flatnonzero(exit_idx < 0)
+    last = entry_idx[open_rows] + horizon - 1
+    ended = last >= n - 1
+    exit_idx[open_rows] = np.where(ended, n - 1, last)
+    exit_px[open_rows] = c[exit_idx[open_rows]]
+    reason[open_rows] = np.where(ended, REASON_END, REASON_MAX_HOLD)
+    return exit_idx, exit_px, reason
+
+def trade_stats(pnls: np.ndarray, equity: np.ndarray, initial_capital: float) -> Dict[str, float]:
+    """
+    Numeric trade/equity statistics shared by both backtest modes.
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    total = len(pnls)
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls <= 0]
+    avg_win = wins.mean() if len(wins) else 0.0
+    avg_loss = losses.mean() if len(losses) else 0.0
+
+    equity = np.asarray(equity if len(equity) else [initial_capital], dtype=np.float64)
+    peak = np.maximum.accumulate(np.concatenate(([initial_capital], equity)))[1:]
+    rets = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.array([])
+    std = rets.std() if len(rets) > 1 else 0.0
+
+    return {
+        "total_trades": total,
+        "final_balance": float(initial_capital + pnls.sum()),
+        "win_rate": len(wins) / total * 100 if total else 0.0,
+        "risk_reward_ratio": abs(avg_win / avg_loss) if avg_loss != 0 else float('inf'),
+        "expectancy": (len(wins) * avg_win + len(losses) * avg_loss) / total if total else 0.0,
+        "max_drawdown": float(np.max((peak - equity) / peak)) * 100,
+        "sharpe": float(rets.mean() / std * math.sqrt(len(rets))) if std > 0 else 0.0,
+    }
+
+class VectorizedBacktest:
+    """
+    Signal-array mode of BacktestEngine.
+    Entries, Plan A exits, equity and metrics come from NumPy arrays; the only
+    Python loop walks the accepted trades to enforce one position at a time.
+    Long-only, like the strategies StrategySelector can propose.
+    """
+    def __init__(self, initial_capital: float, slippage_pct: float, commission_per_trade: float):
+        self.initial_capital = initial_capital
+        self.slippage_pct = slippage_pct
+        self.commission_per_trade = commission_per_trade
+
+    def simulate(self, arrays: SignalArrays, params: SignalParams, max_hold: Optional[int] = None) -> Dict[str, Any]:
+        from asr_trading.execution.risk_manager import RiskProfile
+        from asr_trading.brain.trust import trust_system
+
+        sig, conf = arrays.entries(params)
+        c = arrays.close
+
+        # RiskManager sizing (no vol scaling: selector proposals carry volatility=0)
+        size = np.floor(self.initial_capital * RiskProfile.max_capital_per_trade_pct / c[sig])
+        sized = size > 0 # Else REJECTED: "Capital insufficient for 1 lot"
+        sig, conf, size = sig[sized], conf[sized], size[sized]
+        trust_scalar = trust_system.get_sizing_scalar()
+        if trust_scalar != 1.0:
+            size = np.maximum(1, np.floor(size * trust_scalar))
+
+        exit_idx, exit_level, reason = arrays.exits(params.sl_pct, params.tp_pct, max_hold)
+        exit_idx, exit_level, reason = exit_idx[sig], exit_level[sig], reason[sig]
+
+        # One position at a time: the next signal must come on/after the exit bar
+        nxt = np.searchsorted(sig, exit_idx, side="left")
+        taken = []
+        i = 0
+        while i < len(sig):
+            taken.append(i)
+            i = nxt[i]
+        t = np.asarray(taken, dtype=np.int64)
+        qty = size[t]
+
+        entry_bar = sig[t] + 1
+        entry_px = arrays.open[entry_bar] * (1 + self.slippage_pct)
+        exit_bar = exit_idx[t]
+        rsn = reason[t]
+        exit_px = np.where(rsn == REASON_END, exit_level[t], exit_level[t] * (1 - self.slippage_pct))
+        pnl = (exit_px - entry_px) * qty - 2 * self.commission_per_trade
+
+        # Equity: realized PnL up to each bar + mark-to-market of the open trade
+        n = arrays.n
+        realized = np.zeros(n)
+        np.add.at(realized, exit_bar, pnl)
+        owner = np.zeros(n + 1, dtype=np.int64)
+        ids = np.arange(1, len(t) + 1)
+        np.add.at(owner, entry_bar, ids)
+        np.add.at(owner, exit_bar, -ids)
+        owner = np.cumsum(owner)[:n]
+        held = owner > 0
+        k = owner[held] - 1
+        open_pnl = np.zeros(n)
+        open_pnl[held] = (c[held] - entry_px[k]) * qty[k]
+        equity = self.initial_capital + np.cumsum(realized) + open_pnl
+
+        return {
+            "pnl": pnl,
+            "equity": equity,
+            "signal_bar": sig[t],
+            "entry_bar": entry_bar,
+            "exit_bar": exit_bar,
+            "entry_price": entry_px,
+            "exit_price": exit_px,
+            "quantity": qty.astype(np.int64),
+            "reason": rsn,
+            "confidence": conf[t],
+        }
+
+    def grid(self, arrays: SignalArrays, grid: Dict[str, List[Any]], base: Optional[SignalParams] = None,
+             max_hold: Optional[int] = None, rank_by: str = "sharpe") -> pd.DataFrame:
+        """
+        Evaluates every combination in `grid` (keys are SignalParams fields).
+        Returns one row per combination, best `rank_by` first.
+        """
+        keys = list(grid.keys())
+        rows = []
+        for params in expand_grid(grid, base):
+            sim = self.simulate(arrays, params, max_hold)
+            stats = trade_stats(sim["pnl"], sim["equity"], self.initial_capital)
+            rows.append({**{k: getattr(params, k) for k in keys}, **stats})
+        return pd.DataFrame(rows).sort_values(rank_by, ascending=False, kind="stable").reset_index(drop=True)
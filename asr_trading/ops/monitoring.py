@@ -2,6 +2,7 @@ import time
 from typing import Dict
 from asr_trading.core.logger import logger
 from asr_trading.core.avionics import telemetry
+from asr_trading.core.metrics import metrics_registry
 
 class MonitoringAgent:
     """
@@ -10,6 +11,7 @@ class MonitoringAgent:
     def __init__(self):
         self.start_time = time.time()
         self.metrics_buffer = {}
+        metrics_registry.gauge("asr_uptime_seconds", "System Uptime").set_function(lambda: time.time() - self.start_time)
 
     def get_system_health(self) -> Dict[str, str]:
         """
@@ -24,21 +26,15 @@ class MonitoringAgent:
 
     def record_latency(self, component: str, duration_ms: float):
         """
-        Records latency for SLO tracking.
+        Records latency for SLO tracking (histogram asr_latency_ms{component} via telemetry).
         """
         telemetry.record_metric("latency_ms", duration_ms, {"component": component})
         logger.debug(f"MONITOR: {component} latency {duration_ms}ms")
     
     def export_metrics_prometheus(self) -> str:
         """
-        Simulates a /metrics endpoint output.
+        Prometheus text exposition of the in-process metrics registry (served at /metrics).
         """
-        # Read from telemetry or memory
-        # Stub
-        output = []
-        output.append("# HELP asr_uptime_seconds System Uptime")
-        output.append("# TYPE asr_uptime_seconds gauge")
-        output.append(f"asr_uptime_seconds {time.time() - self.start_time}")
-        return "\n".join(output)
+        return metrics_registry.render()
 
 monitoring_agent = MonitoringAgent()
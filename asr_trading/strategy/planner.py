@@ -27,6 +27,9 @@ class PlannerEngine:
     The State Machine.
     Converts a Strategy Proposal into a Concrete Execution Plan (Plans A-J).
     """
+    def __init__(self, risk_manager=None):
+        # Backtests inject an isolated RiskManager; live uses the global gatekeeper
+        self.risk = risk_manager or risk_engine
     
     def generate_proposal(self, strategy_id: str, symbol: str, action: str, confidence: float, current_price: float) -> Optional['TradePlan']:
         """
@@ -57,7 +60,7 @@ class PlannerEngine:
         
         # 1. Consult Risk Manager
         # 18.3 Capital Preservation: Pass Volatility
-        risk = risk_engine.check_trade(
+        risk = self.risk.check_trade(
             proposal.symbol, 
             current_price, 
             proposal.strategy_id, 
@@ -25,13 +25,17 @@ class StrategyProposal:
 class StrategySelector:
     """
     Evaluates market state (Features + Patterns + Knowledge) to propose a Strategy.
+    alerts=False keeps monitoring alerts (Telegram) off, e.g. for backtest replays.
     """
-    def __init__(self):
+    def __init__(self, alerts: bool = True):
+        self.alerts = alerts
         self.monitoring_cache = {} # {symbol: timestamp}
         self.MONITOR_COOLDOWN = 300 # 5 minutes
 
     def _alert_monitoring(self, symbol: str, reason: str, features: Dict):
         """Async-safe trigger for monitoring alert"""
+        if not self.alerts:
+            return
         now = time.time()
         last_alert = self.monitoring_cache.get(symbol, 0)
         
@@ -184,6 +188,25 @@ class StrategySelector:
         try:
             # 1. Fetch Data (Enough for indicators)
             df = data_manager.get_history(symbol, period="3mo", interval="1d")
+        except Exception as e:
+            logger.error(f"Selector: Analysis failed for {symbol}: {e}")
+            return None
+        return self._analyze_history(symbol, df)
+
+    async def analyze_on_demand_async(self, symbol: str, data_manager) -> Optional[StrategyProposal]:
+        """
+        analyze_on_demand for callers on the event loop: the history fetch is awaited.
+        """
+        logger.info(f"Selector: Analyzing {symbol} on demand...")
+        try:
+            df = await data_manager.get_history_async(symbol, period="3mo", interval="1d")
+        except Exception as e:
+            logger.error(f"Selector: Analysis failed for {symbol}: {e}")
+            return None
+        return self._analyze_history(symbol, df)
+
+    def _analyze_history(self, symbol: str, df) -> Optional[StrategyProposal]:
+        try:
             if df.empty:
                 logger.warning(f"Selector: No data found for {symbol}")
                 return None
@@ -12,8 +12,12 @@ from asr_trading.core.config import cfg
 import time
 from asr_trading.core.logger import logger
 from asr_trading.web.telegram_bot import telegram_bot
-from asr_trading.core.avionics import avionics_monitor
+from asr_trading.core.avionics import avionics_monitor, telemetry
 from asr_trading.data.scheduler import scheduler_service
+from asr_trading.core.orchestrator import orchestrator
+from asr_trading.ops.monitoring import monitoring_agent
+from asr_trading.core.tracing import tracer
+from asr_trading.core.profiler import profiler, loop_monitor, ProfileBusy
 from asr_trading.core.cockpit import cockpit
 # Avoid circular imports where possible, but we need these engines
 from asr_trading.strategy.scalping import scalping_strategy
@@ -28,6 +32,7 @@ SYSTEM_STATE = {
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("CORE: Web Server Starting Up...")
+    loop_monitor.start() # Flags handlers that block the API loop
     
     # 1. Start Telegram Bot in Background
     # check if loop is running
@@ -106,7 +111,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown logic
     logger.info("CORE: Web Server Shutting Down...")
+    loop_monitor.stop()
     scheduler_service.stop()
+    from asr_trading.core.io_pool import io_pool
+    await io_pool.close()
+    telemetry.close() # Flush buffered metrics
+    tracer.flush()
     # telegram bot shutdown is handled by the object itself mostly, 
     # but strictly we should cancel the task if we had the handle.
     # For now, relying on process exit.
@@ -122,6 +132,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus scrape target (in-process metrics registry)
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(monitoring_agent.export_metrics_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Span latency percentiles (p50/p95/p99 per stage) and recent spans
+@app.get("/api/trace/stats")
+async def get_trace_stats(name: str = None):
+    return {"spans": tracer.stats(name), "sample_rate": tracer.sample_rate}
+
+@app.get("/api/trace/recent")
+async def get_recent_spans(limit: int = 100, trace_id: str = None):
+    return {"spans": tracer.recent(limit, trace_id)}
+
+# On-demand profiling (artifact written to cfg.PROFILE_DIR) and event-loop stalls
+@app.post("/api/admin/profile")
+async def run_profile(duration: float = 10.0, mode: str = "sample", interval_ms: float = None):
+    loops = {"api": asyncio.get_running_loop(), "cycle-scheduler": scheduler_service.cycles.loop}
+    try:
+        return await profiler.run(duration, mode=mode, interval_ms=interval_ms, loops=loops)
+    except ProfileBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/admin/loop-lag")
+async def get_loop_lag():
+    return loop_monitor.stats()
+
 # --- 17-POINT API CONTRACT IMPLEMENTATION ---
 
 # A. SYSTEM STATUS
@@ -259,7 +298,9 @@ async def get_current_setup():
     return {
         "symbols": cfg.WATCHLIST,
         "detail": cockpit.monitored_setup,
-        "running": scheduler_service.is_running
+        "running": scheduler_service.is_running,
+        "last_cycle": scheduler_service.cycles.last_report.to_dict() if scheduler_service.cycles.last_report else None,
+        "pipeline": orchestrator.pipeline_stats()
     }
 
 @app.post("/api/settings/watchlist")
@@ -281,6 +322,7 @@ async def get_last_rejected():
 
 # E. MANUAL & PAPER TRADING
 @app.post("/api/trade/paper")
+@tracer.trace("api.trade.paper")
 async def execute_paper_trade(trade: dict = {}):
     """
     10. Execute Paper Trade (Via Real Framework)
@@ -375,6 +417,7 @@ async def execute_paper_trade(trade: dict = {}):
     }
 
 @app.post("/api/trade/validate")
+@tracer.trace("api.trade.validate")
 async def validate_manual_trade(trade: dict = {}):
     """
     8. Smart Manual Trade Validation (Unified Execution Check)
@@ -384,15 +427,24 @@ async def validate_manual_trade(trade: dict = {}):
     symbol = trade.get("symbol")
     action = trade.get("action", "BUY")
     confidence = float(trade.get("confidence", 0.0))
-    current_price = trade.get("price", 100.0)
+    current_price = trade.get("price")
     
     # 1. Generate Proposal via Real Analysis (Master Prompt Requirement)
     from asr_trading.strategy.planner import planner_engine
     from asr_trading.strategy.selector import strategy_selector
     from asr_trading.data.ingestion import data_manager 
+    from asr_trading.data.quote_cache import quote_cache
+
+    if current_price is None:
+        try:
+            current_price = await quote_cache.last_price_async(symbol)
+        except Exception as e:
+            logger.warning(f"Trade Validate: Market data fetch failed for {symbol}: {e}")
+    if current_price is None:
+        current_price = 100.0 # Legacy default when no price is available
     
-    # Analyze Market State
-    analysis = strategy_selector.analyze_on_demand(symbol, data_manager)
+    # Analyze Market State (history is awaited: never block the event loop on the shared cache)
+    analysis = await strategy_selector.analyze_on_demand_async(symbol, data_manager)
     
     if analysis:
         # Use System Conclusioin
@@ -453,6 +505,7 @@ async def validate_manual_trade(trade: dict = {}):
     }
 
 @app.post("/api/trade/live")
+@tracer.trace("api.trade.live")
 async def execute_live_trade(trade: dict = {}):
     """11. Execute Live Trade (Unified Flow)"""
     if not trade.get("confirm"):
@@ -524,6 +577,7 @@ async def get_pending_trades():
     return pending_list
 
 @app.post("/api/trade/approve/{plan_id}")
+@tracer.trace("api.trade.approve")
 async def approve_trade(plan_id: str):
     """12c. Approve Pending Trade"""
     from asr_trading.execution.execution_manager import execution_manager
@@ -535,6 +589,7 @@ async def approve_trade(plan_id: str):
     return res
 
 @app.post("/api/trade/reject/{plan_id}")
+@tracer.trace("api.trade.reject")
 async def reject_trade(plan_id: str):
     """12d. Reject Pending Trade"""
     from asr_trading.execution.execution_manager import execution_manager
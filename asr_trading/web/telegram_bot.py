@@ -37,6 +37,7 @@ class TelegramAdminBot:
             self.app.add_handler(CommandHandler("start", self._start))
             self.app.add_handler(CommandHandler("help", self._start))
             self.app.add_handler(CommandHandler("status", self._status))
+            self.app.add_handler(CommandHandler("profile", self._profile))
             
             # Mode Commands (Explicit)
             self.app.add_handler(CommandHandler("paper", self._set_paper_mode))
@@ -117,16 +118,15 @@ class TelegramAdminBot:
         # We can reuse the snippet from linguistics or call a proper price fetcher
         # For reliability, let's assume Planner can handle volatility=0, but price is needed.
         # We will fetch a rough price from yfinance here to pass to planner.
-        import yfinance as yf
+        from asr_trading.data.quote_cache import quote_cache
         ticker_map = {"NIFTY": "^NSEI", "BANKNIFTY": "^NSEBANK", "RELIANCE": "RELIANCE.NS"}
         yf_sym = ticker_map.get(symbol, f"{symbol}.NS")
         
         try:
-             data = yf.Ticker(yf_sym).history(period="1d")
-             if data.empty:
+             current_price = await quote_cache.last_price_async(yf_sym)
+             if current_price is None:
                  await update.message.reply_text("⚠️ Market data unavailable.")
                  return
-             current_price = data['Close'].iloc[-1]
         except:
              current_price = 100.0 # Fallback for offline testing
              
@@ -266,6 +266,22 @@ class TelegramAdminBot:
         )
         await update.message.reply_text(msg)
 
+    async def _profile(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """
+        /profile [seconds] - sample the live engine and report the hottest frames.
+        """
+        if not await self._check_auth(update): return
+        from asr_trading.core.profiler import profiler, ProfileBusy
+        seconds = float(context.args[0]) if context.args and context.args[0].replace(".", "", 1).isdigit() else 10.0
+        await update.message.reply_text(f"⏱ Profiling for {seconds:.0f}s...")
+        try:
+            result = await profiler.run(seconds, mode="sample", top=8)
+        except ProfileBusy as e:
+            await update.message.reply_text(f"⚠️ {e}")
+            return
+        lines = "\n".join(f"{r['samples']:>5}  {r['frame']}" for r in result["top"])
+        await update.message.reply_text(f"🔥 Top frames ({result['samples']} samples)\n{lines}\n\nSaved: {result['path']}")
+
     # --- PROACTIVE NOTIFICATIONS ---
     def _format_trade_msg(self, data: dict, title: str) -> str:
         """
@@ -0,0 +1,10 @@
+"""
+Throughput benchmarks for the trading hot paths.
+
+    python -m benchmarks              # run and compare against baselines/baseline.json
+    python -m benchmarks --save       # record a new baseline
+    python -m benchmarks -k cycle     # only cases whose name contains "cycle"
+
+Cases live in bench_*.py modules (see harness.bench). Timings are only comparable
+on the machine that recorded the baseline; re-record it (--save) when the hardware changes.
+"""
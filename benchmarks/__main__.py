@@ -0,0 +1,68 @@
+"""
+python -m benchmarks [-k FILTER] [--save] [--tolerance 0.5] ...
+
+Exits 1 when a case is slower than its stored baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.harness import compare, load_baseline, load_cases, run_benchmarks, save_baseline
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Trading hot-path benchmarks.")
+    parser.add_argument("-k", "--filter", help="Only run cases whose name contains this string")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per round (iterations are calibrated to it)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown before failing (0.5 = 50%%)")
+    parser.add_argument("--stat", choices=("min_us", "median_us"), default="min_us", help="Statistic compared against the baseline")
+    parser.add_argument("--json", dest="json_out", help="Also write the raw results to this file")
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in sorted(load_cases().values(), key=lambda c: (c.group, c.name)):
+            print(f"{case.group:<10}{case.name}")
+        return 0
+
+    print(f"{'benchmark':<30}{'median us':>12}{'min us':>12}{'stddev':>10}{'ops/s':>12}{'iters':>9}")
+    def show(r):
+        print(f"{r.name:<30}{r.median_us:>12.2f}{r.min_us:>12.2f}{r.stddev_us:>10.2f}{r.ops_per_sec:>12,.0f}{r.iterations:>9}", flush=True)
+    results = run_benchmarks(args.filter, rounds=args.rounds, min_time=args.min_time, on_result=show)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump([r.to_dict() for r in results], f, indent=2)
+
+    if args.save:
+        save_baseline(results, args.baseline, merge=bool(args.filter))
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save to create one.")
+        return 0
+
+    rows = compare(results, load_baseline(args.baseline), args.tolerance, args.stat)
+    print(f"\nvs. {args.baseline} ({args.stat}, tolerance {args.tolerance:.0%})")
+    print(f"{'benchmark':<30}{'baseline us':>12}{'now us':>12}{'change':>9}  status")
+    for row in rows:
+        base = f"{row['baseline_us']:>12.2f}" if "baseline_us" in row else f"{'-':>12}"
+        change = f"{row['change']:>+9.1%}" if "change" in row else f"{'-':>9}"
+        print(f"{row['name']:<30}{base}{row['now_us']:>12.2f}{change}  {row['status']}")
+
+    regressed = [row["name"] for row in rows if row["status"] == "REGRESSED"]
+    if regressed:
+        print(f"\nFAIL: {len(regressed)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressed)}")
+        return 1
+    print(f"\nOK: no regressions beyond {args.tolerance:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+from asr_trading.analysis.features import WindowEngine, IndicatorLib
+from asr_trading.analysis.kernels import kernel_cache
+from asr_trading.analysis.patterns import CandleMatcher
+from benchmarks.harness import bench
+from benchmarks.synthetic import random_walk_bars, bars_frame
+
+@bench("window.add_ohlc", group="analysis")
+def window_add_ohlc(b):
+    engine = WindowEngine(window_size=500)
+    bars = random_walk_bars(n=1000)
+    engine.add_ohlc_batch(bars)
+    bar = bars[-1]
+    b(engine.add_ohlc, bar)
+
+@bench("window.get_dataframe", group="analysis")
+def window_get_dataframe(b):
+    engine = WindowEngine(window_size=500)
+    engine.add_ohlc_batch(random_walk_bars(n=500))
+    b(engine.get_dataframe, "BENCH")
+
+@bench("indicators.compute_all", group="analysis")
+def indicators_compute_all(b):
+    df = bars_frame(random_walk_bars(n=500))
+
+    def cold():
+        # Fresh frame and empty kernel cache: the per-bar cost, not a cache hit
+        kernel_cache.clear()
+        IndicatorLib.compute_all(df.copy())
+    b(cold)
+
+@bench("patterns.detect", group="analysis")
+def patterns_detect(b):
+    df = bars_frame(random_walk_bars(n=500))
+    b(CandleMatcher.detect, df)
@@ -0,0 +1,30 @@
+import os
+import tempfile
+import time
+from asr_trading.core.avionics import Telemetry
+from asr_trading.core.security import AuditLedger
+from asr_trading.data.canonical import Tick
+from asr_trading.data.normalizer import Normalizer
+from benchmarks.harness import bench
+
+@bench("normalizer.cross_validate", group="core")
+def cross_validate(b):
+    now = time.time()
+    ticks = [Tick(symbol="BENCH", timestamp=now, bid=p - 0.05, ask=p + 0.05, last=p, volume=1000,
+                  source=f"SRC{i}", sequence=i) for i, p in enumerate((100.0, 100.02, 99.99))]
+    b(Normalizer().cross_validate, ticks)
+
+@bench("telemetry.record_metric", group="core")
+def record_metric(b):
+    with tempfile.TemporaryDirectory() as tmp:
+        t = Telemetry(log_path=os.path.join(tmp, "metrics.jsonl"), bridge=False)
+        try:
+            b(t.record_metric, "bench.latency_ms", 1.5, {"symbol": "BENCH"})
+        finally:
+            t.close()
+
+@bench("audit_ledger.record_event", group="core")
+def ledger_record_event(b):
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = AuditLedger(ledger_file=os.path.join(tmp, "audit_ledger.jsonl"))
+        b(ledger.record_event, "ORDER_PLACED", "bench", {"symbol": "BENCH", "qty": 10, "price": 100.0})
@@ -0,0 +1,28 @@
+from unittest.mock import patch
+from asr_trading.core import orchestrator as orch_module
+from asr_trading.core.config import cfg
+from asr_trading.data.bar_aggregator import BarAggregator
+from asr_trading.data.feed_manager import FeedManager
+from asr_trading.execution.execution_manager import ExecutionManager
+from asr_trading.execution.paper_adapter import PaperAdapter
+from benchmarks.harness import bench
+from benchmarks.synthetic import SyntheticProvider
+
+@bench("orchestrator.run_cycle", group="cycle")
+def run_cycle(b):
+    """
+    One full cycle per call (fetch -> bar close -> features -> strategy -> plan ->
+    paper fill) against a synthetic feed and a zero-latency PaperAdapter.
+    """
+    feeds = FeedManager()
+    feeds.stale_threshold = float("inf") # Replayed history is timestamped in the past
+    feeds.register_provider("PRIMARY", SyntheticProvider())
+    execution = ExecutionManager()
+    execution.set_brokers(PaperAdapter(latency=0), None)
+    orch = orch_module.Orchestrator(aggregator=BarAggregator(intervals=(cfg.FEATURE_INTERVAL,)))
+
+    with patch.object(orch_module, "feed_manager", feeds), \
+         patch.object(orch_module, "execution_manager", execution), \
+         patch.object(cfg, "EXECUTION_TYPE", "AUTO"):
+        b.warmup = 200 # Past the feature warmup and into the steady trend
+        b.run_async(orch.run_cycle, "BENCH")
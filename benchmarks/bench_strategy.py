@@ -0,0 +1,50 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from asr_trading.analysis.features import IndicatorLib
+from asr_trading.brain.learning import BrainStem
+from asr_trading.execution.risk_manager import RiskManager
+from asr_trading.strategy.selector import StrategySelector
+from benchmarks.harness import bench
+from benchmarks.synthetic import random_walk_bars, bars_frame
+
+def _features():
+    df = IndicatorLib.compute_all(bars_frame(random_walk_bars(n=200)))
+    features = {k: float(v) for k, v in df.iloc[-1].items()}
+    features.update({"MACD": 0.5, "RSI": 60.0}) # Momentum branch: the full selector path
+    return features
+
+@bench("strategy.select_strategy", group="strategy")
+def select_strategy(b):
+    selector = StrategySelector()
+    selector.MONITOR_COOLDOWN = float("inf") # No monitoring alerts from the timed loop
+    b(selector.select_strategy, "BENCH", _features(), [], [])
+
+@bench("risk.check_trade", group="strategy")
+def check_trade(b):
+    rm = RiskManager()
+    b(rm.check_trade, "BENCH", 100.0, "STRAT_MOMENTUM_V1", 0.8, 0.002)
+
+def _trained_brain(tmp, backend=None):
+    brain = BrainStem(model_path=os.path.join(tmp, "brain.joblib"), backend=backend)
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.normal(size=(500, 5)) * [10, 1, 1, 50, 0.01] + [50, 0, 1, 100, 0.002], columns=brain.feature_columns)
+    df["outcome"] = (df["RSI"] + rng.normal(size=500) * 5 > 50).astype(int)
+    brain.train(df)
+    return brain
+
+@bench("brain.predict_win_probability", group="strategy")
+def brain_predict(b):
+    with tempfile.TemporaryDirectory() as tmp:
+        b(_trained_brain(tmp).predict_win_probability, _features())
+
+@bench("brain.predict_many_50", group="strategy")
+def brain_predict_many(b):
+    with tempfile.TemporaryDirectory() as tmp:
+        b(_trained_brain(tmp).predict_many, [_features()] * 50)
+
+@bench("brain.predict_many_50[sklearn]", group="strategy")
+def brain_predict_many_sklearn(b):
+    with tempfile.TemporaryDirectory() as tmp:
+        b(_trained_brain(tmp, backend="sklearn").predict_many, [_features()] * 50)
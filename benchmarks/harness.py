@@ -0,0 +1,216 @@
+"""
+Minimal pytest-benchmark-style harness.
+
+A case is a function registered with @bench that receives a `Bench` and calls it
+with the code under test, e.g.
+
+    @bench("risk.check_trade", group="strategy")
+    def check_trade(b):
+        rm = RiskManager()
+        b(rm.check_trade, "BENCH", 100.0, "STRAT", 0.8)
+
+Setup done in the case body is not timed. Bench calibrates an iteration count
+so one round lasts at least `min_time`, then times `rounds` rounds and keeps
+per-call statistics.
+"""
+import asyncio
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import platform
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+@dataclass
+class BenchResult:
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    min_us: float
+    median_us: float
+    mean_us: float
+    stddev_us: float
+    ops_per_sec: float
+
+    def to_dict(self) -> Dict:
+        return {k: (round(v, 3) if isinstance(v, float) else v) for k, v in asdict(self).items()}
+
+@dataclass
+class BenchCase:
+    name: str
+    group: str
+    func: Callable
+
+REGISTRY: Dict[str, BenchCase] = {}
+
+def bench(name: str, group: str = "misc"):
+    def decorator(func):
+        if name in REGISTRY:
+            raise ValueError(f"Benchmark {name} registered twice")
+        REGISTRY[name] = BenchCase(name, group, func)
+        return func
+    return decorator
+
+def load_cases():
+    """
+    Imports every benchmarks/bench_*.py module so their @bench cases register.
+    """
+    import benchmarks
+    for info in pkgutil.iter_modules(benchmarks.__path__):
+        if info.name.startswith("bench_"):
+            importlib.import_module(f"benchmarks.{info.name}")
+    return REGISTRY
+
+class Bench:
+    def __init__(self, case: BenchCase, rounds: int = 5, min_time: float = 0.05, max_iterations: int = 1_000_000):
+        self.case = case
+        self.rounds = rounds
+        self.min_time = min_time
+        self.max_iterations = max_iterations
+        self.warmup = 1 # Untimed calls before calibration; stateful cases raise it to reach steady state
+        self.result: Optional[BenchResult] = None
+
+    def __call__(self, func: Callable, *args, **kwargs):
+        """
+        Times a plain callable.
+        """
+        def run(n: int) -> float:
+            start = time.perf_counter()
+            for _ in range(n):
+                func(*args, **kwargs)
+            return time.perf_counter() - start
+        return self._measure(run)
+
+    def run_async(self, func: Callable, *args, **kwargs):
+        """
+        Times a coroutine function; all iterations of a round run inside one loop pass.
+        """
+        loop = asyncio.new_event_loop()
+
+        async def body(n: int) -> float:
+            start = time.perf_counter()
+            for _ in range(n):
+                await func(*args, **kwargs)
+            return time.perf_counter() - start
+
+        try:
+            return self._measure(lambda n: loop.run_until_complete(body(n)))
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def _measure(self, run: Callable[[int], float]) -> BenchResult:
+        run(self.warmup) # Imports, caches, first-call allocation
+        n = 1
+        while n < self.max_iterations:
+            if run(n) >= self.min_time:
+                break
+            n *= 2
+        per_call = [run(n) / n * 1e6 for _ in range(self.rounds)]
+        median = statistics.median(per_call)
+        self.result = BenchResult(
+            name=self.case.name,
+            group=self.case.group,
+            rounds=self.rounds,
+            iterations=n,
+            min_us=min(per_call),
+            median_us=median,
+            mean_us=statistics.fmean(per_call),
+            stddev_us=statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+            ops_per_sec=1e6 / median if median > 0 else float("inf")
+        )
+        return self.result
+
+@contextmanager
+def isolated():
+    """
+    Keeps benchmark runs off the real artifacts: global telemetry goes to a temp
+    file and INFO logging (one line per simulated order) is muted.
+    """
+    from asr_trading.core.avionics import telemetry
+    from asr_trading.core.logger import logger
+    level, log_path = logger.level, telemetry.log_path
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry.flush()
+        telemetry.log_path = os.path.join(tmp, "metrics.jsonl")
+        logger.setLevel(logging.WARNING)
+        try:
+            yield
+        finally:
+            telemetry.flush()
+            telemetry.log_path = log_path
+            logger.setLevel(level)
+
+def run_benchmarks(filter: Optional[str] = None, rounds: int = 5, min_time: float = 0.05,
+                   on_result: Optional[Callable[[BenchResult], None]] = None) -> List[BenchResult]:
+    results = []
+    cases = sorted(load_cases().values(), key=lambda c: (c.group, c.name))
+    with isolated():
+        for case in cases:
+            if filter and filter not in case.name:
+                continue
+            b = Bench(case, rounds=rounds, min_time=min_time)
+            case.func(b)
+            if b.result is None:
+                raise RuntimeError(f"Benchmark {case.name} never called its Bench")
+            results.append(b.result)
+            if on_result:
+                on_result(b.result)
+    return results
+
+# --- Baselines ---
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "node": platform.node()
+    }
+
+def save_baseline(results: List[BenchResult], path: str, merge: bool = False):
+    """
+    merge=True keeps the stored cases that were not re-measured (partial runs).
+    """
+    stored = load_baseline(path).get("benchmarks", {}) if merge and os.path.exists(path) else {}
+    stored.update({r.name: r.to_dict() for r in results})
+    data = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "benchmarks": stored
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_baseline(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results: List[BenchResult], baseline: Dict, tolerance: float, stat: str = "min_us") -> List[Dict]:
+    """
+    Time per call vs. the baseline on `stat` (min_us by default: the least noisy
+    estimate on a shared machine; median_us is the alternative). A case regresses
+    when it is more than `tolerance` (fraction) slower. Cases missing from the
+    baseline are reported as new.
+    """
+    rows = []
+    stored = baseline.get("benchmarks", {})
+    for r in results:
+        now = getattr(r, stat)
+        base = stored.get(r.name)
+        if base is None:
+            rows.append({"name": r.name, "status": "NEW", "now_us": now})
+            continue
+        change = now / base[stat] - 1.0 if base[stat] > 0 else 0.0
+        status = "REGRESSED" if change > tolerance else ("IMPROVED" if change < -tolerance else "OK")
+        rows.append({"name": r.name, "status": status, "now_us": now, "baseline_us": base[stat], "change": change})
+    return rows
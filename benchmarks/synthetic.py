@@ -0,0 +1,60 @@
+"""
+Deterministic synthetic market data and fakes for the benchmarks.
+"""
+import time
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from asr_trading.data.canonical import Tick, OHLC
+from asr_trading.data.feed_manager import FeedProvider
+
+def random_walk_bars(symbol: str = "BENCH", n: int = 500, start_ts: float = None, interval_sec: int = 60,
+                     price: float = 100.0, drift: float = 0.0002, seed: int = 7) -> List[OHLC]:
+    rng = np.random.default_rng(seed)
+    start_ts = start_ts if start_ts is not None else time.time() - n * interval_sec
+    closes = price * np.exp(np.cumsum(rng.normal(drift, 0.002, n)))
+    opens = np.concatenate([[price], closes[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, n)) * closes
+    bars = []
+    for i in range(n):
+        o, c = float(opens[i]), float(closes[i])
+        bars.append(OHLC(symbol=symbol, timestamp=start_ts + i * interval_sec, open=o,
+                         high=max(o, c) + float(spread[i]), low=min(o, c) - float(spread[i]),
+                         close=c, volume=int(rng.integers(1_000, 10_000)), interval="1m"))
+    return bars
+
+def bars_frame(bars: List[OHLC]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": [b.timestamp for b in bars],
+        "open": [b.open for b in bars],
+        "high": [b.high for b in bars],
+        "low": [b.low for b in bars],
+        "close": [b.close for b in bars],
+        "volume": [b.volume for b in bars],
+    })
+
+class SyntheticProvider(FeedProvider):
+    """
+    Feed that replays a steady, low-volatility uptrend (the LOW_VOL_BULL regime,
+    where momentum proposals pass); every call is one minute later than the
+    last, so each orchestrator cycle closes a fresh bar.
+    """
+    def __init__(self, name: str = "SYNTH", drift: float = 0.0003, sigma: float = 0.0005, seed: int = 11, n: int = 100_000):
+        self.name = name
+        rng = np.random.default_rng(seed)
+        self.prices = 100.0 * np.exp(np.cumsum(rng.normal(drift, sigma, n)))
+        self.start_ts = time.time() - n * 60
+        self.i = 0
+
+    def get_name(self) -> str:
+        return self.name
+
+    async def connect(self):
+        pass
+
+    async def get_latest_tick(self, symbol: str) -> Optional[Tick]:
+        i = self.i % len(self.prices)
+        self.i += 1
+        last = float(self.prices[i])
+        return Tick(symbol=symbol, timestamp=self.start_ts + i * 60, bid=last - 0.01, ask=last + 0.01,
+                    last=last, volume=1_000 * (i + 1), source=self.name, sequence=i)
@@ -6,6 +6,8 @@ from asr_trading.data.scheduler import scheduler_service
 from asr_trading.data.feed_manager import feed_manager
 from asr_trading.data.providers.yahoo import YahooFinanceProvider
 from asr_trading.data.providers.polygon import PolygonProvider
+from asr_trading.data.tick_bus import tick_bus
+from asr_trading.data.bar_aggregator import bar_aggregator
 from asr_trading.strategy.scalping import scalping_strategy
 from asr_trading.execution.order_manager import order_engine
 from asr_trading.execution.risk_manager import risk_engine
@@ -16,11 +18,15 @@ async def main_loop():
     logger.info("ASR Trading Agent [MOONSHOT EDITION] Starting...")
     
     # --- DATA FEED INITIALIZATION ---
+    # Pushed ticks (Polygon websocket) keep the feed cache and Plan A brackets current between polls
+    feed_manager.attach_bus(tick_bus)
+    order_engine.attach_bus(tick_bus)
+    bar_aggregator.attach_bus(tick_bus)
     try:
         # 1. Primary Feed
         if cfg.POLYGON_API_KEY:
             logger.info("Initializing Polygon.io Feed...")
-            poly = PolygonProvider()
+            poly = PolygonProvider(symbols=cfg.WATCHLIST)
             await poly.connect()
             feed_manager.register_provider("PRIMARY", poly)
         else:
@@ -76,6 +82,8 @@ async def main_loop():
     
     from asr_trading.brain.llm_client import llm_brain
     from asr_trading.data.async_ingestion import data_nexus
+    from asr_trading.data.quote_cache import quote_cache
+    from asr_trading.data.ingestion import data_manager
     
     running = True
     while running:
@@ -101,7 +109,10 @@ async def main_loop():
                 sym = cmd.replace("/price", "").strip().upper()
                 if not sym: sym = "AAPL"
                 try:
-                    price = await data_nexus.get_live_price(sym)
+                    price = await quote_cache.last_price_async(sym)
+                    if price is None:
+                        # Multi-provider fallback
+                        price = await data_nexus.get_live_price(sym)
                     print(f" {sym}: ${price:.2f}")
                 except Exception as e:
                     print(f" Error fetching price: {e}")
@@ -112,7 +123,7 @@ async def main_loop():
                 syms = ["AAPL", "MSFT"] # Demo list
                 found = False
                 for s in syms:
-                    df = data_manager.get_history(s)
+                    df = await data_manager.get_history_async(s)
                     sig = scalping_strategy.analyze(df, s)
                     if sig.action != "HOLD":
                         found = True
@@ -123,6 +134,10 @@ async def main_loop():
             elif cmd == "/quit":
                 print("Shutting down...")
                 scheduler_service.stop()
+                from asr_trading.core.io_pool import io_pool
+                await io_pool.close()
+                from asr_trading.core.avionics import telemetry
+                telemetry.close() # Flush buffered metrics
                 running = False
                 
             else:
@@ -1,7 +1,11 @@
-import yfinance as yf
-import pandas as pd
+import asyncio
 import os
-import time
+import sys
+
+# Allow running as `python pipelines/scripts/fetch_history.py` from repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from asr_trading.core.storage.bar_store import bar_store
+from asr_trading.data.history_harvester import HistoryHarvester
 
 # Configuration
 DATA_DIR = "data/historical"
@@ -25,6 +29,8 @@ UNIVERSE = [
     "RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS", "NIFTYBEES.NS"
 ]
 
+LOOKBACK_DAYS = 5 * 365 # PERIOD in days (first run only; later runs are incremental)
+
 def fetch_data():
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
@@ -32,34 +38,27 @@ def fetch_data():
     print(f"=== Starting Data Harvest ===")
     print(f"Universe: {len(UNIVERSE)} symbols")
     print(f"Period: {PERIOD}, Interval: {INTERVAL}")
-    
-    success_count = 0
-    
+
+    # Seed the bar store from existing CSVs so only newer bars are downloaded
     for symbol in UNIVERSE:
-        print(f"Fetching {symbol}...", end=" ", flush=True)
-        try:
-            # Add delay to respect free tier roughly
-            time.sleep(0.5) 
-            
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=PERIOD, interval=INTERVAL)
-            
-            if df.empty:
-                print("EMPTY or FAILED.")
-                continue
-                
-            # Clean up
-            df.reset_index(inplace=True)
-            
-            # Save
+        path = os.path.join(DATA_DIR, f"{symbol}.csv")
+        if bar_store.last_timestamp(symbol, INTERVAL) is None and os.path.exists(path):
+            bar_store.import_csv(path, symbol, INTERVAL)
+
+    # Concurrent, rate-limited, incremental download into the bar store
+    harvester = HistoryHarvester()
+    results = asyncio.run(harvester.harvest(UNIVERSE, INTERVAL, LOOKBACK_DAYS))
+
+    success_count = 0
+    for symbol, result in results.items():
+        if isinstance(result, int):
+            # CSV kept for compatibility with older tools
             path = os.path.join(DATA_DIR, f"{symbol}.csv")
-            df.to_csv(path, index=False)
-            
-            print(f"OK ({len(df)} rows)")
+            rows = bar_store.export_csv(symbol, INTERVAL, path)
+            print(f"{symbol}: OK (+{result} new, {rows} rows)")
             success_count += 1
-            
-        except Exception as e:
-            print(f"ERROR: {e}")
+        else:
+            print(f"{symbol}: {result}")
 
     print(f"=== Harvest Complete ===")
     print(f"Success: {success_count}/{len(UNIVERSE)}")
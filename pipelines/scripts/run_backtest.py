@@ -0,0 +1,34 @@
+import os
+import sys
+import glob
+import json
+
+# Allow running as `python pipelines/scripts/run_backtest.py` from repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from asr_trading.execution.backtest import BacktestEngine
+
+# Configuration
+DATA_DIR = "data/historical"
+INITIAL_CAPITAL = 10000.0
+
+def run_all(symbols=None):
+    paths = sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))
+    if symbols:
+        paths = [p for p in paths if os.path.splitext(os.path.basename(p))[0] in symbols]
+
+    print(f"=== Backtesting {len(paths)} symbols ===")
+    results = []
+    for path in paths:
+        engine = BacktestEngine(initial_capital=INITIAL_CAPITAL)
+        try:
+            results.append(engine.run_file(path))
+        except Exception as e:
+            print(f"ERROR {path}: {e}")
+
+    for r in results:
+        print(json.dumps(r))
+    return results
+
+if __name__ == "__main__":
+    run_all(sys.argv[1:] or None)
@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+import argparse
+
+# Allow running as `python pipelines/scripts/run_sweep.py` from repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from asr_trading.execution.sweep import SweepRunner, historical_files
+from asr_trading.execution.vector_backtest import expand_grid
+
+# Default grid: selector thresholds x Plan A bracket
+DEFAULT_GRID = {
+    "hammer_rsi": [30, 35, 40, 45],
+    "momentum_rsi": [50, 55, 60],
+    "confidence_gate": [0.65, 0.7, 0.75],
+    "sl_pct": [0.005, 0.01, 0.02],
+    "tp_pct": [0.01, 0.02, 0.04],
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep over data/historical")
+    parser.add_argument("--out", default="data/sweeps/latest", help="Output dir (re-use it to resume)")
+    parser.add_argument("--grid", help="JSON file with {param: [values]} (default: built-in grid)")
+    parser.add_argument("--symbols", nargs="*", help="Subset of symbols (default: every CSV)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rank-by", default="sharpe")
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    runner = SweepRunner(out_dir=args.out, workers=args.workers, rank_by=args.rank_by)
+    table = runner.run(historical_files(symbols=args.symbols), expand_grid(grid))
+    print(table.head(20).to_string())
+
+if __name__ == "__main__":
+    main()
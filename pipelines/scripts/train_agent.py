@@ -8,27 +8,34 @@ sys.path.append(os.getcwd())
 
 from asr_trading.brain.learning import cortex
 from asr_trading.analysis.indicators import Indicators
+from asr_trading.analysis.kernels import ohlc_column, LOOKBACK_BARS
 from asr_trading.core.logger import logger
+from asr_trading.core.storage.bar_store import bar_store
 
 DATA_DIR = "data/historical"
+INTERVAL = "1d"
 MODEL_PATH = "model_registry/brain_model_v1.joblib"
 
 def train_agent():
     logger.info("=== Starting Agent Training ===")
     
-    # 1. Load Data
-    files = glob.glob(f"{DATA_DIR}/*.csv")
-    if not files:
+    # 1. Load Data (columnar bar store; CSVs only if the store is empty)
+    symbols = bar_store.symbols(INTERVAL)
+    if symbols:
+        sources = [(s, lambda s=s: bar_store.read_frame(s, INTERVAL)) for s in symbols]
+    else:
+        sources = [(f, lambda f=f: pd.read_csv(f)) for f in glob.glob(f"{DATA_DIR}/*.csv")]
+    if not sources:
         logger.error("No historical data found. Run 'python scripts/fetch_history.py' first.")
         return
 
-    logger.info(f"Found {len(files)} historical files.")
+    logger.info(f"Found {len(sources)} historical series.")
     
     master_df = pd.DataFrame()
     
-    for f in files:
+    for f, load in sources:
         try:
-            df = pd.read_csv(f)
+            df = load()
             if df.empty: continue
             
             # 2. Tech Analysis (Feature Engineering)
@@ -36,8 +43,9 @@ def train_agent():
             df = Indicators.add_all_indicators(df)
             
             # 3. Create Target (Auto-Labeling)
-            df['future_close'] = df['Close'].shift(-1)
-            df['outcome'] = (df['future_close'] > df['Close']).astype(int)
+            close = ohlc_column(df, "close")
+            df['future_close'] = close.shift(-1)
+            df['outcome'] = (df['future_close'] > close).astype(int)
             
             # Filter to required columns ONLY before dropping NaNs
             # BrainStem uses: RSI, MACDh_12_26_9, ATR, SMA_50
@@ -51,9 +59,9 @@ def train_agent():
 
             df = df[req_cols]
             
-            # Fill NaNs from indicators
+            # Indicators come back sanitized (warmup NaNs -> 0, as live); train on complete windows only
             before_drop = len(df)
-            df.dropna(inplace=True)
+            df = df.iloc[LOOKBACK_BARS - 1:].dropna()
             after_drop = len(df)
             
             print(f"Processed {os.path.basename(f)}: {before_drop} -> {after_drop} rows.")
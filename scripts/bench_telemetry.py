@@ -0,0 +1,64 @@
+"""
+Telemetry throughput: write-through (one file append per record, the old
+behaviour) vs. the buffered background writer.
+
+    python scripts/bench_telemetry.py [--records 50000] [--threads 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asr_trading.core.avionics import Telemetry
+
+def run(buffered: bool, records: int, threads: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        t = Telemetry(log_path=path, buffered=buffered)
+        per_thread = records // threads
+
+        def producer():
+            for i in range(per_thread):
+                t.record_metric("bench.tick", float(i), {"symbol": "AAPL", "source": "BENCH"})
+
+        workers = [threading.Thread(target=producer) for _ in range(threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        enqueue = time.perf_counter() - start
+        t.close()
+        total = time.perf_counter() - start
+        with open(path) as f:
+            lines = sum(1 for _ in f)
+        return {
+            "mode": "buffered" if buffered else "write-through",
+            "records": per_thread * threads,
+            "hot_path_rps": per_thread * threads / enqueue,
+            "end_to_end_rps": per_thread * threads / total,
+            "lines": lines,
+            "dropped": t.dropped,
+            "batches": t.batches
+        }
+    finally:
+        os.remove(path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    results = [run(False, args.records, args.threads), run(True, args.records, args.threads)]
+    print(f"{'mode':<14}{'records':>9}{'hot path rec/s':>16}{'end-to-end rec/s':>18}{'lines':>8}{'dropped':>9}{'batches':>9}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['records']:>9}{r['hot_path_rps']:>16,.0f}{r['end_to_end_rps']:>18,.0f}{r['lines']:>8}{r['dropped']:>9}{r['batches']:>9}")
+    print(f"hot path speedup: {results[1]['hot_path_rps'] / results[0]['hot_path_rps']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import unittest
+import unittest.mock
+import numpy as np
+import pandas as pd
+from asr_trading.execution.backtest import BacktestEngine, SimulatedFillModel, load_history_csv
+from asr_trading.execution.order_manager import OrderManager
+from asr_trading.execution.vector_backtest import SignalParams
+
+def synthetic_bars(n=300, seed=7):
+    """
+    Random-walk sawtooth (20-bar sell-offs then rebounds) with a hammer
+    planted at the bottom of every sell-off so the Hammer strategy fires.
+    """
+    rng = np.random.default_rng(seed)
+    drift = np.where(np.arange(n) % 40 < 20, -0.4, 0.4)
+    close = 50 + np.cumsum(drift + rng.normal(0, 0.3, n))
+    open_ = np.concatenate(([close[0]], close[:-1])) + rng.normal(0, 0.1, n)
+    high = np.maximum(open_, close) + rng.uniform(0.05, 0.5, n)
+    low = np.minimum(open_, close) - rng.uniform(0.05, 0.5, n)
+    bottoms = np.arange(19, n, 40)
+    open_[bottoms] = close[bottoms] - 0.3
+    high[bottoms] = close[bottoms]
+    low[bottoms] = open_[bottoms] - 1.5
+    return pd.DataFrame({
+        "timestamp": 1_600_000_000 + 86400.0 * np.arange(n),
+        "open": open_, "high": high, "low": low, "close": close,
+        "volume": np.full(n, 1000.0)
+    })
+
+class TestBacktestEngine(unittest.TestCase):
+    def test_plan_a_rule(self):
+        self.assertEqual(OrderManager.check_plan_a(99, 102, 98.5), "SL")
+        self.assertEqual(OrderManager.check_plan_a(99, 102, 102.5), "TP")
+        self.assertIsNone(OrderManager.check_plan_a(99, 102, 100))
+        self.assertEqual(OrderManager.check_plan_a(101, 98, 101.5, "SELL"), "SL")
+        self.assertEqual(OrderManager.check_plan_a(101, 98, 97.5, "SELL"), "TP")
+
+    def test_replay_is_deterministic_and_consistent(self):
+        df = synthetic_bars()
+        engine = BacktestEngine(initial_capital=10000.0, fill_model=SimulatedFillModel(slippage_pct=0.0))
+        first = engine.run("SYN", df)
+        log = list(engine.trade_log)
+        second = engine.run("SYN", df)
+
+        self.assertEqual(first, {**second, "elapsed_sec": first["elapsed_sec"]})
+        self.assertEqual(len(engine.equity_curve), len(df))
+        self.assertGreater(len(log), 0)
+        self.assertEqual(first["total_trades"], len(log))
+        self.assertAlmostEqual(first["final_balance"], round(10000.0 + sum(t["pnl"] for t in log), 2))
+
+        for t in log:
+            # Entries fill on a later bar than the signal; exits never precede entries
+            self.assertGreaterEqual(t["exit_ts"], t["entry_ts"])
+            self.assertIn(t["reason"], ("SL Hit", "TP Hit", "End of Data"))
+
+    def test_replay_leaves_live_selector_alone(self):
+        from asr_trading.strategy.selector import strategy_selector
+        cache = dict(strategy_selector.monitoring_cache)
+        with unittest.mock.patch.object(strategy_selector, "select_strategy") as live:
+            BacktestEngine().run("SYN", synthetic_bars())
+        live.assert_not_called()
+        self.assertEqual(strategy_selector.monitoring_cache, cache)
+
+    def test_empty_frame(self):
+        result = BacktestEngine().run("EMPTY", synthetic_bars().iloc[:0])
+        self.assertEqual(result["total_trades"], 0)
+        self.assertEqual(result["final_balance"], 10000.0)
+
+    def test_load_history_csv(self):
+        import tempfile, os
+        raw = synthetic_bars(5)
+        raw = raw.drop(columns=["timestamp"]).rename(columns=str.title)
+        raw.insert(0, "Date", ["2020-12-14 00:00:00-05:00", "2020-12-15 00:00:00-05:00",
+                               "2020-12-16 00:00:00-05:00", "2020-12-17 00:00:00-05:00",
+                               "2020-12-18 00:00:00-05:00"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "SYN.csv")
+            raw.to_csv(path, index=False)
+            df = load_history_csv(path)
+        self.assertEqual(list(df.columns), ["timestamp", "open", "high", "low", "close", "volume"])
+        self.assertEqual(df["timestamp"].iloc[0], 1607922000.0)
+        self.assertEqual(df["timestamp"].diff().iloc[1], 86400.0)
+
+class TestVectorizedBacktest(unittest.TestCase):
+    def test_matches_event_driven_replay(self):
+        df = synthetic_bars()
+        engine = BacktestEngine(initial_capital=10000.0, fill_model=SimulatedFillModel(commission_per_trade=0.5))
+        event = engine.run("SYN", df)
+        event_log, event_equity = engine.trade_log, engine.equity_curve
+        vector = engine.run_vectorized("SYN", df)
+
+        self.assertGreater(len(event_log), 0)
+        self.assertEqual({k: v for k, v in event.items() if k != "elapsed_sec"},
+                         {k: v for k, v in vector.items() if k != "elapsed_sec"})
+        for a, b in zip(event_log, engine.trade_log):
+            self.assertEqual((a["entry_ts"], a["exit_ts"], a["reason"]), (b["entry_ts"], b["exit_ts"], b["reason"]))
+            self.assertAlmostEqual(a["pnl"], b["pnl"], places=9)
+        np.testing.assert_allclose(event_equity, engine.equity_curve, rtol=1e-12)
+
+    def test_matches_event_driven_replay_with_trained_model(self):
+        import tempfile
+        from asr_trading.brain.learning import BrainStem, cortex
+        from asr_trading.execution.vector_backtest import SignalArrays
+        df = synthetic_bars()
+        # A model that likes oversold bars, trained on this frame's own features
+        history = pd.DataFrame(SignalArrays(df).feature_matrix(["RSI", "MACD", "ATR", "SMA_50", "Volatility"]),
+                               columns=["RSI", "MACD", "ATR", "SMA_50", "Volatility"])
+        history["outcome"] = (history["RSI"] < 50).astype(int)
+        with tempfile.TemporaryDirectory() as tmp:
+            brain = BrainStem(model_path=os.path.join(tmp, "brain.joblib"))
+            brain.train(history)
+            with unittest.mock.patch.object(cortex, "brain", brain):
+                engine = BacktestEngine(initial_capital=10000.0)
+                event = engine.run("SYN", df)
+                event_log = engine.trade_log
+                vector = engine.run_vectorized("SYN", df)
+                arrays = BacktestEngine._signal_arrays(df)
+
+        self.assertGreater(len(event_log), 0)
+        self.assertGreater(np.ptp(arrays.ml_prob), 0.1) # Real per-bar scores, not the 0.5 constant
+        self.assertEqual({k: v for k, v in event.items() if k != "elapsed_sec"},
+                         {k: v for k, v in vector.items() if k != "elapsed_sec"})
+        self.assertEqual([(t["entry_ts"], t["confidence"]) for t in event_log],
+                         [(t["entry_ts"], t["confidence"]) for t in engine.trade_log])
+
+    def test_grid_search(self):
+        grid = {"hammer_rsi": [30, 40, 50], "sl_pct": [0.01, 0.02], "confidence_gate": [0.6, 0.7]}
+        results = BacktestEngine().grid_search("SYN", synthetic_bars(), grid)
+        self.assertEqual(len(results), 12)
+        self.assertTrue(results["sharpe"].is_monotonic_decreasing)
+
+        # Any row re-run on its own gives the same numbers
+        row = results.iloc[0]
+        single = BacktestEngine().run_vectorized("SYN", synthetic_bars(), SignalParams(
+            hammer_rsi=row["hammer_rsi"], sl_pct=row["sl_pct"], confidence_gate=row["confidence_gate"]))
+        self.assertEqual(single["total_trades"], row["total_trades"])
+        self.assertAlmostEqual(single["final_balance"], round(row["final_balance"], 2))
+
+        with self.assertRaises(ValueError):
+            BacktestEngine().grid_search("SYN", synthetic_bars(), {"not_a_param": [1]})
+
+if __name__ == '__main__':
+    unittest.main()
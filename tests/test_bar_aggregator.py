@@ -0,0 +1,204 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pandas as pd
+from asr_trading.data.canonical import Tick
+from asr_trading.data.bar_aggregator import BarAggregator
+from asr_trading.data.providers import twelve_data
+from asr_trading.data.providers.polygon import PolygonProvider, PolygonStream
+from asr_trading.data.providers.yahoo import YahooFinanceProvider
+from asr_trading.data.tick_bus import TickBus
+
+T0 = 1_700_000_100.0 # 22:15:00 UTC, on a 1m/5m boundary
+
+def tick(ts, price, volume, seq=0, symbol="AAPL"):
+    return Tick(symbol, ts, price - 0.01, price + 0.01, price, volume, "TEST", seq or int(ts * 1000))
+
+class TestBarAggregator(unittest.TestCase):
+    def setUp(self):
+        self.agg = BarAggregator(intervals=("1m", "5m"), grace=2.0)
+        self.bars = []
+        self.agg.add_listener(self.bars.append)
+
+    def test_ohlcv_from_ticks(self):
+        for ts, price, vol in [(T0 + 1, 100.0, 1000), (T0 + 10, 101.5, 1200), (T0 + 20, 99.5, 1250), (T0 + 59, 100.5, 1400)]:
+            self.agg.on_tick(tick(ts, price, vol))
+        self.assertEqual(self.bars, []) # Still open
+        self.agg.on_tick(tick(T0 + 62.5, 100.7, 1450))
+
+        (bar,) = self.bars
+        self.assertEqual((bar.timestamp, bar.interval), (T0, "1m"))
+        self.assertEqual((bar.open, bar.high, bar.low, bar.close), (100.0, 101.5, 99.5, 100.5))
+        self.assertEqual(bar.volume, 400) # First tick only sets the baseline
+
+    def test_out_of_order_within_grace(self):
+        self.agg.on_tick(tick(T0 + 30, 101.0, 10))
+        self.agg.on_tick(tick(T0 + 60.5, 102.0, 20)) # Next bucket, but inside grace
+        self.agg.on_tick(tick(T0 + 5, 99.0, 5)) # Late: earlier than the open
+        self.agg.on_tick(tick(T0 + 61, 102.5, 30)) # Still inside grace
+        self.assertEqual(self.bars, [])
+        self.agg.on_tick(tick(T0 + 63, 103.0, 40))
+
+        (bar,) = self.bars
+        self.assertEqual((bar.open, bar.low, bar.close), (99.0, 99.0, 101.0))
+        self.assertEqual(self.agg.late_dropped, 0)
+
+    def test_late_tick_after_close_is_dropped(self):
+        self.agg.on_tick(tick(T0 + 30, 101.0, 10))
+        self.agg.on_tick(tick(T0 + 65, 102.0, 20))
+        self.agg.on_tick(tick(T0 + 40, 150.0, 15)) # 1m bucket already emitted
+        self.agg.flush(now=T0 + 300 + 3)
+
+        one_min = [b for b in self.bars if b.interval == "1m"]
+        five_min = [b for b in self.bars if b.interval == "5m"]
+        self.assertEqual(one_min[0].high, 101.0)
+        self.assertEqual(self.agg.late_dropped, 1)
+        self.assertEqual(five_min[0].high, 150.0) # The 5m bucket was still open
+
+    def test_flush_closes_quiet_symbols_and_skips_gaps(self):
+        self.agg.on_tick(tick(T0 + 1, 100.0, 10))
+        self.agg.on_tick(tick(T0 + 180, 101.0, 20))
+        self.agg.flush(now=T0 + 182.5)
+        self.assertEqual([(b.interval, b.timestamp) for b in self.bars], [("1m", T0)])
+        self.agg.flush(now=T0 + 302.5)
+        self.assertEqual([(b.interval, b.timestamp) for b in self.bars],
+                         [("1m", T0), ("1m", T0 + 180), ("5m", T0)])
+
+    def test_duplicate_tick_ignored(self):
+        t = tick(T0 + 1, 100.0, 10, seq=7)
+        self.agg.on_tick(t)
+        self.agg.on_tick(tick(T0 + 2, 100.0, 30, seq=8))
+        self.agg.on_tick(tick(T0 + 2, 100.0, 30, seq=8))
+        self.agg.flush(now=T0 + 400)
+        self.assertEqual(self.bars[0].volume, 20)
+
+def yahoo_poll(*bars):
+    """
+    Last row of a yfinance 1m history frame (exchange-local index, the newest bar
+    still forming), as the provider turns it into a Tick.
+    """
+    index = pd.DatetimeIndex([pd.Timestamp(ts, unit="s", tz="UTC") for ts, _, _ in bars]).tz_convert("America/New_York")
+    frame = pd.DataFrame({"Open": [p for _, p, _ in bars], "High": [p for _, p, _ in bars], "Low": [p for _, p, _ in bars],
+                          "Close": [p for _, p, _ in bars], "Volume": [v for _, _, v in bars]}, index=index)
+    return YahooFinanceProvider._row_to_tick("AAPL", frame.iloc[-1])
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    async def json(self):
+        return self.data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+def twelve_data_ticks(price, now):
+    provider = twelve_data.TwelveDataProvider()
+    provider.api_key = "K"
+    session = MagicMock()
+    session.get.return_value = FakeResponse({"AAPL": {"price": str(price)}, "MSFT": {"price": "300.0"}})
+    with patch.object(twelve_data, "io_pool", MagicMock(session=MagicMock(return_value=session))), \
+         patch.object(twelve_data, "time", MagicMock(time=MagicMock(return_value=now))):
+        return asyncio.run(provider.get_latest_ticks(["AAPL", "MSFT"]))
+
+class TestProviderVolume(unittest.TestCase):
+    def setUp(self):
+        self.agg = BarAggregator(intervals=("1m",), grace=2.0)
+        self.bars = []
+        self.agg.add_listener(self.bars.append)
+
+    def test_yahoo_bar_volume_with_twelve_data_failover(self):
+        self.agg.on_tick(yahoo_poll((T0 - 60, 99.0, 900), (T0, 100.0, 300)))
+        self.agg.on_tick(twelve_data_ticks(100.2, T0 + 30)["AAPL"]) # No volume, moves the watermark past the Yahoo stamp
+        self.agg.on_tick(yahoo_poll((T0 - 60, 99.0, 900), (T0, 100.5, 800))) # Same bar, grown
+        self.agg.on_tick(yahoo_poll((T0, 100.5, 1000), (T0 + 60, 101.0, 150))) # Next bar started
+        self.agg.on_tick(yahoo_poll((T0 + 60, 101.0, 150), (T0 + 120, 101.5, 50)))
+        self.agg.flush(now=T0 + 123)
+
+        self.assertEqual([(b.timestamp, b.volume) for b in self.bars], [(T0, 800), (T0 + 60, 150)])
+        self.assertEqual((self.bars[0].open, self.bars[0].high), (100.0, 100.5))
+
+    def test_twelve_data_has_no_volume(self):
+        for i, price in enumerate((100.0, 100.4, 99.8)):
+            self.agg.on_tick(twelve_data_ticks(price, T0 + 10 * (i + 1))["AAPL"])
+        self.agg.flush(now=T0 + 63)
+        (bar,) = self.bars
+        self.assertEqual((bar.high, bar.low, bar.volume), (100.4, 99.8, 0))
+
+    def test_polygon_stream_counter_and_rest_snapshot(self):
+        stream = PolygonStream("KEY", ["AAPL"], bus=TickBus())
+        trade = lambda s, size, q: stream._on_trade({"ev": "T", "sym": "AAPL", "p": 100.0 + s / 100, "s": size,
+                                                     "t": (T0 + s) * 1000, "q": q})
+        snapshot = SimpleNamespace(ticker="AAPL", last_quote=None, last_trade=SimpleNamespace(price=100.2),
+                                   day=SimpleNamespace(volume=5_000_000))
+        self.agg.on_tick(trade(5, 50, 1)) # The counter starts at 0 with the stream: counts in full
+        with patch("asr_trading.data.providers.polygon.time", MagicMock(time=MagicMock(return_value=T0 + 20))):
+            self.agg.on_tick(PolygonProvider._snapshot_to_tick(snapshot)) # Session total: baseline only
+        self.agg.on_tick(trade(30, 25, 2))
+        self.agg.on_tick(trade(70, 10, 3))
+        self.agg.flush(now=T0 + 123)
+
+        self.assertEqual([b.volume for b in self.bars], [75, 10])
+
+class TestOrchestratorBars(unittest.TestCase):
+    def test_features_only_see_closed_bars(self):
+        from asr_trading.core import orchestrator as orch_module
+        agg = BarAggregator(intervals=("1m",), grace=0.0)
+        orch = orch_module.Orchestrator(aggregator=agg)
+        ticks = [tick(T0 + s, 100.0 + s / 10, 100 + s) for s in (1, 20, 59, 61)]
+
+        with patch.object(orch_module.feature_engine, "on_ohlc", MagicMock(return_value={"status": "WARMUP"})) as on_ohlc, \
+             patch.object(orch_module.feed_manager, "get_tick") as get_tick, \
+             patch("asr_trading.data.bar_aggregator.time") as clock:
+            for t in ticks:
+                clock.time.return_value = t.timestamp
+                get_tick.return_value = asyncio.sleep(0, result=t)
+                asyncio.run(orch.run_cycle("AAPL"))
+
+        on_ohlc.assert_called_once()
+        bar = on_ohlc.call_args[0][0]
+        self.assertEqual((bar.open, bar.high, bar.close), (100.1, 105.9, 105.9))
+        self.assertEqual(bar.volume, 58)
+
+    def test_one_feature_batch_per_bar_boundary(self):
+        from asr_trading.analysis.features import FeatureEngine, IndicatorLib
+        from asr_trading.core import orchestrator as orch_module
+        from benchmarks.synthetic import random_walk_bars
+        agg = BarAggregator(intervals=("1m",), grace=0.0)
+        orch = orch_module.Orchestrator(aggregator=agg)
+        engine = FeatureEngine()
+        symbols = ("AAPL", "MSFT", "NVDA")
+        for i, sym in enumerate(symbols):
+            engine.add_ohlc_batch(random_walk_bars(sym, n=60, start_ts=T0 - 3600, seed=i))
+
+        with patch.object(orch_module, "feature_engine", engine), \
+             patch.object(orch_module.cfg, "FEATURE_BATCH_MIN_SYMBOLS", len(symbols)), \
+             patch.object(engine, "on_ohlc_many", wraps=engine.on_ohlc_many) as on_batch, \
+             patch.object(engine, "on_ohlc") as on_ohlc, \
+             patch("asr_trading.data.bar_aggregator.time") as clock:
+            clock.time.return_value = T0 + 30
+            for sym in symbols:
+                orch._analyze(sym, tick(T0 + 30, 101.0, 100, symbol=sym), orch_module.StageClock())
+            on_batch.assert_not_called() # Bars still open
+            clock.time.return_value = T0 + 61
+            orch._analyze("AAPL", tick(T0 + 61, 102.0, 200, symbol="AAPL"), orch_module.StageClock())
+
+        on_batch.assert_called_once()
+        on_ohlc.assert_not_called() # One vectorized pass, no per-bar streaming
+        self.assertEqual(sorted(b.symbol for b in on_batch.call_args[0][0]), sorted(symbols))
+        for sym in symbols:
+            result = orch.latest_features[sym]
+            self.assertEqual((result["status"], result["timestamp"]), ("READY", T0))
+            expected = IndicatorLib.compute_all(engine.window_engine.get_dataframe(sym)).iloc[-1]
+            np.testing.assert_allclose([result["features"][k] for k in expected.index], expected.to_numpy(dtype=float),
+                                       rtol=1e-9, atol=1e-9)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from asr_trading.core.storage.bar_store import BarStore, load_history_csv
+from asr_trading.analysis.features import WindowEngine, FeatureEngine, IndicatorLib
+
+def daily_bars(start="2020-11-02", n=200):
+    ts = (pd.date_range(start, periods=n, freq="D", tz="UTC") - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+    close = 100 + np.cumsum(np.sin(np.arange(n) / 7.0))
+    return pd.DataFrame({
+        "timestamp": ts.to_numpy(), "open": close - 0.5, "high": close + 1.0,
+        "low": close - 1.0, "close": close, "volume": np.arange(n, dtype=float)
+    })
+
+class TestBarStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BarStore(base_path=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_partitions_and_upsert(self):
+        bars = daily_bars()
+        self.store.append("SYN", "1d", bars.iloc[:120])
+        self.store.append("SYN", "1d", bars.iloc[100:]) # Overlaps 20 bars
+        self.assertEqual(self.store.partitions("SYN", "1d"), ["2020", "2021"])
+        self.assertEqual(self.store.symbols("1d"), ["SYN"])
+
+        out = self.store.read_frame("SYN", "1d")
+        pd.testing.assert_frame_equal(out, bars.reset_index(drop=True))
+        self.assertEqual(self.store.last_timestamp("SYN", "1d"), bars["timestamp"].iloc[-1])
+
+        # Corrected bar replaces the stored one
+        fix = bars.iloc[[150]].copy()
+        fix["close"] = 1.0
+        self.store.append("SYN", "1d", fix)
+        out = self.store.read_frame("SYN", "1d")
+        self.assertEqual(len(out), len(bars))
+        self.assertEqual(out["close"].iloc[150], 1.0)
+
+    def test_range_slicing_is_zero_copy_within_a_partition(self):
+        bars = daily_bars()
+        self.store.append("SYN", "1d", bars)
+        ts = bars["timestamp"].to_numpy()
+
+        cols = self.store.read("SYN", "1d", start=ts[70], end=ts[80]) # All in 2021
+        np.testing.assert_array_equal(cols["timestamp"], ts[70:80])
+        self.assertIsInstance(cols["close"].base, np.memmap)
+        self.assertFalse(cols["close"].flags.writeable)
+
+        cols = self.store.read("SYN", "1d", start=ts[50], end=ts[70]) # Spans 2020/2021
+        np.testing.assert_array_equal(cols["close"], bars["close"].to_numpy()[50:70])
+        self.assertEqual(len(self.store.read("SYN", "1d", start=ts[-1] + 1)["close"]), 0)
+
+    def test_writes_leave_mapped_readers_alone(self):
+        bars = daily_bars()
+        self.store.append("SYN", "1d", bars.iloc[:100])
+        ts = bars["timestamp"].to_numpy()
+        held = self.store.read("SYN", "1d", start=ts[70], end=ts[80]) # Mapped views on 2021
+        before = held["close"].copy()
+
+        for k in range(3):
+            fix = bars.iloc[70:80].copy()
+            fix["close"] = float(k)
+            self.store.append("SYN", "1d", fix)
+        np.testing.assert_array_equal(held["close"], before) # Old version untouched while mapped
+        np.testing.assert_array_equal(self.store.read("SYN", "1d", start=ts[70], end=ts[80])["close"], np.full(10, 2.0))
+
+        part = os.path.join(self.tmp.name, "SYN", "1d", "2021")
+        self.assertEqual(sorted(n for n in os.listdir(part) if n.startswith("v")), ["v000003", "v000004"])
+
+    def test_reads_and_upgrades_the_pre_versioning_layout(self):
+        bars = daily_bars()
+        part = os.path.join(self.tmp.name, "SYN", "1d", "2021")
+        os.makedirs(part)
+        in_2021 = bars[bars["timestamp"] >= pd.Timestamp("2021-01-01", tz="UTC").timestamp()]
+        for c in in_2021.columns:
+            np.save(os.path.join(part, f"{c}.npy"), in_2021[c].to_numpy(dtype=np.float64))
+        self.assertEqual(len(self.store.read_frame("SYN", "1d")), len(in_2021))
+
+        self.store.append("SYN", "1d", bars)
+        pd.testing.assert_frame_equal(self.store.read_frame("SYN", "1d"), bars)
+        self.assertEqual(sorted(os.listdir(part)), ["CURRENT", "v000001"])
+
+    def test_engines_and_csv_roundtrip(self):
+        bars = daily_bars()
+        self.store.append("SYN", "1d", bars)
+
+        engine = WindowEngine(window_size=100)
+        self.assertEqual(self.store.load_into(engine, "SYN", "1d"), 200)
+        np.testing.assert_array_equal(engine.get_arrays("SYN")["close"], bars["close"].to_numpy()[-100:])
+        features = FeatureEngine()
+        self.assertEqual(self.store.load_into(features, "SYN", "1d"), 200)
+        self.assertEqual(features.streaming.states["SYN"].bars, 200) # Reseeded over the loaded window
+
+        kernels = self.store.kernels("SYN", "1d")
+        expected = IndicatorLib.compute_all(bars.copy())["SMA_20"].to_numpy()
+        np.testing.assert_allclose(np.nan_to_num(kernels.sma(20)), expected)
+
+        path = os.path.join(self.tmp.name, "SYN.csv")
+        self.assertEqual(self.store.export_csv("SYN", "1d", path), 200)
+        pd.testing.assert_frame_equal(load_history_csv(path), bars)
+        other = BarStore(base_path=os.path.join(self.tmp.name, "other"))
+        self.assertEqual(other.import_csv(path), 200)
+        pd.testing.assert_frame_equal(other.read_frame("SYN", "1d"), bars)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from benchmarks.harness import Bench, BenchCase, BenchResult, compare, load_baseline, run_benchmarks, save_baseline
+
+def _result(name, us):
+    return BenchResult(name=name, group="test", rounds=3, iterations=10, min_us=us, median_us=us,
+                       mean_us=us, stddev_us=0.0, ops_per_sec=1e6 / us)
+
+class TestHarness(unittest.TestCase):
+    def test_calibrates_to_min_time(self):
+        calls = []
+        b = Bench(BenchCase("noop", "test", None), rounds=3, min_time=0.005)
+        r = b(calls.append, 1)
+        self.assertEqual(r.rounds, 3)
+        self.assertGreater(r.iterations, 1)
+        self.assertGreaterEqual(len(calls), 4 * r.iterations) # Calibration pass + 3 timed rounds
+        self.assertLessEqual(r.min_us, r.median_us)
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        baseline = {"benchmarks": {"a": _result("a", 10.0).to_dict(), "b": _result("b", 10.0).to_dict(),
+                                   "c": _result("c", 10.0).to_dict()}}
+        rows = {r["name"]: r for r in compare(
+            [_result("a", 12.0), _result("b", 20.0), _result("c", 4.0), _result("d", 1.0)], baseline, tolerance=0.3)}
+        self.assertEqual(rows["a"]["status"], "OK")
+        self.assertEqual(rows["b"]["status"], "REGRESSED")
+        self.assertAlmostEqual(rows["b"]["change"], 1.0)
+        self.assertEqual(rows["c"]["status"], "IMPROVED")
+        self.assertEqual(rows["d"]["status"], "NEW")
+
+    def test_baseline_round_trip_and_merge(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baselines", "baseline.json")
+            save_baseline([_result("a", 10.0), _result("b", 5.0)], path)
+            save_baseline([_result("b", 6.0)], path, merge=True)
+            stored = load_baseline(path)
+            self.assertEqual(stored["benchmarks"]["a"]["min_us"], 10.0)
+            self.assertEqual(stored["benchmarks"]["b"]["min_us"], 6.0)
+            self.assertIn("python", stored["environment"])
+
+class TestSuiteSmoke(unittest.TestCase):
+    def test_every_case_runs(self):
+        results = run_benchmarks(rounds=1, min_time=0.001)
+        names = {r.name for r in results}
+        self.assertTrue({"orchestrator.run_cycle", "indicators.compute_all", "audit_ledger.record_event"} <= names)
+        self.assertTrue(all(r.min_us > 0 for r in results))
+
+if __name__ == "__main__":
+    unittest.main()
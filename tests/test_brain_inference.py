@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from asr_trading.brain.learning import BrainStem
+
+COLUMNS = ['RSI', 'MACD', 'ATR', 'SMA_50', 'Volatility']
+
+def _history(seed=0, n=300):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, 5)) * [10, 1, 1, 50, 0.01] + [50, 0, 1, 100, 0.002], columns=COLUMNS)
+    df['outcome'] = (df['RSI'] + rng.normal(size=n) * 5 > 50).astype(int)
+    return df
+
+class TestBrainInference(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "brain.joblib")
+        self.brain = BrainStem(model_path=self.path, backend="sklearn") # Keeps the estimators to compare against
+        self.df = _history()
+        self.brain.train(self.df)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fast_path_matches_predict_proba(self):
+        X = self.df[COLUMNS].head(40)
+        expected = self.brain.model.predict_proba(X)[:, 1]
+        rows = X.to_dict("records")
+        single = [self.brain.predict_win_probability(r) for r in rows]
+        np.testing.assert_allclose(single, expected)
+        np.testing.assert_allclose(self.brain.predict_many(rows), expected)
+        np.testing.assert_allclose(self.brain.predict_many(X.to_numpy()), expected)
+
+    def test_missing_and_nan_features_are_zero(self):
+        zero = self.brain.model.predict_proba(pd.DataFrame([[0.0] * 5], columns=COLUMNS))[0, 1]
+        self.assertAlmostEqual(self.brain.predict_win_probability({"RSI": float("nan")}), zero)
+        self.assertEqual(self.brain.predict_win_probability({"RSI": "bad"}), 0.5)
+
+    def test_untrained_is_neutral(self):
+        brain = BrainStem(model_path=os.path.join(self.tmp.name, "none.joblib"))
+        self.assertEqual(brain.predict_win_probability({"RSI": 70}), 0.5)
+        np.testing.assert_array_equal(brain.predict_many([{}, {}]), [0.5, 0.5])
+
+    def test_refresh_reloads_only_on_change(self):
+        import joblib
+        with patch("joblib.load", wraps=joblib.load) as load:
+            self.assertFalse(self.brain.refresh(force=True)) # Own save is not a change
+            os.utime(self.path, ns=(1, 1))
+            self.assertFalse(self.brain.refresh(force=True)) # Touched, same checksum
+            self.assertEqual(load.call_count, 0)
+
+            other = BrainStem(model_path=self.path, backend="sklearn")
+            other.train(_history(seed=1))
+            self.assertTrue(self.brain.refresh(force=True))
+            self.assertEqual(self.brain.checksum, other.checksum)
+            self.assertFalse(self.brain.refresh()) # Throttled until MODEL_WATCH_INTERVAL
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from asr_trading.brain.forest import CompiledForest
+from asr_trading.brain.learning import BrainStem
+
+def _data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5)) * [10, 1, 1, 50, 0.01] + [50, 0, 1, 100, 0.002]
+    y = (X[:, 0] + X[:, 1] * 5 + rng.normal(size=n) * 5 > 50).astype(int)
+    return X, y
+
+class TestCompiledForest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.X, y = _data()
+        cls.model = RandomForestClassifier(n_estimators=25, random_state=0).fit(cls.X, y)
+        cls.forest = CompiledForest.from_sklearn(cls.model)
+
+    def test_matches_predict_proba(self):
+        X_test, _ = _data(n=300, seed=1)
+        np.testing.assert_allclose(self.forest.predict(X_test), self.model.predict_proba(X_test)[:, 1], rtol=0, atol=1e-12)
+
+    def test_split_boundaries(self):
+        # Inputs sitting on (float32-rounded) split thresholds take the same branch as sklearn
+        tree = self.model.estimators_[0].tree_
+        splits = np.flatnonzero(tree.children_left != -1)[:50]
+        X = np.tile(self.X[:1], (len(splits), 1))
+        X[np.arange(len(splits)), tree.feature[splits]] = tree.threshold[splits]
+        np.testing.assert_allclose(self.forest.predict(X), self.model.predict_proba(X)[:, 1], rtol=0, atol=1e-12)
+
+    def test_smaller_than_the_pickled_model(self):
+        self.assertEqual(self.forest.n_trees, 25)
+        self.assertLess(self.forest.nbytes, len(pickle.dumps(self.model)) / 2)
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "forest.npz")
+            self.forest.save(path)
+            loaded = CompiledForest.load(path)
+        np.testing.assert_array_equal(loaded.predict(self.X[:20]), self.forest.predict(self.X[:20]))
+
+    def test_rejects_wrong_width(self):
+        with self.assertRaises(ValueError):
+            self.forest.predict(np.zeros((2, 3)))
+
+class TestBrainStemBackend(unittest.TestCase):
+    def test_backends_agree(self):
+        X, y = _data()
+        df = pd.DataFrame(X, columns=['RSI', 'MACD', 'ATR', 'SMA_50', 'Volatility'])
+        df['outcome'] = y
+        with tempfile.TemporaryDirectory() as tmp:
+            compiled = BrainStem(model_path=os.path.join(tmp, "brain.joblib"), backend="compiled")
+            compiled.train(df)
+            reference = BrainStem(model_path=os.path.join(tmp, "brain.joblib"), backend="sklearn")
+        self.assertIsNotNone(compiled.compiled)
+        self.assertIsNone(reference.compiled)
+        rows = df.head(30).to_dict("records")
+        np.testing.assert_allclose(compiled.predict_many(rows), reference.predict_many(rows), rtol=0, atol=1e-12)
+        self.assertAlmostEqual(compiled.predict_win_probability(rows[0]), reference.predict_win_probability(rows[0]), places=12)
+
+    def test_compiled_runtime_loads_only_the_npz(self):
+        import joblib
+        X, y = _data()
+        df = pd.DataFrame(X, columns=['RSI', 'MACD', 'ATR', 'SMA_50', 'Volatility'])
+        df['outcome'] = y
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "brain.joblib")
+            trained = BrainStem(model_path=path, backend="compiled")
+            trained.train(df)
+            self.assertTrue(os.path.exists(path) and os.path.exists(trained.compiled_path))
+            self.assertIsNone(trained.model) # No sklearn forest held after training
+            self.assertIsNone(trained._estimators)
+
+            with patch("joblib.load", wraps=joblib.load) as load:
+                runtime = BrainStem(model_path=path, backend="compiled")
+            load.assert_not_called()
+            self.assertIsNone(runtime.model)
+            self.assertEqual(runtime.checksum, trained.checksum)
+            reference = BrainStem(model_path=path, backend="sklearn")
+
+            rows = df.head(30).to_dict("records")
+            np.testing.assert_allclose(runtime.predict_many(rows), reference.predict_many(rows), rtol=0, atol=1e-12)
+
+            trained.train(df.sample(frac=1.0, random_state=1)) # Retrain writes a new .npz
+            self.assertTrue(runtime.refresh(force=True))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+import unittest
+from asr_trading.core.cycle_scheduler import CycleScheduler
+from asr_trading.core.io_pool import io_pool
+
+class FakeCycle:
+    def __init__(self, delay=0.02, slow=None, slow_delay=1.0):
+        self.delay = delay
+        self.slow = slow or set()
+        self.slow_delay = slow_delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def __call__(self, symbol, timings=None):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            timings["fetch"] = 1.0
+            await asyncio.sleep(self.slow_delay if symbol in self.slow else self.delay)
+            timings["features"] = 2.0
+            return timings
+        finally:
+            self.active -= 1
+
+def scheduler(fn, **kwargs):
+    kwargs.setdefault("interval", 10)
+    kwargs.setdefault("max_concurrency", 3)
+    kwargs.setdefault("deadline", 5)
+    kwargs.setdefault("overrun_policy", "skip")
+    return CycleScheduler(cycle_fn=fn, symbols_fn=lambda: [f"S{i}" for i in range(10)], **kwargs)
+
+class TestCycleScheduler(unittest.TestCase):
+    def test_bounded_concurrency_and_stage_report(self):
+        fn = FakeCycle()
+        report = asyncio.run(scheduler(fn).run_once())
+        self.assertEqual(fn.peak, 3)
+        self.assertEqual((report.completed, report.symbols), (10, 10))
+        self.assertEqual(report.stages["fetch"], {"count": 10, "p50_ms": 1.0, "max_ms": 1.0, "total_ms": 10.0})
+        self.assertNotIn("execute", report.stages)
+
+    def test_deadline_cancels_stragglers(self):
+        fn = FakeCycle(slow={"S4"}, slow_delay=2.0)
+        t0 = time.perf_counter()
+        report = asyncio.run(scheduler(fn, deadline=0.2).run_once())
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(report.timed_out, ["S4"])
+        self.assertEqual(report.completed, 9)
+        self.assertEqual(report.stages["features"]["count"], 9)
+
+    def test_overrun_skip(self):
+        fn = FakeCycle(delay=0.12)
+        sched = scheduler(fn, interval=0.05, max_concurrency=10)
+        async def scenario():
+            sched.start()
+            await asyncio.sleep(0.33)
+            sched.stop()
+            await asyncio.sleep(0)
+        asyncio.run(scenario())
+        # Ticks at 0, .05, .10 ... : a cycle only starts once the previous one is done
+        self.assertLessEqual(sched.cycles_run, 3)
+        self.assertGreaterEqual(sched.cycles_skipped, 3)
+        self.assertLessEqual(fn.peak, 10) # Never two cycles at once
+
+    def test_overrun_coalesce_runs_one_catch_up(self):
+        fn = FakeCycle(delay=0.12)
+        sched = scheduler(fn, interval=0.05, max_concurrency=10, overrun_policy="coalesce")
+        async def scenario():
+            sched.start()
+            await asyncio.sleep(0.2)
+            sched.stop()
+            await asyncio.sleep(0)
+        asyncio.run(scenario())
+        # Cycle 1 (0-.12s) absorbed the .05/.10 ticks into one catch-up starting at .12s
+        self.assertEqual(sched.cycles_run, 2)
+        self.assertLessEqual(fn.peak, 10)
+
+    def test_owns_a_loop_when_started_from_sync_code(self):
+        fn = FakeCycle(delay=0.0)
+        sched = scheduler(fn, interval=0.05)
+        sched.start()
+        time.sleep(0.12)
+        self.assertTrue(sched.is_running)
+        sched.stop()
+        self.assertFalse(sched.is_running)
+        self.assertGreaterEqual(sched.cycles_run, 2)
+        self.assertIsNotNone(sched.last_report)
+
+    def test_stays_off_the_callers_running_loop(self):
+        threads = set()
+
+        async def cycle(symbol, timings=None):
+            threads.add(threading.current_thread().name)
+            return timings
+
+        async def main():
+            sched = scheduler(cycle, interval=0.05)
+            sched.start() # As the server lifespan / CLI do
+            await asyncio.sleep(0.12)
+            sched.stop()
+            return sched
+
+        sched = asyncio.run(main())
+        self.assertEqual(threads, {"cycle-scheduler"})
+        self.assertGreaterEqual(sched.cycles_run, 1)
+
+    def test_prefetches_the_watchlist_once_per_cycle(self):
+        order = []
+
+        async def prefetch(symbols):
+            order.append(("prefetch", tuple(symbols)))
+
+        async def cycle(symbol, timings=None):
+            order.append(("cycle", symbol))
+            return timings
+
+        report = asyncio.run(scheduler(cycle, prefetch_fn=prefetch).run_once())
+        self.assertEqual(order[0], ("prefetch", tuple(f"S{i}" for i in range(10))))
+        self.assertEqual(sum(1 for step, _ in order if step == "prefetch"), 1)
+        self.assertEqual(report.completed, 10)
+
+    def test_stop_closes_the_loops_http_session(self):
+        sessions = []
+
+        async def cycle(symbol, timings=None):
+            sessions.append(io_pool.session()) # A provider fetch on the scheduler loop
+            return timings
+
+        sched = scheduler(cycle, interval=0.05)
+        sched.start()
+        time.sleep(0.1)
+        sched.stop()
+        self.assertTrue(sessions)
+        self.assertTrue(all(s.closed for s in sessions))
+
+if __name__ == "__main__":
+    unittest.main()
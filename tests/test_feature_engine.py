@@ -1,7 +1,8 @@
 import unittest
 from asr_trading.data.canonical import OHLC
-from asr_trading.analysis.features import feature_engine
+from asr_trading.analysis.features import feature_engine, WindowEngine, FeatureEngine, IndicatorLib
 import time
+import numpy as np
 
 class TestFeatureEngine(unittest.TestCase):
     def test_indicator_calculation(self):
@@ -43,5 +44,61 @@ class TestFeatureEngine(unittest.TestCase):
         df = feature_engine.window_engine.get_dataframe("NON_EXISTENT")
         self.assertTrue(df.empty)
 
+    def test_window_ring_buffer(self):
+        engine = WindowEngine(window_size=10)
+        for i in range(25):
+            engine.add_ohlc(OHLC("RING", 1000.0 + i, i, i + 1, i - 1, i, 10, "1m"))
+
+        closes = engine.get_arrays("RING")["close"]
+        self.assertEqual(list(closes), [float(x) for x in range(15, 25)])
+        self.assertFalse(closes.flags.writeable)
+
+        # Bulk path must land in the same order as bar-by-bar ingestion
+        engine.add_ohlc_batch([OHLC("RING", 2000.0 + i, i, i, i, 100 + i, 10, "1m") for i in range(4)])
+        df = engine.get_dataframe("RING")
+        self.assertEqual(len(df), 10)
+        self.assertEqual(list(df["close"].tail(5)), [24.0, 100.0, 101.0, 102.0, 103.0])
+
+    def test_batch_matches_compute_all(self):
+        engine = FeatureEngine()
+        rng = np.random.default_rng(3)
+        lengths = {"LONG": 300, "MID": 60, "SHORT": 18, "TINY": 3}
+        bars = []
+        for sym, n in lengths.items():
+            closes = 100 + np.cumsum(rng.normal(0, 1, n))
+            if sym == "LONG":
+                closes[-10] = 0.0 # Bad print: Log_Ret forward-fills over it
+            for i, c in enumerate(closes):
+                bars.append(OHLC(sym, 1000.0 + i * 60, c + 0.2, c + 1, c - 1, c, 500, "1m"))
+        engine.window_engine.add_ohlc_batch(bars)
+
+        table = engine.compute_batch()
+        self.assertEqual(sorted(table.index), ["LONG", "MID", "SHORT"]) # TINY still in warmup
+
+        for sym in table.index:
+            expected = IndicatorLib.compute_all(engine.window_engine.get_dataframe(sym)).iloc[-1]
+            np.testing.assert_allclose(
+                table.loc[sym, expected.index].to_numpy(dtype=float),
+                expected.to_numpy(dtype=float),
+                rtol=1e-9, atol=1e-9, err_msg=sym
+            )
+
+    def test_on_ohlc_after_bulk_warmup_matches_compute_all(self):
+        rng = np.random.default_rng(5)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 120))
+        bars = [OHLC("WARM", 1000.0 + i * 60, c + 0.2, c + 1, c - 1, c, 500 + i, "1m") for i, c in enumerate(closes)]
+        columns = np.array([(b.timestamp, b.open, b.high, b.low, b.close, b.volume) for b in bars[:80]]).T
+
+        warmups = (lambda e: e.add_columns("WARM", columns), lambda e: e.add_ohlc_batch(bars[:80]),
+                   lambda e: e.on_ohlc_batch(bars[:80])) # Batch ingest: streaming state rebuilt on the next bar
+        for warmup in warmups:
+            engine = FeatureEngine()
+            warmup(engine)
+            for bar in bars[80:]:
+                features = engine.on_ohlc(bar)["features"]
+                expected = IndicatorLib.compute_all(engine.window_engine.get_dataframe("WARM")).iloc[-1]
+                np.testing.assert_allclose([features[k] for k in expected.index], expected.to_numpy(dtype=float),
+                                           rtol=1e-9, atol=1e-9)
+
 if __name__ == "__main__":
     unittest.main()
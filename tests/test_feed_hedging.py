@@ -0,0 +1,139 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+from asr_trading.core.config import cfg
+from asr_trading.data.canonical import Tick
+from asr_trading.data.feed_manager import FeedManager, FeedProvider
+
+class FakeFeed(FeedProvider):
+    def __init__(self, name, price, delay=0.0, fail=False):
+        self.name = name
+        self.price = price
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    def get_name(self):
+        return self.name
+
+    async def connect(self):
+        pass
+
+    async def get_latest_tick(self, symbol):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise ConnectionError("brownout")
+        return Tick(symbol, time.time(), self.price - 0.01, self.price + 0.01, self.price, 100, self.name, 1)
+
+def manager(*feeds, **hedging):
+    fm = FeedManager()
+    for role, feed in zip(("PRIMARY", "SECONDARY", "TERTIARY"), feeds):
+        fm.register_provider(role, feed)
+    if hedging:
+        fm.configure_hedging(**hedging)
+    return fm
+
+class TestFeedHedging(unittest.TestCase):
+    def test_sequential_failover_unchanged(self):
+        primary, secondary = FakeFeed("P", 100, fail=True), FakeFeed("S", 101)
+        tick = asyncio.run(manager(primary, secondary).get_tick("AAPL"))
+        self.assertEqual(tick.source, "S")
+
+    def test_slow_primary_is_hedged(self):
+        primary = FakeFeed("P", 100, delay=1.0)
+        secondary, tertiary = FakeFeed("S", 101, delay=0.02), FakeFeed("T", 102, delay=0.2)
+        fm = manager(primary, secondary, tertiary, enabled=True, hedge_delay=0.05)
+
+        t0 = time.perf_counter()
+        tick = asyncio.run(fm.get_tick("AAPL"))
+        elapsed = time.perf_counter() - t0
+
+        self.assertEqual(tick.source, "S")
+        self.assertLess(elapsed, 0.3)
+        self.assertTrue(primary.cancelled and tertiary.cancelled)
+        self.assertEqual(fm.active_source, "SECONDARY")
+
+    def test_losing_fetches_unwind_before_returning(self):
+        primary, secondary = FakeFeed("P", 100, delay=1.0), FakeFeed("S", 101, delay=0.02)
+        fm = manager(primary, secondary, enabled=True, hedge_delay=0.0)
+
+        async def scenario():
+            tick = await fm.get_tick("AAPL")
+            return tick, primary.cancelled # Checked before the loop gets another turn
+
+        tick, unwound = asyncio.run(scenario())
+        self.assertEqual(tick.source, "S")
+        self.assertTrue(unwound)
+
+    def test_fast_primary_never_fires_backups(self):
+        primary, secondary = FakeFeed("P", 100, delay=0.01), FakeFeed("S", 101)
+        tick = asyncio.run(manager(primary, secondary, enabled=True, hedge_delay=0.1).get_tick("AAPL"))
+        self.assertEqual(tick.source, "P")
+        self.assertEqual(secondary.calls, 0)
+
+    def test_primary_failure_hedges_immediately(self):
+        primary, secondary = FakeFeed("P", 100, fail=True), FakeFeed("S", 101)
+        fm = manager(primary, secondary, enabled=True, hedge_delay=5.0)
+        t0 = time.perf_counter()
+        self.assertEqual(asyncio.run(fm.get_tick("AAPL")).source, "S")
+        self.assertLess(time.perf_counter() - t0, 1.0)
+
+    def test_quorum_uses_cross_validation(self):
+        feeds = [FakeFeed("P", 100.0), FakeFeed("S", 100.1, delay=0.01), FakeFeed("T", 100.2, delay=0.02)]
+        fm = manager(*feeds, enabled=True, hedge_delay=0.0, quorum=True, quorum_size=3)
+        self.assertEqual(asyncio.run(fm.get_tick("AAPL")).source, "S") # Median
+
+        # Sources disagree beyond the Normalizer threshold -> rejected, cache is empty
+        feeds = [FakeFeed("P", 100.0), FakeFeed("S", 110.0)]
+        fm = manager(*feeds, enabled=True, hedge_delay=0.0, quorum=True, quorum_size=2)
+        self.assertIsNone(asyncio.run(fm.get_tick("AAPL")))
+
+    def test_modes_come_from_config(self):
+        feeds = [FakeFeed("P", 100.0), FakeFeed("S", 100.1, delay=0.01), FakeFeed("T", 100.2, delay=0.02)]
+        with patch.multiple(cfg, FEED_QUORUM=True, FEED_QUORUM_SIZE=3, FEED_HEDGE_DELAY=0.0):
+            fm = manager(*feeds)
+        self.assertEqual(asyncio.run(fm.get_tick("AAPL")).source, "S")
+
+class BatchFeed(FakeFeed):
+    max_batch_size = 100
+
+    def __init__(self, name, price, skip=()):
+        super().__init__(name, price)
+        self.skip = set(skip)
+        self.batches = []
+
+    async def get_latest_ticks(self, symbols):
+        self.batches.append(list(symbols))
+        return {s: Tick(s, time.time(), self.price - 0.01, self.price + 0.01, self.price, 100, self.name, 1)
+                for s in symbols if s not in self.skip}
+
+class TestBulkTicks(unittest.TestCase):
+    def test_chunked_batches_with_partial_failover(self):
+        symbols = [f"S{i}" for i in range(500)]
+        primary = BatchFeed("P", 100, skip=symbols[::50]) # 10 symbols missing
+        secondary = FakeFeed("S", 101) # No batch API: default per-symbol fallback
+        ticks = asyncio.run(manager(primary, secondary).get_ticks(symbols + ["S0"]))
+
+        self.assertEqual(list(ticks), symbols)
+        self.assertEqual(len(primary.batches), 5)
+        self.assertEqual(secondary.calls, 10)
+        self.assertEqual({ticks[s].source for s in symbols[::50]}, {"S"})
+        self.assertEqual(ticks["S1"].source, "P")
+
+    def test_missing_everywhere_uses_cache(self):
+        fm = manager(BatchFeed("P", 100))
+        asyncio.run(fm.get_ticks(["AAPL"]))
+        fm.primary.skip = {"AAPL", "MSFT"}
+        ticks = asyncio.run(fm.get_ticks(["AAPL", "MSFT"]))
+        self.assertEqual(ticks["AAPL"].source, "P") # Served from hot cache
+        self.assertIsNone(ticks["MSFT"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import pandas as pd
+from asr_trading.analysis.indicators import Indicators
+from asr_trading.analysis.features import IndicatorLib
+from asr_trading.analysis.kernels import KernelCache
+
+class TestIndicatorKernels(unittest.TestCase):
+    def _frame(self, title_case=False):
+        rng = np.random.default_rng(11)
+        close = 100 + np.cumsum(rng.normal(0, 1, 200))
+        df = pd.DataFrame({
+            "open": close + 0.1,
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": 1000.0,
+        })
+        return df.rename(columns=str.title) if title_case else df
+
+    def test_front_ends_agree(self):
+        # Training (Title-case) and live (lower-case) paths must produce identical features
+        train = Indicators.add_all_indicators(self._frame(title_case=True))
+        live = IndicatorLib.compute_all(self._frame())
+        for col in ["RSI", "MACD", "MACD_Signal", "ATR", "SMA_50", "Volatility"]:
+            np.testing.assert_allclose(train[col].iloc[60:], live[col].iloc[60:], err_msg=col)
+
+    def test_front_ends_agree_on_warmup_rows(self):
+        # Frame shorter than every lookback: both sanitize the warmup gaps the same way
+        short = self._frame().iloc[:12].copy()
+        train = Indicators.add_all_indicators(short.rename(columns=str.title))
+        live = IndicatorLib.compute_all(short)
+        for col in ["RSI", "MACD", "MACD_Signal", "ATR", "SMA_50", "Volatility"]:
+            np.testing.assert_array_equal(train[col].to_numpy(), live[col].to_numpy(), err_msg=col)
+        self.assertFalse(train[["RSI", "SMA_50", "Volatility"]].isna().any().any())
+
+    def test_kernels_memoized_per_frame(self):
+        cache = KernelCache()
+        df = self._frame()
+        k = cache.get(df)
+        self.assertIs(cache.get(df.copy()), k) # Same content -> same kernels
+        self.assertIs(k.rsi(14), k.rsi(14))
+        self.assertFalse(k.rsi(14).flags.writeable)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        df.loc[df.index[-1], "close"] += 1.0
+        self.assertIsNot(cache.get(df), k) # Mutated frame -> fresh kernels
+
+    def test_cache_bounded_by_bytes(self):
+        df = self._frame()
+        frame_bytes = 3 * 200 * 8 # high/low/close
+        cache = KernelCache(max_bytes=3 * frame_bytes)
+        frames = [cache.get(df + i) for i in range(3)]
+        self.assertEqual(len(cache._entries), 3)
+
+        frames[1].rsi(14) # Kernels computed after insertion count too
+        cache.get(df + 3)
+        self.assertIs(next(iter(cache._entries.values())), frames[2]) # 0 and 1 evicted
+        self.assertEqual(len(cache._entries), 2)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+
+        big = pd.concat([df] * 10, ignore_index=True)
+        cache.get(big) # Alone over the bound: kept, everything older goes
+        self.assertEqual(len(cache._entries), 1)
+        self.assertGreater(cache.nbytes, cache.max_bytes)
+
+if __name__ == "__main__":
+    unittest.main()
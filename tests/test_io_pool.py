@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+import unittest
+from aiohttp import web
+from asr_trading.core.io_pool import IOPool
+from asr_trading.data.providers import finnhub, twelve_data
+
+class TestIOPool(unittest.TestCase):
+    def test_blocking_calls_leave_loop_responsive(self):
+        pool = IOPool(max_workers=2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def blocking():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+            return threading.current_thread().name
+
+        async def scenario():
+            beats = 0
+            async def heartbeat():
+                nonlocal beats
+                while True:
+                    await asyncio.sleep(0.01)
+                    beats += 1
+            hb = asyncio.create_task(heartbeat())
+            names = await asyncio.gather(*(pool.run_blocking(blocking) for _ in range(4)))
+            hb.cancel()
+            await pool.close()
+            return names, beats
+
+        names, beats = asyncio.run(scenario())
+        self.assertEqual(peak[0], 2) # Bounded
+        self.assertTrue(all(n.startswith("sdk-io") for n in names))
+        self.assertGreater(beats, 10) # ~0.2s of blocking work, loop kept ticking
+
+    def test_timeout(self):
+        pool = IOPool(max_workers=1)
+        async def scenario():
+            try:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await pool.run_blocking(time.sleep, 0.3, timeout=0.05)
+            finally:
+                await pool.close()
+        asyncio.run(scenario())
+
+    def test_one_session_per_loop(self):
+        pool = IOPool()
+        async def scenario():
+            a, b = pool.session(), pool.session()
+            self.assertIs(a, b)
+            self.assertEqual(a.connector.limit_per_host, pool.limit_per_host)
+            await pool.close()
+            return a
+        first = asyncio.run(scenario())
+        second = asyncio.run(scenario())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed and second.closed)
+
+    def test_providers_share_the_pooled_session(self):
+        peers = set()
+
+        async def quote(request):
+            peers.add(request.transport.get_extra_info("peername"))
+            if "token" in request.query:
+                return web.json_response({"c": 101.0, "h": 101.5, "l": 100.5, "t": time.time()})
+            return web.json_response({"price": "101.0"})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/quote", quote)
+            app.router.add_get("/price", quote)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+            pool = IOPool(limit_per_host=1)
+            fh, td = finnhub.FinnhubProvider(), twelve_data.TwelveDataProvider()
+            fh.api_key, td.api_key = "K", "K"
+            fh.base_url, td.base_url = base, base
+            saved = finnhub.io_pool, twelve_data.io_pool
+            finnhub.io_pool = twelve_data.io_pool = pool
+            try:
+                ticks = []
+                for _ in range(3):
+                    ticks.append(await fh.get_latest_tick("AAPL"))
+                    ticks.append(await td.get_latest_tick("AAPL"))
+            finally:
+                finnhub.io_pool, twelve_data.io_pool = saved
+                await pool.close()
+                await runner.cleanup()
+            return ticks
+
+        ticks = asyncio.run(scenario())
+        self.assertTrue(all(t.last == 101.0 for t in ticks))
+        self.assertEqual(len(peers), 1) # Six requests, one kept-alive connection
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from fastapi.testclient import TestClient
+from asr_trading.core.metrics import MetricsRegistry
+from asr_trading.core.avionics import CircuitBreaker, CircuitBreakerOpenException
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        r = MetricsRegistry()
+        h = r.histogram("asr_stage_ms", "Stage latency", ["stage"], buckets=(10, 100))
+        for v in (5, 10, 50, 500):
+            h.observe(v, stage="fetch")
+        self.assertEqual(h.snapshot(stage="fetch"), ([2, 3, 4], 565.0))
+        text = r.render()
+        self.assertIn('asr_stage_ms_bucket{stage="fetch",le="10"} 2', text)
+        self.assertIn('asr_stage_ms_bucket{stage="fetch",le="+Inf"} 4', text)
+        self.assertIn('asr_stage_ms_count{stage="fetch"} 4', text)
+        self.assertIn("# TYPE asr_stage_ms histogram", text)
+
+    def test_telemetry_bridge(self):
+        r = MetricsRegistry()
+        r.record("event.feed_failover", 1.0, {"failed": "PRIMARY", "symbol": "AAPL"})
+        r.record("event.feed_failover", 1.0, {"failed": "BACKUP", "symbol": "TCS"})
+        r.record("latency_ms", 42.0, {"component": "broker"})
+        r.record("quote_cache.hit", 1.0, {"symbol": "AAPL", "interval": "1d"})
+        text = r.render()
+        self.assertIn('asr_events_total{type="feed_failover"} 2', text)
+        self.assertIn('asr_latency_ms_bucket{component="broker",le="50"} 1', text)
+        # High-cardinality tags (symbol) are not labels
+        self.assertIn('asr_quote_cache_hit_count{interval="1d"} 1', text)
+        self.assertNotIn("AAPL", text)
+
+    def test_gauge_function_and_label_escaping(self):
+        r = MetricsRegistry()
+        r.gauge("asr_depth", "Queue depth", ["queue"]).set_function(lambda: 7, queue='a"b')
+        self.assertIn('asr_depth{queue="a\\"b"} 7', r.render())
+
+    def test_type_conflict(self):
+        r = MetricsRegistry()
+        r.counter("asr_x_total")
+        with self.assertRaises(ValueError):
+            r.gauge("asr_x_total")
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_scrape(self):
+        from asr_trading.web.server import app
+        breaker = CircuitBreaker("metrics_test", failure_threshold=1)
+        failing = breaker(lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            failing()
+        with self.assertRaises(CircuitBreakerOpenException):
+            failing()
+
+        resp = TestClient(app).get("/metrics")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn("asr_uptime_seconds ", resp.text)
+        self.assertIn('asr_circuit_breaker_state{name="metrics_test"} 2', resp.text)
+        self.assertIn('asr_circuit_breaker_rejected_total{name="metrics_test"} 1', resp.text)
+        self.assertIn('asr_events_total{type="circuit_breaker_opened"}', resp.text)
+
+if __name__ == "__main__":
+    unittest.main()
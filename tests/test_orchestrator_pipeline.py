@@ -0,0 +1,124 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+from asr_trading.core import orchestrator as orch_module
+from asr_trading.core.orchestrator import Orchestrator, StageClock
+from asr_trading.data.canonical import Tick
+from asr_trading.data.bar_aggregator import BarAggregator
+
+class StubOrchestrator(Orchestrator):
+    """
+    Real pipeline, stage bodies replaced: `traders` produce a plan whose execution takes `exec_delay`.
+    """
+    def __init__(self, traders=(), exec_delay=0.3, feed_down=False, **kwargs):
+        super().__init__(aggregator=BarAggregator(intervals=("1m",)), **kwargs)
+        self.traders = set(traders)
+        self.exec_delay = exec_delay
+        self.feed = asyncio.Event() if feed_down else None
+        self.fetched, self.analyzed, self.executed = [], {}, []
+        self.started = time.perf_counter()
+
+    async def _fetch(self, symbol, clock):
+        self.fetched.append(symbol)
+        if self.feed is not None:
+            await self.feed.wait() # Outage: the fetch never returns
+        clock.lap("fetch")
+        return object()
+
+    def _analyze(self, symbol, tick, clock):
+        self.analyzed[symbol] = time.perf_counter() - self.started
+        clock.lap("features")
+        return ("BUY", "PLAN") if symbol in self.traders else (None, None)
+
+    async def _execute(self, symbol, proposal, plan, clock):
+        await asyncio.sleep(self.exec_delay)
+        self.executed.append(symbol)
+        clock.lap("execute")
+
+class TestOrchestratorPipeline(unittest.TestCase):
+    def test_slow_execution_does_not_stall_analysis(self):
+        orch = StubOrchestrator(traders={"S0", "S1"}, workers={"fetch": 2, "execute": 1})
+        symbols = [f"S{i}" for i in range(8)]
+
+        async def scenario():
+            results = await asyncio.gather(*(orch.process(s) for s in symbols))
+            await orch.stop_pipeline()
+            return results
+
+        results = asyncio.run(scenario())
+        # Both trades run back to back on the one execute worker (~0.6s) ...
+        self.assertEqual(orch.executed, ["S0", "S1"])
+        self.assertIn("execute", results[1])
+        self.assertGreater(results[1]["queued"], 200) # S1 waited for S0's broker call
+        # ... while every other symbol was analyzed right away
+        self.assertEqual(len(orch.analyzed), 8)
+        self.assertLess(max(orch.analyzed.values()), 0.1)
+
+    def test_feed_outage_is_bounded(self):
+        orch = StubOrchestrator(feed_down=True, workers={"fetch": 2}, queue_size=3)
+        symbols = [f"S{i}" for i in range(20)]
+
+        async def scenario():
+            tasks = [asyncio.create_task(orch.process(s)) for s in symbols]
+            await asyncio.sleep(0.1)
+            stats = orch.pipeline_stats()
+            for t in tasks:
+                t.cancel() # Cycle deadline
+            await asyncio.gather(*tasks, return_exceptions=True)
+            orch.feed.set()
+            await asyncio.sleep(0.05)
+            after = orch.pipeline_stats()
+            await orch.stop_pipeline()
+            return stats, after
+
+        stats, after = asyncio.run(scenario())
+        self.assertEqual(stats["stages"]["fetch"]["busy"], 2)
+        self.assertEqual(stats["stages"]["fetch"]["queued"], 3) # The rest wait at admission
+        self.assertEqual(len(orch.fetched), 2)
+        # Abandoned jobs are dropped at the next boundary, not analyzed late
+        self.assertEqual(after["in_flight"], 0)
+        self.assertEqual(orch.analyzed, {})
+
+    def test_symbol_in_flight_is_not_queued_twice(self):
+        orch = StubOrchestrator(traders={"AAPL"}, exec_delay=0.1)
+
+        async def scenario():
+            first = asyncio.create_task(orch.process("AAPL"))
+            await asyncio.sleep(0.02)
+            timings = {}
+            await orch.process("AAPL", timings=timings)
+            await first
+            await orch.stop_pipeline()
+            return timings
+
+        timings = asyncio.run(scenario())
+        self.assertEqual(orch.fetched, ["AAPL"])
+        self.assertEqual(orch.coalesced, 1)
+        self.assertIn("execute", timings)
+
+    def test_run_cycle_uses_the_same_stages(self):
+        orch = StubOrchestrator(traders={"AAPL"}, exec_delay=0)
+        timings = asyncio.run(orch.run_cycle("AAPL"))
+        self.assertEqual(list(timings), ["fetch", "features", "execute"])
+        self.assertEqual(orch.executed, ["AAPL"])
+
+    def test_fetch_takes_the_scans_batch_quote(self):
+        orch = Orchestrator(aggregator=BarAggregator(intervals=("1m",)))
+        fresh = {s: Tick(s, time.time(), 1, 2, 1.5, 0, "T", 0) for s in ("AAPL", "MSFT")}
+
+        async def scenario():
+            await orch.prefetch(["AAPL", "MSFT", "NVDA"])
+            return [await orch._fetch(s, StageClock()) for s in ("AAPL", "MSFT", "NVDA", "AAPL")]
+
+        with patch.object(orch_module.feed_manager, "get_ticks", AsyncMock(return_value={**fresh, "NVDA": None})) as get_ticks, \
+             patch.object(orch_module.feed_manager, "get_tick", AsyncMock(return_value=None)) as get_tick:
+            ticks = asyncio.run(scenario())
+
+        get_ticks.assert_awaited_once_with(["AAPL", "MSFT", "NVDA"])
+        self.assertEqual(ticks[:2], [fresh["AAPL"], fresh["MSFT"]])
+        # Own request only when the batch had nothing, or its tick was already used
+        self.assertEqual([c.args[0] for c in get_tick.await_args_list], ["NVDA", "AAPL"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from asr_trading.data.canonical import Tick
+from asr_trading.execution.execution_manager import execution_manager
+from asr_trading.execution.order_manager import OrderManager
+
+def plan(order: int):
+    return SimpleNamespace(symbol="AAPL", entry_price=100.0, stop_loss=99.0, take_profit=101.0, side="BUY",
+                           quantity=1, plan_code=f"P{order}", features=None)
+
+class TestOrderManagerThreads(unittest.TestCase):
+    def test_bus_ticks_and_scan_registrations_race(self):
+        # Bus listener (main loop) closes on TP while the scan thread registers new trades
+        om = OrderManager()
+        om.is_paper = True
+        registered, recorded, errors = [], [], []
+
+        def scan():
+            try:
+                while len(registered) < 200:
+                    pos = om.positions.get("AAPL")
+                    if pos is None or pos["order_id"] in recorded: # Flat (trade journaled) -> enter again
+                        order_id = f"O{len(registered)}"
+                        om.register_execution(plan(len(registered)), order_id)
+                        registered.append(order_id)
+            except Exception as e:
+                errors.append(e)
+
+        def bus():
+            try:
+                while scanner.is_alive():
+                    om.on_tick(Tick("AAPL", time.time(), 101.9, 102.1, 102.0, 0, "T", 0))
+            except Exception as e:
+                errors.append(e)
+
+        def record(**kw):
+            recorded.append(kw["plan_id"]) # Journaled...
+            time.sleep(0.0002) # ...governance update still running while the scan re-enters
+
+        with patch.object(execution_manager, "record_trade_result", side_effect=record):
+            scanner = threading.Thread(target=scan)
+            listener = threading.Thread(target=bus)
+            scanner.start()
+            listener.start()
+            scanner.join()
+            listener.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(recorded), len(set(recorded))) # No trade recorded twice
+        still_open = [p["order_id"] for p in om.positions.values()]
+        self.assertEqual(sorted(recorded + still_open), sorted(registered)) # None dropped unrecorded
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
+import numpy as np
 import pandas as pd
-from asr_trading.analysis.patterns import pattern_detector
+from asr_trading.analysis.patterns import pattern_detector, pattern_scanner, CandleMatcher
 
 class TestPatternDetector(unittest.TestCase):
     def test_doji_detection(self):
@@ -36,5 +37,26 @@ class TestPatternDetector(unittest.TestCase):
         found_engulfing = any(p.pattern_id == "CDL_ENGULFING_BULL" for p in patterns)
         self.assertTrue(found_engulfing, "Failed to detect Bullish Engulfing")
 
+    def test_scanner_matches_scalar_rules(self):
+        rng = np.random.default_rng(5)
+        n = 2000
+        o = 100 + rng.normal(0, 2, n)
+        c = o + rng.normal(0, 1, n)
+        h = np.maximum(o, c) + np.abs(rng.normal(0, 1, n))
+        l = np.minimum(o, c) - np.abs(rng.normal(0, 1, n))
+        c[::7] = o[::7] # Force some dojis
+
+        flags = pattern_scanner.scan(o, h, l, c)
+        for i in range(n):
+            warm = i >= 4
+            self.assertEqual(flags["CDL_DOJI"][i], warm and CandleMatcher.is_doji(o[i], h[i], l[i], c[i]))
+            self.assertEqual(flags["CDL_HAMMER"][i], warm and CandleMatcher.is_hammer(o[i], h[i], l[i], c[i]))
+            bull = warm and c[i-1] < o[i-1] and c[i] > o[i] and o[i] <= c[i-1] and c[i] >= o[i-1]
+            self.assertEqual(flags["CDL_ENGULFING_BULL"][i], bull)
+        self.assertTrue(flags["CDL_DOJI"].any())
+
+        conf = pattern_scanner.scan_confidence(o, h, l, c)
+        self.assertTrue(np.all(conf["CDL_DOJI"][flags["CDL_DOJI"]] == 0.6))
+
 if __name__ == "__main__":
     unittest.main()
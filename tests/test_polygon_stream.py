@@ -0,0 +1,197 @@
+import asyncio
+import json
+import time
+import unittest
+from aiohttp import web
+from asr_trading.data.canonical import Tick
+from asr_trading.data.tick_bus import TickBus, SubscriptionClosed
+from asr_trading.data.feed_manager import FeedManager
+from asr_trading.data.providers.polygon import PolygonStream, PolygonProvider
+from asr_trading.execution.order_manager import OrderManager
+
+class FakePolygonServer:
+    """
+    Minimal Polygon stocks socket: connected -> auth -> subscribe -> scripted events.
+    """
+    def __init__(self, events, api_key="KEY", drop_after_first=False):
+        self.events = events
+        self.api_key = api_key
+        self.drop_after_first = drop_after_first
+        self.connections = 0
+        self.subscriptions = []
+        self.runner = None
+        self.url = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        await ws.send_str(json.dumps([{"ev": "status", "status": "connected"}]))
+        async for msg in ws:
+            data = json.loads(msg.data)
+            if data["action"] == "auth":
+                ok = data["params"] == self.api_key
+                await ws.send_str(json.dumps([{"ev": "status", "status": "auth_success" if ok else "auth_failed"}]))
+                if not ok:
+                    break
+            elif data["action"] == "subscribe":
+                self.subscriptions.append(data["params"])
+                await ws.send_str(json.dumps(self.events))
+                if self.drop_after_first and self.connections == 1:
+                    break
+        await ws.close()
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/stocks", self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/stocks"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+def events(now_ms):
+    return [
+        {"ev": "Q", "sym": "AAPL", "bp": 99.9, "ap": 100.1, "t": now_ms, "q": 1},
+        {"ev": "T", "sym": "AAPL", "p": 100.0, "s": 50, "t": now_ms + 1, "q": 2},
+        {"ev": "T", "sym": "AAPL", "p": 100.2, "s": 25, "t": now_ms + 2, "q": 3},
+        {"ev": "T", "sym": "MSFT", "p": 400.0, "s": 10, "t": now_ms + 3, "q": 4},
+    ]
+
+async def collect(sub, n, timeout=2.0):
+    out = []
+    while len(out) < n:
+        out.append(await asyncio.wait_for(sub.get(), timeout))
+    return out
+
+class TestTickBus(unittest.TestCase):
+    def test_filtering_and_drop_oldest(self):
+        async def scenario():
+            bus = TickBus()
+            seen = []
+            bus.add_listener(seen.append, symbols=["AAPL"])
+            sub = bus.subscribe(maxsize=2)
+            for i in range(3):
+                bus.publish(Tick("AAPL", time.time(), 1, 2, 1.5 + i, 0, "T", i))
+            bus.publish(Tick("MSFT", time.time(), 1, 2, 1.5, 0, "T", 9))
+            return seen, [await sub.get() for _ in range(2)], sub.dropped
+        seen, queued, dropped = asyncio.run(scenario())
+        self.assertEqual(len(seen), 3)
+        self.assertEqual([t.sequence for t in queued], [2, 9])
+        self.assertEqual(dropped, 2)
+
+    def test_close_wakes_waiting_consumers(self):
+        async def scenario():
+            bus = TickBus()
+            sub = bus.subscribe()
+            bus.publish(Tick("AAPL", time.time(), 1, 2, 1.5, 0, "T", 1))
+
+            async def drain():
+                return [t.sequence async for t in sub]
+
+            reader = asyncio.create_task(drain())
+            waiter = asyncio.create_task(sub.get())
+            await asyncio.sleep(0.01) # Both now blocked on the empty queue
+            sub.close()
+            bus.publish(Tick("AAPL", time.time(), 1, 2, 1.5, 0, "T", 2)) # Not delivered after close
+            drained = await asyncio.wait_for(reader, 1.0)
+            with self.assertRaises(SubscriptionClosed):
+                await asyncio.wait_for(waiter, 1.0)
+            with self.assertRaises(SubscriptionClosed):
+                await sub.get()
+            return drained
+        self.assertEqual(asyncio.run(scenario()), [1])
+
+class TestPolygonStream(unittest.TestCase):
+    def test_decodes_trades_and_quotes(self):
+        async def scenario():
+            server = FakePolygonServer(events(int(time.time() * 1000)))
+            await server.start()
+            bus = TickBus()
+            sub = bus.subscribe(symbols=["AAPL"])
+            stream = PolygonStream("KEY", ["AAPL", "MSFT"], bus=bus, url=server.url)
+            stream.start()
+            try:
+                ticks = await collect(sub, 3)
+            finally:
+                await stream.stop()
+                await server.stop()
+            return ticks, server.subscriptions
+        ticks, subscriptions = asyncio.run(scenario())
+
+        self.assertEqual(subscriptions, ["T.AAPL,Q.AAPL,T.MSFT,Q.MSFT"])
+        quote, t1, t2 = ticks
+        self.assertEqual(quote.last, 100.0) # Mid before the first trade
+        self.assertEqual((t1.bid, t1.ask, t1.last, t1.volume), (99.9, 100.1, 100.0, 50))
+        self.assertEqual(t2.volume, 75)
+        self.assertTrue(all(t.is_valid() and t.source == "POLYGON_WS" for t in ticks))
+
+    def test_reconnects_and_resubscribes(self):
+        async def scenario():
+            server = FakePolygonServer(events(int(time.time() * 1000)), drop_after_first=True)
+            await server.start()
+            bus = TickBus()
+            sub = bus.subscribe()
+            stream = PolygonStream("KEY", ["AAPL"], bus=bus, url=server.url, reconnect_delay=0.05)
+            stream.start()
+            try:
+                await collect(sub, 8)
+            finally:
+                await stream.stop()
+                await server.stop()
+            return server.connections, stream.reconnects
+        connections, reconnects = asyncio.run(scenario())
+        self.assertEqual(connections, 2)
+        self.assertEqual(reconnects, 1)
+
+    def test_auth_failure_stops(self):
+        async def scenario():
+            server = FakePolygonServer([], api_key="OTHER")
+            await server.start()
+            stream = PolygonStream("KEY", ["AAPL"], bus=TickBus(), url=server.url, reconnect_delay=0.05)
+            try:
+                await asyncio.wait_for(stream.start(), 2.0)
+            finally:
+                await server.stop()
+            return server.connections
+        self.assertEqual(asyncio.run(scenario()), 1)
+
+    def test_subscribers_receive_stream(self):
+        async def scenario():
+            server = FakePolygonServer(events(int(time.time() * 1000)))
+            await server.start()
+            bus = TickBus()
+            fm = FeedManager()
+            fm.attach_bus(bus)
+            om = OrderManager()
+            om.is_paper = True
+            om.positions["AAPL"] = {"entry": 95.0, "current_price": 95.0, "size": 1, "sl": 90.0, "tp": 100.1,
+                                    "strategy": "T", "status": "FILLED", "plan": "A", "order_id": "X"}
+            om.close_position = lambda sym, reason: om.positions.pop(sym)
+            om.attach_bus(bus)
+
+            provider = PolygonProvider(symbols=["AAPL", "MSFT"], bus=bus)
+            provider.ws = PolygonStream("KEY", provider.symbols, bus=bus, url=server.url)
+            bus.add_listener(provider._on_stream_tick)
+            sub = bus.subscribe()
+            provider.ws.start()
+            try:
+                await collect(sub, 4)
+                tick = await provider.get_latest_tick("MSFT")
+            finally:
+                await provider.disconnect()
+                await server.stop()
+            return fm, om, tick
+        fm, om, tick = asyncio.run(scenario())
+
+        self.assertEqual(tick.last, 400.0) # Served from the stream, no REST call
+        self.assertEqual(fm.local_cache_source["AAPL"].last, 100.2)
+        self.assertNotIn("AAPL", om.positions) # TP hit on the 100.2 trade
+
+if __name__ == "__main__":
+    unittest.main()
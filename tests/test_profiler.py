@@ -0,0 +1,118 @@
+import asyncio
+import cProfile
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from asr_trading.core.profiler import Profiler, LoopLagMonitor, ProfileBusy
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.profiler = Profiler(out_dir=self.dir, max_seconds=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_sampler_sees_the_scheduler_thread(self):
+        stop = threading.Event()
+        def cycle_thread():
+            while not stop.is_set():
+                busy_wait(0.01)
+        worker = threading.Thread(target=cycle_thread, name="cycle-scheduler", daemon=True)
+        worker.start()
+        try:
+            result = asyncio.run(self.profiler.run(0.3, mode="sample", interval_ms=2, threads=["cycle-scheduler"]))
+        finally:
+            stop.set()
+            worker.join()
+        self.assertGreater(result["samples"], 20)
+        self.assertTrue(result["top"][0]["frame"].startswith("cycle-scheduler: busy_wait"))
+        with open(result["path"]) as f:
+            first = f.readline()
+        self.assertTrue(first.startswith("cycle-scheduler;"))
+        self.assertIn("busy_wait (test_profiler.py", first)
+
+    def test_cprofile_on_loop_thread_and_current_loop(self):
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+
+        async def ticker():
+            while True:
+                busy_wait(0.005)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            other.call_soon_threadsafe(lambda: other.create_task(ticker()))
+            return await self.profiler.run(0.3, mode="cprofile", loops={"api": asyncio.get_running_loop(), "cycle": other})
+
+        try:
+            result = asyncio.run(scenario())
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join()
+            other.close()
+        self.assertEqual(result["loops"], ["api", "cycle"])
+        funcs = {func for (_, _, func) in pstats.Stats(result["path"]).stats}
+        self.assertIn("busy_wait", funcs)
+
+    def test_cprofile_enable_error_reaches_the_caller(self):
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+
+        async def scenario():
+            with self.assertRaises(ProfileBusy):
+                await self.profiler.run(0.1, mode="cprofile", loops={"api": asyncio.get_running_loop(), "cycle": other})
+
+        try:
+            with patch.object(cProfile.Profile, "enable", side_effect=ValueError("Another profiling tool is already active")):
+                asyncio.run(scenario())
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join()
+            other.close()
+        self.assertIsNone(self.profiler.last_result)
+        self.assertTrue(self.profiler._busy.acquire(blocking=False)) # Released for the next request
+
+    def test_one_profile_at_a_time(self):
+        async def scenario():
+            first = asyncio.create_task(self.profiler.run(0.3))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(ProfileBusy):
+                await self.profiler.run(0.1)
+            await first
+        asyncio.run(scenario())
+
+class TestLoopLagMonitor(unittest.TestCase):
+    def test_blocking_call_is_caught_with_its_stack(self):
+        monitor = LoopLagMonitor("test", threshold_ms=50, interval=0.02)
+
+        def fetch_quote_synchronously():
+            time.sleep(0.3) # e.g. yfinance inside a handler
+
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.05)
+            fetch_quote_synchronously()
+            await asyncio.sleep(0.05)
+            monitor.stop()
+
+        asyncio.run(scenario())
+        self.assertEqual(len(monitor.stalls), 1)
+        stall = monitor.stalls[0]
+        self.assertGreater(stall["lag_ms"], 200)
+        self.assertIn("fetch_quote_synchronously", "".join(stall["stack"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+import unittest
+import pandas as pd
+from asr_trading.data.quote_cache import QuoteCache
+
+class SlowFetcher:
+    def __init__(self, delay=0.1, fail=False, empty=False):
+        self.delay = delay
+        self.fail = fail
+        self.empty = empty
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, symbol, period, interval):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("yahoo down")
+        if self.empty:
+            return pd.DataFrame()
+        return pd.DataFrame({"Open": [99.0, 100.0], "Close": [100.0, 101.0]})
+
+class TestQuoteCache(unittest.TestCase):
+    def test_concurrent_async_callers_share_one_fetch(self):
+        fetcher = SlowFetcher()
+        cache = QuoteCache(fetcher=fetcher)
+
+        async def scenario():
+            return await asyncio.gather(*(cache.last_price_async("RELIANCE.NS") for _ in range(10)))
+
+        prices = asyncio.run(scenario())
+        self.assertEqual(prices, [101.0] * 10)
+        self.assertEqual(fetcher.calls, 1)
+        self.assertEqual((cache.misses, cache.coalesced), (1, 9))
+
+    def test_sync_and_async_callers_coalesce(self):
+        fetcher = SlowFetcher(delay=0.2)
+        cache = QuoteCache(fetcher=fetcher)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(cache.last_price("TCS.NS")))
+
+        async def scenario():
+            task = asyncio.ensure_future(cache.last_price_async("TCS.NS"))
+            await asyncio.sleep(0.05) # Fetch is in flight
+            thread.start()
+            return await task
+
+        results.append(asyncio.run(scenario()))
+        thread.join()
+        self.assertEqual(results, [101.0, 101.0])
+        self.assertEqual(fetcher.calls, 1)
+
+    def test_ttl_per_interval(self):
+        fetcher = SlowFetcher(delay=0)
+        cache = QuoteCache(fetcher=fetcher, ttls={"1m": 0.05, "1d": 60})
+        cache.history("AAPL", "1d", "1m")
+        cache.history("AAPL", "3mo", "1d")
+        time.sleep(0.08)
+        cache.history("AAPL", "1d", "1m") # Expired
+        cache.history("AAPL", "3mo", "1d") # Still fresh
+        self.assertEqual(fetcher.calls, 3)
+        self.assertEqual(cache.hits, 1)
+
+    def test_callers_get_copies(self):
+        cache = QuoteCache(fetcher=SlowFetcher(delay=0))
+        df = cache.history("AAPL")
+        df["RSI"] = 50.0 # compute_all-style mutation
+        self.assertNotIn("RSI", cache.history("AAPL").columns)
+
+    def test_failures_propagate_and_are_not_cached(self):
+        fetcher = SlowFetcher(delay=0.05, fail=True)
+        cache = QuoteCache(fetcher=fetcher)
+
+        async def scenario():
+            return await asyncio.gather(*(cache.history_async("INFY.NS") for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        fetcher.fail = False
+        self.assertEqual(cache.last_price("INFY.NS"), 101.0)
+        self.assertEqual(fetcher.calls, 2)
+
+    def test_empty_result_is_cached_briefly(self):
+        fetcher = SlowFetcher(delay=0, empty=True)
+        cache = QuoteCache(fetcher=fetcher)
+        self.assertIsNone(cache.last_price("NOPE"))
+        self.assertIsNone(cache.last_price("NOPE"))
+        self.assertEqual(fetcher.calls, 1)
+
+    def test_sync_call_on_the_loop_does_not_join_an_async_fetch(self):
+        fetcher = SlowFetcher(delay=0.2)
+        cache = QuoteCache(fetcher=fetcher)
+
+        async def scenario():
+            owner = asyncio.create_task(cache.history_async("AAPL"))
+            await asyncio.sleep(0.05) # Owner's fetch is in flight
+            df = cache.history("AAPL") # Used to block on the owner's future forever
+            return df, await owner
+
+        df, owned = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+        self.assertEqual(len(df), 2)
+        self.assertEqual(len(owned), 2)
+
+    def test_cancelled_owner_lets_waiters_retry(self):
+        fetcher = SlowFetcher(delay=0.2)
+        cache = QuoteCache(fetcher=fetcher)
+
+        async def scenario():
+            owner = asyncio.create_task(cache.history_async("AAPL"))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.create_task(cache.history_async("AAPL"))
+            await asyncio.sleep(0.05)
+            owner.cancel()
+            return await waiter
+
+        df = asyncio.run(scenario())
+        self.assertEqual(df["Close"].iloc[-1], 101.0)
+        self.assertEqual(fetcher.calls, 2) # The waiter took over the fetch
+
+    def test_cancelled_waiter_does_not_cancel_the_fetch(self):
+        fetcher = SlowFetcher(delay=0.2)
+        cache = QuoteCache(fetcher=fetcher)
+
+        async def scenario():
+            owner = asyncio.create_task(cache.history_async("AAPL"))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.create_task(cache.history_async("AAPL"))
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            return await owner
+
+        self.assertEqual(len(asyncio.run(scenario())), 2)
+        self.assertEqual(fetcher.calls, 1)
+
+if __name__ == "__main__":
+    unittest.main()
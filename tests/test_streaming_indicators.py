@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from asr_trading.data.canonical import OHLC
+from asr_trading.analysis.features import WindowEngine, IndicatorLib
+from asr_trading.analysis.streaming import StreamingIndicatorEngine
+
+class TestStreamingIndicators(unittest.TestCase):
+    def _synthetic_bars(self, n, symbol="PARITY"):
+        rng = np.random.default_rng(7)
+        closes = 100 + np.cumsum(rng.normal(0, 1, n))
+        closes[120:140] = closes[119] # Flat run: zero gains/losses, zero std
+        closes[200:215] = closes[199] - np.arange(15) # Monotonic fall: zero gains
+        bars = []
+        for i, c in enumerate(closes):
+            o = c + rng.normal(0, 0.3)
+            h = max(o, c) + abs(rng.normal(0, 0.5))
+            l = min(o, c) - abs(rng.normal(0, 0.5))
+            bars.append(OHLC(symbol, 1_700_000_000.0 + i * 60, o, h, l, c, int(rng.integers(100, 1000)), "1m"))
+        return bars
+
+    def test_parity_with_compute_all(self):
+        window = WindowEngine(window_size=500)
+        stream = StreamingIndicatorEngine()
+
+        for i, bar in enumerate(self._synthetic_bars(560)):
+            window.add_ohlc(bar)
+            incremental = stream.update(bar)
+            # Every bar through warmup and the flat runs, then sampled past the window wrap
+            if i > 250 and i % 25 != 0 and i != 559:
+                continue
+            expected = IndicatorLib.compute_all(window.get_dataframe(bar.symbol)).iloc[-1].to_dict()
+
+            self.assertEqual(list(incremental.keys()), list(expected.keys()))
+            np.testing.assert_allclose(
+                [incremental[k] for k in expected],
+                [expected[k] for k in expected],
+                rtol=1e-9, atol=1e-9,
+                err_msg=f"Mismatch at ts={bar.timestamp}"
+            )
+
+if __name__ == "__main__":
+    unittest.main()
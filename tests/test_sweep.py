@@ -0,0 +1,88 @@
+import os
+import json
+import tempfile
+import unittest
+from asr_trading.execution.backtest import BacktestEngine
+from asr_trading.execution import sweep
+from asr_trading.execution.sweep import SweepRunner
+from asr_trading.execution.vector_backtest import expand_grid
+from tests.test_backtest import synthetic_bars
+
+class TestSweepRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.files = {}
+        for i, sym in enumerate(["SYN_A", "SYN_B"]):
+            path = os.path.join(self.tmp.name, f"{sym}.csv")
+            synthetic_bars(seed=i).to_csv(path, index=False)
+            self.files[sym] = path
+        self.params = expand_grid({"sl_pct": [0.01, 0.02], "confidence_gate": [0.65, 0.7]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sweep_matches_single_runs_and_resumes(self):
+        out = os.path.join(self.tmp.name, "sweep")
+        runner = SweepRunner(out_dir=out, workers=2)
+        table = runner.run(self.files, self.params)
+        self.assertEqual(len(table), 8)
+        self.assertTrue(table["sharpe"].is_monotonic_decreasing)
+        self.assertTrue(os.path.exists(os.path.join(out, "results.csv")))
+
+        row = table.iloc[0]
+        params = next(p for p in self.params if p.sl_pct == row["sl_pct"] and p.confidence_gate == row["confidence_gate"])
+        single = BacktestEngine().run_vectorized(row["symbol"], synthetic_bars(seed=0 if row["symbol"] == "SYN_A" else 1), params)
+        self.assertEqual(single["total_trades"], row["total_trades"])
+        self.assertAlmostEqual(single["final_balance"], round(row["final_balance"], 2))
+
+        # Simulate a crash: keep 3 results and a torn line, then resume
+        with open(runner.results_path) as f:
+            lines = f.readlines()
+        with open(runner.results_path, "w") as f:
+            f.writelines(lines[:3])
+            f.write(lines[3][:10])
+        self.assertEqual(len(runner.completed_jobs()), 3)
+
+        progress = []
+        resumed = SweepRunner(out_dir=out, workers=2).run(self.files, self.params, progress=lambda d, t: progress.append((d, t)))
+        self.assertEqual(progress[-1], (5, 5))
+        self.assertEqual(len(resumed), 8)
+        self.assertEqual(sorted(resumed["job_id"]), sorted(table["job_id"]))
+
+    def test_worker_keeps_a_bounded_set_of_symbols(self):
+        files = dict(self.files)
+        for i, sym in enumerate(["SYN_C", "SYN_D"], start=2):
+            files[sym] = os.path.join(self.tmp.name, f"{sym}.csv")
+            synthetic_bars(seed=i).to_csv(files[sym], index=False)
+        runner = SweepRunner(out_dir=os.path.join(self.tmp.name, "sweep"))
+        symbols = runner.prepare_bars(files)
+
+        sweep._init_worker(runner.bars_dir, 10000.0, 0.0005, 0.0, None)
+        try:
+            first = sweep._worker_signal_arrays(symbols[0])
+            self.assertIs(sweep._worker_signal_arrays(symbols[0]), first) # Reused by the symbol's next job
+            for sym in symbols[1:]:
+                sweep._worker_signal_arrays(sym)
+            self.assertEqual(list(sweep._worker_arrays), symbols[-sweep.WORKER_CACHED_SYMBOLS:])
+        finally:
+            sweep._worker_arrays.clear()
+
+    def test_config_or_data_change_reruns_jobs(self):
+        out = os.path.join(self.tmp.name, "sweep")
+        first = SweepRunner(out_dir=out, workers=1).run(self.files, self.params)
+
+        progress = []
+        track = lambda d, t: progress.append((d, t))
+        costly = SweepRunner(out_dir=out, workers=1, slippage_pct=0.002).run(self.files, self.params, progress=track)
+        self.assertEqual(progress[-1], (8, 8))
+        self.assertEqual(len(costly), 8) # Only the current config is ranked
+        self.assertFalse(set(costly["job_id"]) & set(first["job_id"]))
+
+        progress.clear()
+        synthetic_bars(n=250, seed=0).to_csv(self.files["SYN_A"], index=False)
+        os.utime(self.files["SYN_A"], (os.path.getmtime(self.files["SYN_A"]) + 5,) * 2)
+        SweepRunner(out_dir=out, workers=1, slippage_pct=0.002).run(self.files, self.params, progress=track)
+        self.assertEqual(progress[-1], (4, 4)) # SYN_A's bars changed, SYN_B's did not
+
+if __name__ == '__main__':
+    unittest.main()
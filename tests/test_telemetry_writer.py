@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from asr_trading.core.avionics import Telemetry
+
+class TestTelemetryWriter(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def lines(self):
+        with open(self.path) as f:
+            return [json.loads(l) for l in f]
+
+    def test_records_are_batched_and_flushed_on_close(self):
+        t = Telemetry(log_path=self.path, batch_size=1000, flush_interval=60)
+        for i in range(10):
+            t.record_metric("feed.latency", float(i), {"symbol": "AAPL"})
+        t.record_event("circuit_breaker_opened", {"name": "yahoo"})
+        self.assertEqual(self.lines(), []) # Below both thresholds: still buffered
+        t.close()
+        rows = self.lines()
+        self.assertEqual([r["value"] for r in rows[:10]], [float(i) for i in range(10)])
+        self.assertEqual(rows[-1]["name"], "event.circuit_breaker_opened")
+        self.assertEqual((t.written, t.batches), (11, 1))
+
+    def test_size_threshold_wakes_the_flusher(self):
+        t = Telemetry(log_path=self.path, batch_size=5, flush_interval=60)
+        for i in range(5):
+            t.record_metric("m", i)
+        deadline = time.time() + 2
+        while len(self.lines()) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.lines()), 5)
+        t.close()
+
+    def test_overflow_drops_oldest_and_counts(self):
+        t = Telemetry(log_path=self.path, capacity=4, batch_size=100, flush_interval=60)
+        t._wake.set = lambda: None # Keep the flusher asleep
+        for i in range(10):
+            t.record_metric("m", i)
+        self.assertEqual(t.dropped, 6)
+        self.assertEqual(t.stats()["peak_depth"], 4)
+        del t._wake.set
+        t.close()
+        self.assertEqual([r["value"] for r in self.lines()], [6, 7, 8, 9])
+
+    def test_concurrent_producers_lose_nothing(self):
+        t = Telemetry(log_path=self.path, batch_size=64, flush_interval=0.01)
+        def producer(n):
+            for i in range(500):
+                t.record_metric("m", i, {"producer": n})
+        threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        t.close()
+        self.assertEqual(len(self.lines()), 2000)
+        self.assertEqual(t.dropped, 0)
+
+    def test_write_through_after_close(self):
+        t = Telemetry(log_path=self.path)
+        t.close()
+        t.record_metric("late", 1.0)
+        self.assertEqual(self.lines()[0]["name"], "late")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from asr_trading.core.tracing import Span, Tracer, tracer
+from asr_trading.data.canonical import Tick
+
+class TestTracer(unittest.TestCase):
+    def test_nested_spans_and_errors(self):
+        t = Tracer(sample_rate=0)
+        with t.span("cycle", symbol="AAPL") as root:
+            with t.span("fetch") as child:
+                pass
+            with self.assertRaises(KeyError):
+                with t.span("plan"):
+                    raise KeyError("x")
+        self.assertIsNone(t.current())
+        self.assertEqual((child.trace_id, child.parent_id), (root.trace_id, root.span_id))
+        spans = {s["name"]: s for s in t.recent()}
+        self.assertEqual(spans["plan"]["error"], "KeyError")
+        self.assertEqual(spans["cycle"]["attrs"], {"symbol": "AAPL"})
+        self.assertGreaterEqual(spans["cycle"]["duration_ms"], spans["fetch"]["duration_ms"])
+
+    def test_async_decorator_follows_tasks(self):
+        t = Tracer(sample_rate=0)
+
+        @t.trace("broker")
+        async def place(i):
+            await asyncio.sleep(0.01)
+            return i
+
+        async def scenario():
+            with t.span("cycle") as root:
+                results = await asyncio.gather(*(place(i) for i in range(3)))
+            return root, results
+
+        root, results = asyncio.run(scenario())
+        self.assertEqual(results, [0, 1, 2])
+        brokers = [s for s in t.recent() if s["name"] == "broker"]
+        self.assertEqual(len(brokers), 3)
+        self.assertTrue(all(s["parent_id"] == root.span_id for s in brokers))
+        self.assertEqual(place.__name__, "place")
+
+    def test_percentiles(self):
+        t = Tracer(sample_rate=0)
+        for ms in range(1, 101):
+            t._finish(Span("stage", "t", f"s{ms}", None, False, 0.0, duration_ms=float(ms)))
+        stats = t.stats()["stage"]
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["p50_ms"], 50.5)
+        self.assertAlmostEqual(stats["p99_ms"], 99.01)
+        self.assertEqual(stats["max_ms"], 100.0)
+
+    def test_sampled_export(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        try:
+            t = Tracer(sample_rate=1.0, export_path=path)
+            with t.span("cycle"):
+                with t.span("fetch"):
+                    pass
+            with Tracer(sample_rate=0.0, export_path=path).span("unsampled"):
+                pass
+            t.flush()
+            with open(path) as f:
+                rows = [json.loads(l) for l in f]
+            self.assertEqual([r["name"] for r in rows], ["fetch", "cycle"])
+            self.assertEqual(rows[0]["tags"]["parent_id"], rows[1]["tags"]["span_id"])
+        finally:
+            os.remove(path)
+
+class TestOrchestratorSpans(unittest.TestCase):
+    def test_stage_spans_are_children_of_the_cycle(self):
+        from asr_trading.core import orchestrator as orch_module
+        from asr_trading.data.bar_aggregator import BarAggregator
+        orch = orch_module.Orchestrator(aggregator=BarAggregator(intervals=("1m",)))
+        tick = Tick(symbol="AAPL", timestamp=1_700_000_100.0, bid=99.9, ask=100.1, last=100.0, volume=10, source="TEST", sequence=1)
+
+        async def get_tick(symbol):
+            return tick
+
+        async def scenario():
+            await orch.run_cycle("AAPL")
+            await orch.process("AAPL")
+            await orch.stop_pipeline()
+
+        tracer.reset()
+        with patch.object(orch_module.feed_manager, "get_tick", get_tick):
+            asyncio.run(scenario())
+
+        spans = tracer.recent()
+        cycles = [s for s in spans if s["name"] == "orchestrator.cycle"]
+        self.assertEqual(len(cycles), 2) # Sequential and pipelined
+        for cycle in cycles:
+            children = {s["name"] for s in spans if s["parent_id"] == cycle["span_id"]}
+            self.assertEqual(children, {"orchestrator.fetch", "orchestrator.features"})
+        self.assertIn("orchestrator.features", tracer.stats())
+
+class TestTraceAPI(unittest.TestCase):
+    def test_trade_endpoints_are_traced(self):
+        from fastapi.testclient import TestClient
+        from asr_trading.web.server import app
+        client = TestClient(app)
+        client.post("/api/trade/reject/NOPE")
+        stats = client.get("/api/trace/stats").json()["spans"]
+        self.assertIn("api.trade.reject", stats)
+        self.assertEqual(set(stats["api.trade.reject"]), {"count", "p50_ms", "p95_ms", "p99_ms", "max_ms"})
+
+if __name__ == "__main__":
+    unittest.main()